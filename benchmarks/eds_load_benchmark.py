@@ -0,0 +1,50 @@
+""" Benchmark of loading a device profile with 3000 entries from an EDS, with and without the compiled cache.
+
+Run from the repository root with: python -m benchmarks.eds_load_benchmark
+"""
+import os
+import tempfile
+import time
+
+from canopenx.objectdictionary import eds
+
+
+def make_eds(records):
+	lines = ["[FileInfo]", "FileName=benchmark.eds", ""]
+	for i in range(records):
+		index = 0x2000 + i
+		lines += ["[{:04X}]".format(index), "ParameterName=Record {}".format(i), "ObjectType=0x9", "SubNumber=3", ""]
+		lines += ["[{:04X}sub0]".format(index), "ParameterName=Highest sub-index supported", "ObjectType=0x7", "DataType=0x0005", "AccessType=ro", "DefaultValue=2", ""]
+		lines += ["[{:04X}sub1]".format(index), "ParameterName=COB-ID", "ObjectType=0x7", "DataType=0x0007", "AccessType=rw", "DefaultValue=$NODEID+0x180", ""]
+		lines += ["[{:04X}sub2]".format(index), "ParameterName=Value", "ObjectType=0x7", "DataType=0x0003", "AccessType=rw", "DefaultValue=-1", ""]
+	return "\n".join(lines)
+
+
+def measure(function, repeat = 5):
+	best = None
+	for _ in range(repeat):
+		start = time.perf_counter()
+		function()
+		duration = time.perf_counter() - start
+		if best is None or duration < best:
+			best = duration
+	return best
+
+
+def main():
+	with tempfile.TemporaryDirectory() as directory:
+		filename = os.path.join(directory, "benchmark.eds")
+		with open(filename, "w") as f:
+			f.write(make_eds(1000))
+
+		parse = measure(lambda: eds.load(filename, cache = False))
+		eds.load(filename)
+		cached = measure(lambda: eds.load(filename))
+
+		print("3000 entries")
+		print("\tparse:  {:8.1f} ms".format(parse * 1000))
+		print("\tcached: {:8.1f} ms ({:.1f}x)".format(cached * 1000, parse / cached))
+
+
+if __name__ == "__main__":
+	main()
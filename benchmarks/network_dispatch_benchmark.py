@@ -0,0 +1,107 @@
+""" Benchmark for the dispatching of received messages in Network.on_message_received.
+
+Compares the direct-indexed dispatch table of the Network with the former dict-of-lists lookup, once by calling the handler directly and once end-to-end over the virtual bus.
+
+Run from the repository root with: python -m benchmarks.network_dispatch_benchmark
+"""
+import can
+import threading
+import time
+
+from canopenx import Network
+
+
+class DictOfListsNetwork(Network):
+	""" Network with the former dispatching, which looks up the callbacks in the dict of lists on each message.
+	"""
+	def on_message_received(self, message):
+		if message.is_extended_id:
+			cob_id = (1 << 29) | message.arbitration_id
+		else:
+			cob_id = message.arbitration_id
+		try:
+			for callback in self._subscribers[cob_id]:
+				try:
+					callback(message)
+				except:
+					pass
+		except KeyError:
+			return
+
+
+def callback(message):
+	pass
+
+
+def make_network(cls):
+	network = cls()
+	# A typical bus: heartbeats, emcys and sdo responses of 127 nodes
+	for node_id in range(1, 128):
+		network.subscribe(0x080 + node_id, callback)
+		network.subscribe(0x580 + node_id, callback)
+		network.subscribe(0x700 + node_id, callback)
+	return network
+
+
+def make_messages(count):
+	messages = []
+	for i in range(count):
+		arbitration_id = [0x080, 0x180, 0x580, 0x700][i % 4] + (i % 127) + 1
+		messages.append(can.Message(arbitration_id = arbitration_id, is_extended_id = False, data = b"\x05"))
+	return messages
+
+
+def benchmark_direct(cls, messages, repeat = 5):
+	network = make_network(cls)
+	best = None
+	for _ in range(repeat):
+		start = time.perf_counter()
+		for message in messages:
+			network.on_message_received(message)
+		duration = time.perf_counter() - start
+		if best is None or duration < best:
+			best = duration
+	return len(messages) / best
+
+
+def benchmark_virtual_bus(cls, messages):
+	bus1 = can.ThreadSafeBus(interface = "virtual", channel = "dispatch_benchmark")
+	bus2 = can.ThreadSafeBus(interface = "virtual", channel = "dispatch_benchmark")
+	network = make_network(cls)
+
+	# The last message of the run is sent to a sentinel, which signals the end of the dispatching
+	done = threading.Event()
+	network.subscribe(0x7FF, lambda message: done.set())
+	network.connect(bus1)
+
+	start = time.perf_counter()
+	for message in messages:
+		bus2.send(message)
+	bus2.send(can.Message(arbitration_id = 0x7FF, is_extended_id = False))
+	done.wait()
+	duration = time.perf_counter() - start
+
+	network.disconnect()
+	bus1.shutdown()
+	bus2.shutdown()
+	return (len(messages) + 1) / duration
+
+
+def main():
+	messages = make_messages(100000)
+
+	print("Direct call of on_message_received")
+	legacy = benchmark_direct(DictOfListsNetwork, messages)
+	table = benchmark_direct(Network, messages)
+	print("\tdict of lists:  {:10.0f} frames/s".format(legacy))
+	print("\tdispatch table: {:10.0f} frames/s ({:.2f}x)".format(table, table / legacy))
+
+	print("End-to-end over the virtual bus")
+	legacy = benchmark_virtual_bus(DictOfListsNetwork, messages)
+	table = benchmark_virtual_bus(Network, messages)
+	print("\tdict of lists:  {:10.0f} frames/s".format(legacy))
+	print("\tdispatch table: {:10.0f} frames/s ({:.2f}x)".format(table, table / legacy))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,56 @@
+""" Benchmark for sending bursts of messages with Network.send and Network.send_many on the virtual bus.
+Each run starts with a new network, so the transmit queue is empty and the time to queue the burst is measured.
+
+Run from the repository root with: python -m benchmarks.network_send_benchmark
+"""
+import can
+import time
+
+from canopenx import Network
+
+
+def make_messages(count):
+	return [can.Message(arbitration_id = 0x60A, is_extended_id = False, data = bytes([0x00, i & 0xFF, 0, 0, 0, 0, 0, 0])) for i in range(count)]
+
+
+def benchmark_send(network, messages):
+	start = time.perf_counter()
+	for message in messages:
+		network.send(message)
+	return len(messages) / (time.perf_counter() - start)
+
+
+def benchmark_send_many(network, messages):
+	start = time.perf_counter()
+	network.send_many(messages)
+	return len(messages) / (time.perf_counter() - start)
+
+
+def measure(benchmark, transmit_queue_size, messages):
+	bus = can.Bus(interface = "virtual", channel = "send_benchmark")
+	network = Network()
+	network.connect(bus, transmit_queue_size = transmit_queue_size)
+	rate = benchmark(network, messages)
+	network.disconnect()
+	bus.shutdown()
+	return rate
+
+
+def run(transmit_queue_size, messages, repeat = 5):
+	send = max(measure(benchmark_send, transmit_queue_size, messages) for _ in range(repeat))
+	send_many = max(measure(benchmark_send_many, transmit_queue_size, messages) for _ in range(repeat))
+	return send, send_many
+
+
+def main():
+	messages = make_messages(100000)
+
+	for name, transmit_queue_size in [("Direct", None), ("Transmit queue", len(messages))]:
+		send, send_many = run(transmit_queue_size, messages)
+		print(name)
+		print("\tsend:      {:10.0f} frames/s".format(send))
+		print("\tsend_many: {:10.0f} frames/s ({:.2f}x)".format(send_many, send_many / send))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,44 @@
+""" Benchmark of the lookup of entries through a node, with the cached proxies against creating new proxies on each access.
+
+Run from the repository root with: python -m benchmarks.node_lookup_benchmark
+"""
+import timeit
+
+import canopenx
+from canopenx.node import Node
+from canopenx.objectdictionary import Record, Variable
+from canopenx.objectdictionary.datatypes import UNSIGNED8, UNSIGNED32
+
+
+def make_node():
+	dictionary = canopenx.ObjectDictionary()
+	for i in range(100):
+		index = 0x2000 + i
+		record = Record("record" + str(i), index)
+		record.add(Variable("count", index, 0x00, UNSIGNED8))
+		record.add(Variable("value", index, 0x01, UNSIGNED32))
+		dictionary.add(record)
+	return Node(1, dictionary)
+
+
+def measure(function, number = 200000):
+	return min(timeit.repeat(function, number = number, repeat = 5)) / number * 1e9
+
+
+def main():
+	node = make_node()
+	dictionary = node.dictionary
+
+	uncached = measure(lambda: dictionary["record50"].proxy(node)["value"])
+	names = measure(lambda: node["record50"]["value"])
+	index = measure(lambda: node[(0x2032, 0x01)])
+	path = measure(lambda: node["record50.value"])
+
+	print("{:24} {:6.0f} ns".format("new proxies", uncached))
+	print("{:24} {:6.0f} ns ({:.1f}x)".format("node[name][name]", names, uncached / names))
+	print("{:24} {:6.0f} ns ({:.1f}x)".format("node[(index, subindex)]", index, uncached / index))
+	print("{:24} {:6.0f} ns ({:.1f}x)".format("node[\"name.name\"]", path, uncached / path))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,65 @@
+""" Benchmark of the throughput of the SDO transfers of a domain over the virtual bus, with the segmented transfer against the block transfer.
+
+Run from the repository root with: python -m benchmarks.sdo_block_benchmark
+"""
+import time
+
+import can
+import canopenx
+from canopenx.node import LocalNode, RemoteNode
+from canopenx.objectdictionary import Domain
+
+
+SIZE = 64 * 1024
+
+
+def make_dictionary():
+	dictionary = canopenx.ObjectDictionary()
+	dictionary.add(Domain("program", 0x1F50))
+	return dictionary
+
+
+def measure(function, repeat = 3):
+	best = None
+	for _ in range(repeat):
+		start = time.perf_counter()
+		function()
+		elapsed = time.perf_counter() - start
+		if best is None or elapsed < best:
+			best = elapsed
+	return SIZE / best / 1024
+
+
+def main():
+	bus1 = can.ThreadSafeBus(interface = "virtual", channel = "sdo_block_benchmark")
+	bus2 = can.ThreadSafeBus(interface = "virtual", channel = "sdo_block_benchmark")
+	network1 = canopenx.Network()
+	network1.connect(bus1)
+	network2 = canopenx.Network()
+	network2.connect(bus2)
+
+	server = LocalNode(1, make_dictionary())
+	network2.add(server)
+	client = RemoteNode(1, make_dictionary())
+	network1.add(client)
+
+	data = bytes(i & 0xFF for i in range(SIZE))
+	try:
+		segmented_download = measure(lambda: client.sdo.download(0x1F50, 0x00, data).result(10))
+		block_download = measure(lambda: client.sdo.download(0x1F50, 0x00, data, block = True).result(10))
+		segmented_upload = measure(lambda: client.sdo.upload(0x1F50, 0x00).result(10))
+		block_upload = measure(lambda: client.sdo.upload(0x1F50, 0x00, block = True).result(10))
+	finally:
+		network1.disconnect()
+		network2.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	print("{:20} {:8.0f} KiB/s".format("segmented download", segmented_download))
+	print("{:20} {:8.0f} KiB/s ({:.1f}x)".format("block download", block_download, block_download / segmented_download))
+	print("{:20} {:8.0f} KiB/s".format("segmented upload", segmented_upload))
+	print("{:20} {:8.0f} KiB/s ({:.1f}x)".format("block upload", block_upload, block_upload / segmented_upload))
+
+
+if __name__ == "__main__":
+	main()
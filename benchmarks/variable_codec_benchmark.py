@@ -0,0 +1,234 @@
+""" Benchmark of the encoding and decoding of each data type with the codecs of Variable against the former chain of comparisons.
+
+Run from the repository root with: python -m benchmarks.variable_codec_benchmark
+"""
+import struct
+import timeit
+
+from canopenx.objectdictionary import Variable
+from canopenx.objectdictionary.codecs import CANOPEN_EPOCH
+from canopenx.objectdictionary.datatypes import *
+
+
+VALUES = [("BOOLEAN", BOOLEAN, True), ("INTEGER8", INTEGER8, -5), ("INTEGER16", INTEGER16, -300), ("INTEGER32", INTEGER32, 0x12345678), ("UNSIGNED8", UNSIGNED8, 200), ("UNSIGNED16", UNSIGNED16, 0xABCD), ("UNSIGNED32", UNSIGNED32, 0xDEADBEEF), ("REAL32", REAL32, 1.5), ("VISIBLE_STRING", VISIBLE_STRING, "TEXT"), ("OCTET_STRING", OCTET_STRING, "TEXT"), ("UNICODE_STRING", UNICODE_STRING, "TEXT"), ("TIME_OF_DAY", TIME_OF_DAY, CANOPEN_EPOCH + 100000.5), ("TIME_DIFFERENCE", TIME_DIFFERENCE, 100000.5), ("DOMAIN", DOMAIN, b"DATA"), ("INTEGER24", INTEGER24, -100000), ("REAL64", REAL64, -1.25), ("INTEGER40", INTEGER40, -1), ("INTEGER48", INTEGER48, 1 << 40), ("INTEGER56", INTEGER56, -(1 << 50)), ("INTEGER64", INTEGER64, -(1 << 60)), ("UNSIGNED24", UNSIGNED24, 0xABCDEF), ("UNSIGNED40", UNSIGNED40, 1 << 39), ("UNSIGNED48", UNSIGNED48, 1 << 47), ("UNSIGNED56", UNSIGNED56, 1 << 55), ("UNSIGNED64", UNSIGNED64, 1 << 63)]
+
+
+# The implementation of Variable.decode and Variable.encode before the codecs, as reference
+def legacy_decode(data_type, data):
+	value = None
+
+	try:
+		if data_type == BOOLEAN:
+			value, = struct.unpack_from("<?", data)
+
+		if data_type == INTEGER8:
+			value, = struct.unpack_from("<b", data)
+
+		if data_type == INTEGER16:
+			value, = struct.unpack_from("<h", data)
+
+		if data_type == INTEGER32:
+			value, = struct.unpack_from("<l", data)
+
+		if data_type == UNSIGNED8:
+			value, = struct.unpack_from("<B", data)
+
+		if data_type == UNSIGNED16:
+			value, = struct.unpack_from("<H", data)
+
+		if data_type == UNSIGNED32:
+			value, = struct.unpack_from("<L", data)
+
+		if data_type == REAL32:
+			value, = struct.unpack_from("<f", data)
+
+		if data_type == VISIBLE_STRING:
+			value = bytes.decode(data, "ascii", errors = "replace")
+
+		if data_type == OCTET_STRING:
+			value = bytes.decode(data, "utf-8", errors = "replace")
+
+		if data_type == UNICODE_STRING:
+			value = bytes.decode(data, "utf-16-le", errors = "replace")
+
+		if data_type == TIME_OF_DAY:
+			m, d = struct.unpack_from("<LH", data)
+			m &= 0xFFFFFFF
+			value = d * 24 * 60 * 60 + m / 1000 + CANOPEN_EPOCH
+
+		if data_type == TIME_DIFFERENCE:
+			m, d = struct.unpack_from("<LH", data)
+			m &= 0xFFFFFFF
+			value = d * 24 * 60 * 60 + m / 1000
+
+		if data_type == DOMAIN:
+			value = data
+
+		if data_type == INTEGER24:
+			if len(data) < 3:
+				raise ValueError("Decoding requires a buffer of at least 3 bytes.")
+			value = int.from_bytes(data[0:3], "little", signed = True)
+
+		if data_type == REAL64:
+			value, = struct.unpack_from("<q", data)
+
+		if data_type == INTEGER40:
+			if len(data) < 5:
+				raise ValueError("Decoding requires a buffer of at least 5 bytes.")
+			value = int.from_bytes(data[0:5], "little", signed = True)
+
+		if data_type == INTEGER48:
+			if len(data) < 6:
+				raise ValueError("Decoding requires a buffer of at least 6 bytes.")
+			value = int.from_bytes(data[0:6], "little", signed = True)
+
+		if data_type == INTEGER56:
+			if len(data) < 7:
+				raise ValueError("Decoding requires a buffer of at least 7 bytes.")
+			value = int.from_bytes(data[0:7], "little", signed = True)
+
+		if data_type == INTEGER64:
+			value, = struct.unpack_from("<q", data)
+
+		if data_type == UNSIGNED24:
+			if len(data) < 3:
+				raise ValueError("Decoding requires a buffer of at least 3 bytes.")
+			value = int.from_bytes(data[0:3], "little", signed = False)
+
+		if data_type == UNSIGNED40:
+			if len(data) < 5:
+				raise ValueError("Decoding requires a buffer of at least 5 bytes.")
+			value = int.from_bytes(data[0:5], "little", signed = False)
+
+		if data_type == UNSIGNED48:
+			if len(data) < 6:
+				raise ValueError("Decoding requires a buffer of at least 6 bytes.")
+			value = int.from_bytes(data[0:6], "little", signed = False)
+
+		if data_type == UNSIGNED56:
+			if len(data) < 7:
+				raise ValueError("Decoding requires a buffer of at least 7 bytes.")
+			value = int.from_bytes(data[0:7], "little", signed = False)
+
+		if data_type == UNSIGNED64:
+			value, = struct.unpack_from("<Q", data)
+	except struct.error:
+		raise ValueError("Could not decode the specified data. Maybe the data format does not match the data type of the Variable.")
+
+	return value
+
+
+def legacy_encode(data_type, value):
+	data = b""
+
+	try:
+		if data_type == BOOLEAN:
+			data = struct.pack("?", value)
+
+		if data_type == INTEGER8:
+			data = struct.pack("<b", value)
+
+		if data_type == INTEGER16:
+			data = struct.pack("<h", value)
+
+		if data_type == INTEGER32:
+			data = struct.pack("<l", value)
+
+		if data_type == UNSIGNED8:
+			data = struct.pack("<B", value)
+
+		if data_type == UNSIGNED16:
+			data = struct.pack("<H", value)
+
+		if data_type == UNSIGNED32:
+			data = struct.pack("<L", value)
+
+		if data_type == REAL32:
+			data = struct.pack("<f", value)
+
+		if data_type == VISIBLE_STRING:
+			data = str.encode(value, "ascii")
+
+		if data_type == OCTET_STRING:
+			data = str.encode(value, "utf-8")
+
+		if data_type == UNICODE_STRING:
+			data = str.encode(value, "utf-16-le")
+
+		if data_type == TIME_OF_DAY:
+			if value < CANOPEN_EPOCH:
+				raise ValueError("Encoding times before CANopen epoch is not defined.")
+			x = divmod(value - CANOPEN_EPOCH, 24 * 60 * 60)
+			d = int(x[0])
+			m = round(x[1] * 1000)
+			data = struct.pack("<LH", m, d)
+
+		if data_type == TIME_DIFFERENCE:
+			if value < 0:
+				value = -value
+			x = divmod(value, 24 * 60 * 60)
+			d = int(x[0])
+			m = round(x[1] * 1000)
+			data = struct.pack("<LH", m, d)
+
+		if data_type == DOMAIN:
+			data = bytes(value)
+
+		if data_type == INTEGER24:
+			data = int.to_bytes(value, 3, "little", signed = True)
+
+		if data_type == REAL64:
+			data = struct.pack("<d", value)
+
+		if data_type == INTEGER40:
+			data = int.to_bytes(value, 5, "little", signed = True)
+
+		if data_type == INTEGER48:
+			data = int.to_bytes(value, 6, "little", signed = True)
+
+		if data_type == INTEGER56:
+			data = int.to_bytes(value, 7, "little", signed = True)
+
+		if data_type == INTEGER64:
+			data = struct.pack("<q", value)
+
+		if data_type == UNSIGNED24:
+			data = int.to_bytes(value, 3, "little", signed = False)
+
+		if data_type == UNSIGNED40:
+			data = int.to_bytes(value, 5, "little", signed = False)
+
+		if data_type == UNSIGNED48:
+			data = int.to_bytes(value, 6, "little", signed = False)
+
+		if data_type == UNSIGNED56:
+			data = int.to_bytes(value, 7, "little", signed = False)
+
+		if data_type == UNSIGNED64:
+			data = struct.pack("<Q", value)
+	except (struct.error, TypeError):
+		raise ValueError("Could not encode the specified data. Maybe the data format does not match the data type of the Variable.")
+	except OverflowError:
+		raise ValueError("Could not encode the specified data. The value overflowed, maybe a negative value should be encoded as unsigned.")
+
+	return data
+
+
+def measure(function, *args, number = 100000):
+	return min(timeit.repeat(lambda: function(*args), number = number, repeat = 5)) / number * 1e9
+
+
+def main():
+	print("{:16} {:>10} {:>10} {:>7}   {:>10} {:>10} {:>7}".format("data type", "decode", "former", "", "encode", "former", ""))
+	for name, data_type, value in VALUES:
+		variable = Variable(name, 0x2000, 0, data_type)
+		data = variable.encode(value)
+		decode = measure(variable.decode, data)
+		former_decode = measure(legacy_decode, data_type, data)
+		encode = measure(variable.encode, value)
+		former_encode = measure(legacy_encode, data_type, value)
+		print("{:16} {:8.0f}ns {:8.0f}ns {:6.2f}x   {:8.0f}ns {:8.0f}ns {:6.2f}x".format(name, decode, former_decode, former_decode / decode, encode, former_encode, former_encode / encode))
+
+
+if __name__ == "__main__":
+	main()
@@ -1,4 +1,4 @@
-from .network import Network
+from .network import AsyncNetwork, Network
 from .node import LocalNode, Node, RemoteNode
 from .objectdictionary import ObjectDictionary
 
@@ -1 +1,4 @@
+from .asyncnetwork import AsyncNetwork
+from .multinetwork import MultiNetwork
 from .network import Network
+from .replay import Replay
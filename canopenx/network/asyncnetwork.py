@@ -0,0 +1,192 @@
+import asyncio
+import can
+import concurrent.futures
+from .network import Network
+
+
+class AsyncNetwork(Network):
+	""" Representation of a CANopen network for asyncio applications.
+
+	The received messages are dispatched on the thread of the event loop, so all callbacks of the services run on the event loop. The nodes and services work the same as with a Network.
+	A message, which cannot be passed to the bus (or the transmit queue) without waiting, is sent by a sender thread, so the event loop is never blocked.
+	"""
+
+	__slots__ = ["_loop", "_pending", "_sender"]
+
+	def __init__(self, workers = 4, queue_size = 1024):
+		""" Initialises an ``AsyncNetwork``
+
+		:param workers: The number of worker threads for callbacks subscribed with the execution "pool".
+
+		:param queue_size: The default size of the queues for callbacks subscribed with the execution "pool" or "queue".
+
+		:raises: ValueError
+		"""
+		Network.__init__(self, workers, queue_size)
+		self._loop = None
+		self._sender = None
+		self._pending = None
+
+	def _create_notifier(self):
+		""" Returns the notifier, which passes the received messages of the bus to the network on the event loop.
+		If the bus provides a file descriptor, it is registered with the event loop. Otherwise the messages are read in a thread and handed over to the event loop.
+		"""
+		return can.Notifier(bus = self._bus, listeners = self._listeners, timeout = 0.1, loop = self._loop)
+
+	def _send_later(self, send, *args):
+		""" Calls the send method (Network.send or Network.send_many) in the sender thread and returns the concurrent future of the transfer. The sender thread sends the messages in the order of the calls.
+		"""
+		if self._sender is None:
+			self._sender = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+		self._pending = self._sender.submit(send, self, *args)
+		return self._pending
+
+	def connect(self, bus, filters = False, filter_budget = None, transmit_queue_size = None, notifier = True, loop = None):
+		""" Connects this network to a CAN bus. Disconnects the network first if it is already connected to a bus.
+
+		:param bus: The CAN bus to connect to.
+
+		:param filters: If True, acceptance filters for the subscribed cob ids are applied to the CAN bus.
+
+		:param filter_budget: The maximum number of filters supported by the interface or None for no limit.
+
+		:param transmit_queue_size: If not None, the messages are queued by priority and sent by a single writer thread.
+
+		:param notifier: If True, the received messages are dispatched on the event loop. If False, the application has to call poll to receive and dispatch the messages in its own thread.
+
+		:param loop: The event loop to dispatch the received messages on. If None, the running event loop is used. Not needed without notifier.
+
+		:raises: RuntimeError, ValueError
+		"""
+		if notifier and loop is None:
+			loop = asyncio.get_running_loop()
+		if self.is_connected():
+			self.disconnect()
+		self._loop = loop
+		Network.connect(self, bus, filters, filter_budget, transmit_queue_size, notifier)
+
+	def disconnect(self):
+		""" Disconnect from the current CAN bus. The messages, which are waiting in the sender thread, are sent first.
+		"""
+		if self._sender is not None:
+			self._sender.shutdown()
+			self._sender = None
+			self._pending = None
+		Network.disconnect(self)
+		self._loop = None
+
+	@property
+	def loop(self):
+		""" Returns the event loop the received messages are dispatched on or None if disconnected.
+		"""
+		return self._loop
+
+	async def receive(self, cob_id, timeout = None):
+		""" Waits for the next message with the specified identifier and returns it.
+		Raises asyncio.TimeoutError if no message is received within the timeout.
+
+		:param cob_id: The CAN object id of the message. The frame type (base or extended) is encoded into bit 29.
+
+		:param timeout: The time to wait in seconds or None to wait forever.
+
+		:returns: The received message.
+
+		:raises: asyncio.TimeoutError
+		"""
+		future = asyncio.get_running_loop().create_future()
+
+		def on_message(message):
+			if not future.done():
+				future.set_result(message)
+
+		self.subscribe(cob_id, on_message)
+		try:
+			return await asyncio.wait_for(future, timeout)
+		finally:
+			self.unsubscribe(cob_id, on_message)
+
+	def send(self, message, timeout = None):
+		""" Sends a CAN message on the CAN bus.
+		The message is passed to the bus (or the transmit queue) without waiting, so the services may call this method without awaiting it. If the bus or the transmit queue is full, the message is handed over to the sender thread. The returned object may be awaited by coroutines, it completes when the message is passed to the bus (or the transmit queue).
+		Raises RuntimeError if the network is not connected to a bus. Awaiting raises RuntimeError if the transmit queue is still full after the timeout and can.CanError if the bus fails.
+
+		:param message: The message to send.
+
+		:param timeout: The time in seconds to wait for space in the transmit queue. If None, waits until there is space. If 0, raises RuntimeError immediately if the transmit queue is full.
+
+		:returns: An awaitable.
+
+		:raises: RuntimeError
+		"""
+		if not self.is_connected():
+			raise RuntimeError("The network is not connected to a CAN bus.")
+
+		# While messages wait in the sender thread, the following messages are queued behind them to keep the order
+		if self._pending is None or self._pending.done():
+			if self._transmit_queue is not None:
+				try:
+					self._transmit_queue.put(message, 0)
+					return _Sent()
+				except RuntimeError:
+					if timeout == 0:
+						raise
+			else:
+				try:
+					self._bus.send(message, 0)
+					return _Sent()
+				except can.CanError:
+					pass
+		return _Sent(self._send_later(Network.send, message, timeout))
+
+	def send_many(self, messages, timeout = None):
+		""" Sends several CAN messages on the CAN bus.
+		The messages are passed to the bus (or the transmit queue) without waiting. The messages, which do not fit into the bus or the transmit queue, are handed over in one batch to the sender thread and count as accepted.
+		Raises RuntimeError if the network is not connected to a bus.
+
+		:param messages: An iterable of messages to send.
+
+		:param timeout: The time in seconds to wait for space in the transmit queue for each message. If None, waits until there is space. If 0, the messages, which do not fit into the transmit queue, are not handed over to the sender thread and are not accepted.
+
+		:returns: The number of accepted messages.
+
+		:raises: RuntimeError
+		"""
+		if not self.is_connected():
+			raise RuntimeError("The network is not connected to a CAN bus.")
+
+		messages = list(messages)
+		count = 0
+		# While messages wait in the sender thread, the following messages are queued behind them to keep the order
+		if self._pending is None or self._pending.done():
+			if self._transmit_queue is not None:
+				count = self._transmit_queue.put_many(messages, 0)
+			else:
+				try:
+					for message in messages:
+						self._bus.send(message, 0)
+						count += 1
+				except can.CanError:
+					pass
+		if count < len(messages):
+			if timeout == 0 and self._transmit_queue is not None:
+				return count
+			self._send_later(Network.send_many, messages[count:], timeout)
+		return len(messages)
+
+
+class _Sent(object):
+	""" Awaitable returned by AsyncNetwork.send. If the message has already been passed to the bus, awaiting completes immediately. Otherwise it waits for the sender thread.
+	"""
+
+	__slots__ = ["_future"]
+
+	def __await__(self):
+		if self._future is None:
+			return iter(())
+		return asyncio.wrap_future(self._future).__await__()
+
+	def __init__(self, future = None):
+		"""
+		:param future: The concurrent future of the transfer in the sender thread or None if the message has already been passed to the bus.
+		"""
+		self._future = future
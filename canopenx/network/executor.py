@@ -0,0 +1,164 @@
+import queue
+import threading
+
+
+class QueueWorker(object):
+	""" A thread, which calls the queued callbacks one after another.
+
+	The queue is bounded. The calls are executed in the order they were queued.
+	"""
+
+	__slots__ = ["_queue", "_stopped", "_thread"]
+
+	def __init__(self, queue_size):
+		"""
+		:param queue_size: The maximum number of queued calls. Must be at least 1.
+
+		:raises: ValueError
+		"""
+		if queue_size < 1:
+			raise ValueError("The queue size must be at least 1.")
+		self._queue = queue.Queue(queue_size)
+		self._stopped = threading.Event()
+		self._thread = threading.Thread(target = self._run, daemon = True)
+		self._thread.start()
+
+	def _run(self):
+		while True:
+			item = self._queue.get()
+			if item is None:
+				return
+			callback, message = item
+			try:
+				callback(message)
+			except:
+				pass
+			if self._stopped.is_set() and self._queue.empty():
+				return
+
+	def stop(self):
+		""" Stops the worker after all queued calls are executed. Waits for the worker, unless called from a callback on the worker.
+		"""
+		self._stopped.set()
+		try:
+			self._queue.put_nowait(None)
+		except queue.Full:
+			# The worker checks the stop flag after each call, so it stops when the queue is drained
+			pass
+		if threading.current_thread() is not self._thread:
+			self._thread.join()
+
+	def submit(self, callback, message, block = True):
+		""" Queues a call of the callback with the message.
+		Returns False if the queue is full and the call was dropped.
+
+		:param callback: The callback to call.
+
+		:param message: The message to pass to the callback.
+
+		:param block: If True, waits until there is space in the queue. If False, the call is dropped if the queue is full.
+		"""
+		try:
+			self._queue.put((callback, message), block)
+		except queue.Full:
+			return False
+		return True
+
+
+class WorkerPool(object):
+	""" A pool of queue workers shared by several callbacks.
+
+	All calls for the same cob id are passed to the same worker, so the order of the messages is kept for each cob id.
+	"""
+
+	__slots__ = ["_users", "_workers"]
+
+	def __contains__(self, worker):
+		""" Returns True if the worker belongs to the pool.
+		"""
+		return worker in self._workers
+
+	def __init__(self, workers, queue_size):
+		"""
+		:param workers: The number of worker threads. Must be at least 1.
+
+		:param queue_size: The maximum number of queued calls of each worker. Must be at least 1.
+
+		:raises: ValueError
+		"""
+		if workers < 1:
+			raise ValueError("The number of workers must be at least 1.")
+		if queue_size < 1:
+			raise ValueError("The queue size must be at least 1.")
+		self._workers = [QueueWorker(queue_size) for _ in range(workers)]
+		self._users = 0
+
+	def acquire(self):
+		""" Registers a user of the pool.
+		"""
+		self._users += 1
+
+	def release(self):
+		""" Unregisters a user of the pool. Returns True if there are no users left.
+		"""
+		self._users -= 1
+		return self._users == 0
+
+	def stop(self):
+		""" Stops all workers after all queued calls are executed.
+		"""
+		for worker in self._workers:
+			worker.stop()
+
+	def worker(self, cob_id):
+		""" Returns the worker for the specified cob id.
+		"""
+		return self._workers[cob_id % len(self._workers)]
+
+
+class QueuedCallback(object):
+	""" Callable, which passes the message to a queue worker instead of calling the callback directly.
+	"""
+
+	__slots__ = ["_block", "_callback", "_dropped", "_worker"]
+
+	def __call__(self, message):
+		if not self._worker.submit(self._callback, message, self._block):
+			self._dropped += 1
+
+	def __init__(self, callback, worker, block):
+		"""
+		:param callback: The callback to call from the worker.
+
+		:param worker: The QueueWorker to pass the calls to.
+
+		:param block: If True, waits until there is space in the queue of the worker. If False, the messages are dropped while the queue is full.
+		"""
+		self._callback = callback
+		self._worker = worker
+		self._block = block
+		self._dropped = 0
+
+	@property
+	def block(self):
+		""" Returns True if the receiving thread waits for space in the queue of the worker.
+		"""
+		return self._block
+
+	@property
+	def callback(self):
+		""" Returns the callback called from the worker.
+		"""
+		return self._callback
+
+	@property
+	def dropped(self):
+		""" Returns the number of messages dropped because the queue was full.
+		"""
+		return self._dropped
+
+	@property
+	def worker(self):
+		""" Returns the worker the calls are passed to.
+		"""
+		return self._worker
@@ -0,0 +1,170 @@
+""" Computation of acceptance filters for the CAN bus from a set of cob ids.
+
+The filters are returned in the format used by python-can for ``BusABC.set_filters``.
+"""
+
+
+def compute_filters(cob_ids, budget = None, masks = ()):
+	""" Returns a list of acceptance filters, which accepts at least all frames with the specified cob ids and masks.
+
+	First, identifiers are combined into aligned blocks, if all identifiers of the block are subscribed. This does not accept additional identifiers.
+	If the number of filters exceeds the budget afterwards, the pair of filters which accepts the least number of additional identifiers when combined is merged, until the budget is met.
+	Without cob ids and masks, a single filter is returned, which accepts only the extended frame with identifier 0, as an empty list of filters accepts all frames.
+
+	:param cob_ids: An iterable of cob ids. The frame type (base or extended) is encoded into bit 29.
+
+	:param budget: The maximum number of filters the CAN interface supports or None for no limit.
+
+	:param masks: An iterable of tuples of cob id and mask. The frame type (base or extended) is encoded into bit 29 of the cob id.
+
+	:returns: A list of dicts with the keys "can_id", "can_mask" and "extended". The key "extended" is omitted for a filter accepting both frame types.
+
+	:raises: ValueError
+	"""
+	if budget is not None and budget < 1:
+		raise ValueError("The filter budget must be at least 1.")
+
+	base = set()
+	extended = set()
+	for cob_id in cob_ids:
+		if cob_id & (1 << 29):
+			extended.add(cob_id & 0x1FFFFFFF)
+		else:
+			base.add(cob_id & 0x7FF)
+
+	base_masks = set()
+	extended_masks = set()
+	for cob_id, mask in masks:
+		if cob_id & (1 << 29):
+			extended_masks.add((cob_id & mask & 0x1FFFFFFF, mask & 0x1FFFFFFF))
+		else:
+			base_masks.add((cob_id & mask & 0x7FF, mask & 0x7FF))
+
+	filters = [(can_id, can_mask, False) for can_id, can_mask in sorted(_reduce(_combine(base, 11), base_masks))]
+	filters += [(can_id, can_mask, True) for can_id, can_mask in sorted(_reduce(_combine(extended, 29), extended_masks))]
+
+	if not filters:
+		return [{"can_id": 0x00000000, "can_mask": 0x1FFFFFFF, "extended": True}]
+
+	if budget is not None:
+		while len(filters) > budget:
+			filters = _merge_cheapest(filters)
+
+	result = []
+	for can_id, can_mask, is_extended in filters:
+		if is_extended is None:
+			result.append({"can_id": can_id, "can_mask": can_mask})
+		else:
+			result.append({"can_id": can_id, "can_mask": can_mask, "extended": is_extended})
+	return result
+
+
+def range_masks(first, last):
+	""" Splits a range of cob ids into aligned blocks, which can be described by a cob id and a mask each.
+	Raises ValueError if the range is empty or the frame types of first and last differ.
+
+	:param first: The first cob id of the range. The frame type (base or extended) is encoded into bit 29.
+
+	:param last: The last cob id of the range (inclusive). The frame type (base or extended) is encoded into bit 29.
+
+	:returns: A list of tuples of cob id and mask.
+
+	:raises: ValueError
+	"""
+	frame = first & (1 << 29)
+	if frame != last & (1 << 29):
+		raise ValueError("The frame types of the first and the last cob id of the range differ.")
+	if frame:
+		full_mask = 0x1FFFFFFF
+	else:
+		full_mask = 0x7FF
+	first &= full_mask
+	last &= full_mask
+	if first > last:
+		raise ValueError("The range is empty.")
+
+	result = []
+	while first <= last:
+		if first == 0:
+			size = full_mask + 1
+		else:
+			size = first & -first
+		while size > last - first + 1:
+			size >>= 1
+		result.append((frame | first, full_mask & ~(size - 1)))
+		first += size
+	return result
+
+
+def _accepted(can_mask, is_extended):
+	""" Returns the number of identifiers accepted by a filter with the specified mask.
+	"""
+	if is_extended:
+		return 1 << (29 - bin(can_mask).count("1"))
+	return 1 << (11 - bin(can_mask).count("1"))
+
+
+def _combine(can_ids, width):
+	""" Combines identifiers into aligned blocks, which are completely subscribed. The combined filters accept the same identifiers as the original identifiers.
+	"""
+	full_mask = (1 << width) - 1
+	result = []
+	current = set(can_ids)
+	for level in range(width):
+		bit = 1 << level
+		mask = (full_mask << level) & full_mask
+		combined = set()
+		for can_id in current:
+			if can_id ^ bit in current:
+				combined.add(can_id & ~bit)
+			else:
+				result.append((can_id, mask))
+		current = combined
+	result.extend((can_id, 0) for can_id in current)
+	return result
+
+
+def _reduce(filters, masks):
+	""" Adds the masks to the filters and drops all filters, which are covered by another filter.
+	"""
+	filters = set(filters) | set(masks)
+	result = []
+	for can_id, can_mask in filters:
+		covered = False
+		for other_id, other_mask in masks:
+			if (other_id, other_mask) != (can_id, can_mask) and can_mask & other_mask == other_mask and can_id & other_mask == other_id:
+				covered = True
+				break
+		if not covered:
+			result.append((can_id, can_mask))
+	return result
+
+
+def _merge_cheapest(filters):
+	""" Merges the two filters of the same frame type, which accept the least number of additional identifiers when merged.
+	Only neighbours in the sorted list are considered as candidates, to keep the search linear in the number of filters.
+	Filters which are covered by the merged filter are dropped.
+	"""
+	best = None
+	for i in range(len(filters) - 1):
+		id1, mask1, ext1 = filters[i]
+		id2, mask2, ext2 = filters[i + 1]
+		if ext1 != ext2:
+			continue
+		mask = mask1 & mask2 & ~(id1 ^ id2)
+		cost = _accepted(mask, ext1) - _accepted(mask1, ext1) - _accepted(mask2, ext2)
+		if best is None or cost < best[0]:
+			best = (cost, (id1 & mask, mask, ext1))
+
+	if best is None:
+		# Only one filter for each frame type is left, a filter without frame type accepts all frames
+		return [(0, 0, None)]
+
+	can_id, can_mask, is_extended = best[1]
+	result = [best[1]]
+	for f in filters:
+		if f[2] == is_extended and f[1] & can_mask == can_mask and f[0] & can_mask == can_id:
+			continue
+		result.append(f)
+	result.sort(key = lambda f: (f[2], f[0]))
+	return result
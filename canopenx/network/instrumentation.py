@@ -0,0 +1,123 @@
+import threading
+import time
+
+
+class Instrumentation(object):
+	""" Counters of the dispatching of received messages in a network.
+
+	It counts the received frames and bytes for each cob id, the calls, exceptions and runtimes of each subscribed callback and the latency from the reception of a message to the completion of a callback.
+	The latency histogram uses logarithmic buckets, bucket n counts the latencies below 2 ** n microseconds.
+	"""
+
+	__slots__ = ["_callbacks", "_frames", "_latency", "_lock"]
+
+	def __init__(self):
+		self._frames = {}
+		self._callbacks = {}
+		self._latency = {}
+		self._lock = threading.Lock()
+
+	def count(self, message):
+		""" Counts a received message.
+		"""
+		if message.is_extended_id:
+			cob_id = (1 << 29) | message.arbitration_id
+		else:
+			cob_id = message.arbitration_id
+		with self._lock:
+			try:
+				counters = self._frames[cob_id]
+			except KeyError:
+				counters = [0, 0]
+				self._frames[cob_id] = counters
+			counters[0] += 1
+			counters[1] += len(message.data)
+
+	def latency(self, message):
+		""" Adds the latency from the timestamp of the message to now to the histogram.
+		"""
+		bucket = max(0, int((time.time() - message.timestamp) * 1000000)).bit_length()
+		with self._lock:
+			self._latency[bucket] = self._latency.get(bucket, 0) + 1
+
+	def snapshot(self):
+		""" Returns a snapshot of all counters.
+
+		:returns: A dict with the keys "frames", "callbacks" and "latency".
+			"frames" maps the cob id to a dict with the keys "count" and "bytes". The frame type (base or extended) is encoded into bit 29.
+			"callbacks" is a list of dicts with the keys "cob_id", "mask", "callback", "calls", "exceptions", "total_time" and "max_time" for each subscription. The times are in seconds.
+			"latency" maps the upper bound of each bucket in seconds to the number of callbacks completed within this latency.
+		"""
+		with self._lock:
+			frames = {cob_id: {"count": counters[0], "bytes": counters[1]} for cob_id, counters in self._frames.items()}
+			latency = {(1 << bucket) / 1000000: count for bucket, count in sorted(self._latency.items())}
+			records = list(self._callbacks.items())
+
+		callbacks = []
+		for (cob_id, mask, callback), record in records:
+			callbacks.append({
+				"cob_id": cob_id,
+				"mask": mask,
+				"callback": getattr(callback, "__qualname__", type(callback).__name__),
+				"calls": record.calls,
+				"exceptions": record.exceptions,
+				"total_time": record.total_time,
+				"max_time": record.max_time
+			})
+
+		return {"frames": frames, "callbacks": callbacks, "latency": latency}
+
+	def wrap(self, cob_id, mask, callback):
+		""" Returns a callable, which calls the callback and measures it.
+		The counters of a subscription are kept, if the callback is wrapped again.
+
+		:param cob_id: The cob id of the subscription.
+
+		:param mask: The mask of the subscription.
+
+		:param callback: The subscribed callback.
+		"""
+		key = (cob_id, mask, callback)
+		with self._lock:
+			try:
+				record = self._callbacks[key]
+			except KeyError:
+				record = InstrumentedCallback(self, callback)
+				self._callbacks[key] = record
+		return record
+
+
+class InstrumentedCallback(object):
+	""" Callable, which calls the callback and counts the calls, exceptions and the runtime.
+	"""
+
+	__slots__ = ["_callback", "_instrumentation", "calls", "exceptions", "max_time", "total_time"]
+
+	def __call__(self, message):
+		self.calls += 1
+		start = time.perf_counter()
+		try:
+			self._callback(message)
+		except:
+			self.exceptions += 1
+			raise
+		finally:
+			duration = time.perf_counter() - start
+			self.total_time += duration
+			if duration > self.max_time:
+				self.max_time = duration
+			self._instrumentation.latency(message)
+
+	def __init__(self, instrumentation, callback):
+		self._instrumentation = instrumentation
+		self._callback = callback
+		self.calls = 0
+		self.exceptions = 0
+		self.total_time = 0.0
+		self.max_time = 0.0
+
+	@property
+	def callback(self):
+		""" Returns the measured callback.
+		"""
+		return self._callback
@@ -0,0 +1,227 @@
+from .network import Network
+
+
+class MultiNetwork(object):
+	""" A set of networks, one for each CAN channel of a device.
+
+	Each channel is a Network with its own bus and notifier thread, so the received messages of the channels are dispatched in parallel. A node is bound to the channel it is added to.
+	Routes forward the messages with matching identifiers from one channel to another. The received message object is passed to the destination without copying it.
+	"""
+
+	__slots__ = ["_channels", "_queue_size", "_routes", "_workers"]
+
+	def __contains__(self, name):
+		""" Returns True if the multi network contains a channel with the specified name.
+		"""
+		return name in self._channels
+
+	def __delitem__(self, name):
+		""" Removes a channel from the multi network. The channel gets disconnected and all routes from or to the channel are removed.
+		Raises KeyError if there is no channel with the specified name.
+
+		:raises: KeyError
+		"""
+		network = self._channels[name]
+		for key in [key for key in self._routes if name in key[:2]]:
+			self.remove_route(*key)
+		network.disconnect()
+		del self._channels[name]
+
+	def __getitem__(self, name):
+		""" Returns the network of the channel with the specified name.
+		Raises KeyError if there is no channel with the specified name.
+
+		:raises: KeyError
+		"""
+		return self._channels[name]
+
+	def __init__(self, workers = 4, queue_size = 1024):
+		"""
+		:param workers: The number of worker threads of each channel for callbacks subscribed with the execution "pool".
+
+		:param queue_size: The default size of the queues of each channel for callbacks subscribed with the execution "pool" or "queue".
+
+		:raises: ValueError
+		"""
+		if workers < 1:
+			raise ValueError("The number of workers must be at least 1.")
+		if queue_size < 1:
+			raise ValueError("The queue size must be at least 1.")
+
+		self._workers = int(workers)
+		self._queue_size = int(queue_size)
+		self._channels = {}
+		self._routes = {}
+
+	def __iter__(self):
+		""" Returns an iterator over the names of all channels.
+		"""
+		return iter(self._channels)
+
+	def __len__(self):
+		""" Returns the number of channels.
+		"""
+		return len(self._channels)
+
+	def add(self, node, channel):
+		""" Adds a node to the network of a channel.
+		Raises KeyError if there is no channel with the specified name.
+		Raises ValueError if a node with the node id or name is already in the network of the channel.
+
+		:param node: The node to add.
+
+		:param channel: The name of the channel.
+
+		:raises: KeyError, ValueError
+		"""
+		self._channels[channel].add(node)
+
+	def add_channel(self, name, network = None):
+		""" Adds a channel to the multi network and returns its network.
+		Raises ValueError if there is already a channel with the specified name.
+
+		:param name: The name of the channel.
+
+		:param network: The network of the channel, e.g. an AsyncNetwork. If None, a Network is created.
+
+		:returns: The network of the channel.
+
+		:raises: ValueError
+		"""
+		if name in self._channels:
+			raise ValueError("A channel with this name is already in the multi network.")
+		if network is None:
+			network = Network(self._workers, self._queue_size)
+		self._channels[name] = network
+		return network
+
+	def add_route(self, source, destination, cob_id, mask = 0x1FFFFFFF):
+		""" Adds a route, which forwards all messages received on the source channel matching the cob id in the bits set in the mask to the destination channel.
+		The frame type (base or extended) is encoded into bit 29 of the cob id.
+		Raises KeyError if one of the channels is not found.
+		Raises ValueError if source and destination are the same channel or the route already exists.
+
+		:param source: The name of the channel to receive the messages from.
+
+		:param destination: The name of the channel to send the messages to.
+
+		:param cob_id: The CAN object id to match.
+
+		:param mask: The mask of the identifier bits to compare. By default all bits are compared.
+
+		:returns: The Route object.
+
+		:raises: KeyError, ValueError
+		"""
+		source_network = self._channels[source]
+		destination_network = self._channels[destination]
+		if source == destination:
+			raise ValueError("The source and destination of a route must be different channels.")
+		key = (source, destination, int(cob_id), int(mask))
+		if key in self._routes:
+			raise ValueError("This route already exists.")
+
+		route = Route(destination_network)
+		source_network.subscribe_mask(cob_id, mask, route)
+		self._routes[key] = route
+		return route
+
+	def connect(self, channel, bus, **kwargs):
+		""" Connects the network of a channel to a CAN bus. The keyword arguments are passed to the connect method of the network.
+		Raises KeyError if there is no channel with the specified name.
+
+		:param channel: The name of the channel.
+
+		:param bus: The CAN bus to connect to.
+
+		:raises: KeyError
+		"""
+		self._channels[channel].connect(bus, **kwargs)
+
+	def disconnect(self):
+		""" Disconnects the networks of all channels.
+		"""
+		for network in self._channels.values():
+			network.disconnect()
+
+	def find(self, key):
+		""" Returns the channel name and the node identified by the node id or name. The channels are searched in the order they were added.
+		Raises KeyError if there is no such node in any channel.
+
+		:param key: The node id or name to look for.
+
+		:returns: A tuple of the channel name and the node.
+
+		:raises: KeyError
+		"""
+		for name, network in self._channels.items():
+			if key in network:
+				return (name, network[key])
+		raise KeyError(key)
+
+	def nodes(self):
+		""" Returns an iterator over the tuples of channel name and node for all nodes in all channels.
+		"""
+		for name, network in self._channels.items():
+			for node in network:
+				yield (name, node)
+
+	def remove_route(self, source, destination, cob_id, mask = 0x1FFFFFFF):
+		""" Removes a route.
+		Raises ValueError if the route does not exist.
+
+		:raises: ValueError
+		"""
+		key = (source, destination, int(cob_id), int(mask))
+		try:
+			route = self._routes.pop(key)
+		except KeyError:
+			raise ValueError("This route does not exist.")
+		self._channels[source].unsubscribe_mask(cob_id, mask, route)
+
+	@property
+	def routes(self):
+		""" Returns a dict, which maps the tuples of source, destination, cob id and mask to the Route objects.
+		"""
+		return dict(self._routes)
+
+
+class Route(object):
+	""" Callable, which forwards the received messages to the destination network.
+	"""
+
+	__slots__ = ["_destination", "_errors", "_forwarded"]
+
+	def __call__(self, message):
+		try:
+			self._destination.send(message, 0)
+		except:
+			self._errors += 1
+			raise
+		self._forwarded += 1
+
+	def __init__(self, destination):
+		"""
+		:param destination: The network to send the messages to.
+		"""
+		self._destination = destination
+		self._forwarded = 0
+		self._errors = 0
+
+	@property
+	def destination(self):
+		""" Returns the network the messages are sent to.
+		"""
+		return self._destination
+
+	@property
+	def errors(self):
+		""" Returns the number of messages, which could not be forwarded (e.g. because the destination is disconnected or its transmit queue is full).
+		"""
+		return self._errors
+
+	@property
+	def forwarded(self):
+		""" Returns the number of forwarded messages.
+		"""
+		return self._forwarded
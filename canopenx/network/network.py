@@ -1,8 +1,14 @@
 import can
+from canopenx.node.service.sdo import SDOClient
+from canopenx.node.service.sdo.sdofuture import gather
+from .executor import QueuedCallback, QueueWorker, WorkerPool
+from .filters import compute_filters, range_masks
+from .instrumentation import Instrumentation
+from .transmitqueue import TransmitQueue
 
 
 class Network(object):
-	__slots__ = ["_bus", "_listeners", "_nodes_id", "_nodes_name", "_notifier", "_subscribers"]
+	__slots__ = ["_bus", "_dispatch_base", "_dispatch_extended", "_extended_base", "_filter_budget", "_filters", "_instrumentation", "_listeners", "_nodes_id", "_nodes_name", "_notifier", "_pattern_keys", "_pattern_table", "_patterns", "_pool", "_queue_size", "_subscribers", "_transmit_queue", "_workers"]
 
 	def __contains__(self, key):
 		""" Returns True if the network contains a node with the specified node id
@@ -48,14 +54,38 @@ class Network(object):
 		except KeyError:
 			return self._nodes_name[key]
 
-	def __init__(self):
+	def __init__(self, workers = 4, queue_size = 1024):
 		""" Initialises a ``Network``
+
+		:param workers: The number of worker threads for callbacks subscribed with the execution "pool".
+
+		:param queue_size: The default size of the queues for callbacks subscribed with the execution "pool" or "queue".
+
+		:raises: ValueError
 		"""
+		if workers < 1:
+			raise ValueError("The number of workers must be at least 1.")
+		if queue_size < 1:
+			raise ValueError("The queue size must be at least 1.")
+
+		self._workers = int(workers)
+		self._queue_size = int(queue_size)
+		self._pool = None
+		self._instrumentation = None
 		self._bus = None
 		self._subscribers = {}
+		self._patterns = {}
+		self._pattern_keys = {}
+		self._pattern_table = ()
+		self._dispatch_base = [()] * 2048
+		self._extended_base = {}
+		self._dispatch_extended = {}
 		self._nodes_id = {}
 		self._nodes_name = {}
 		self._notifier = None
+		self._transmit_queue = None
+		self._filters = False
+		self._filter_budget = None
 		self._listeners = [MessageListener(self)]
 
 	def __iter__(self):
@@ -68,6 +98,205 @@ class Network(object):
 		"""
 		return len(self._nodes_id)
 
+	def _create_handler(self, cob_id, mask, callback, execution, overflow, queue_size):
+		""" Returns the callable, which is put into the dispatch table for the callback.
+		Raises ValueError if the execution, overflow or queue size is invalid. The workers of the pool are shared, so a queue size cannot be specified for the execution "pool".
+
+		:raises: ValueError
+		"""
+		if execution not in ["inline", "pool", "queue"]:
+			raise ValueError("The specified execution is not one of \"inline\", \"pool\", \"queue\".")
+		if overflow not in ["block", "drop"]:
+			raise ValueError("The specified overflow is not one of \"block\", \"drop\".")
+		if execution == "pool" and queue_size is not None:
+			raise ValueError("The queue size cannot be specified for the execution \"pool\".")
+		if queue_size is None:
+			queue_size = self._queue_size
+		if queue_size < 1:
+			raise ValueError("The queue size must be at least 1.")
+
+		if self._instrumentation is not None:
+			callback = self._instrumentation.wrap(cob_id, mask, callback)
+
+		if execution == "pool":
+			if self._pool is None:
+				self._pool = WorkerPool(self._workers, self._queue_size)
+			self._pool.acquire()
+			return QueuedCallback(callback, self._pool.worker(cob_id), overflow == "block")
+		if execution == "queue":
+			return QueuedCallback(callback, QueueWorker(queue_size), overflow == "block")
+		return callback
+
+	def _create_notifier(self):
+		""" Returns the notifier, which passes the received messages of the bus to the network.
+		"""
+		return can.Notifier(bus = self._bus, listeners = self._listeners, timeout = 0.1)
+
+	def _matching(self, cob_id):
+		""" Returns a tuple of the handlers of all mask subscriptions matching the cob id.
+		It uses the published tuple of the mask subscriptions, so it may be called in the receive thread while the subscriptions change.
+		"""
+		handlers = ()
+		for pattern_id, mask, pattern_handlers in self._pattern_table:
+			if pattern_id == (cob_id & (1 << 29)) | (cob_id & mask):
+				handlers += pattern_handlers
+		return handlers
+
+	def _publish_patterns(self):
+		""" Publishes the mask subscriptions as an immutable tuple for the receive thread.
+		"""
+		self._pattern_table = tuple((cob_id, mask, tuple(handlers.values())) for (cob_id, mask), handlers in self._patterns.items())
+
+	def _rebuild(self, cob_id):
+		""" Rebuilds the dispatch table entry for the specified cob id from the subscribers of the cob id and the matching mask subscriptions.
+		The table entries are immutable tuples, so the receive thread never sees a partially updated entry. The map for extended frames is replaced instead of changed.
+
+		:param cob_id: The normalised cob id, with the frame type encoded in bit 29.
+		"""
+		callbacks = tuple(self._subscribers.get(cob_id, {}).values()) + self._matching(cob_id)
+		if cob_id & (1 << 29):
+			base = dict(self._extended_base)
+			if callbacks:
+				base[cob_id & 0x1FFFFFFF] = callbacks
+			else:
+				base.pop(cob_id & 0x1FFFFFFF, None)
+			self._extended_base = base
+			self._dispatch_extended = dict(base)
+		else:
+			self._dispatch_base[cob_id] = callbacks
+
+	def _rebuild_pattern(self, cob_id, mask):
+		""" Rebuilds the dispatch table entries for all cob ids matching the mask subscription.
+		For base frames all matching slots of the table are rebuilt. For extended frames the sparse map is replaced by a new map with the subscribed cob ids only. The entries for the other cob ids are resolved again on reception.
+		"""
+		if cob_id & (1 << 29):
+			base = {}
+			for subscribed_id, handlers in self._subscribers.items():
+				if subscribed_id & (1 << 29):
+					callbacks = tuple(handlers.values()) + self._matching(subscribed_id)
+					if callbacks:
+						base[subscribed_id & 0x1FFFFFFF] = callbacks
+			self._extended_base = base
+			self._dispatch_extended = dict(base)
+		else:
+			for can_id in range(2048):
+				if can_id & mask == cob_id:
+					self._rebuild(can_id)
+
+	def _rebuild_all(self):
+		""" Rewraps the handlers of all subscriptions for the current instrumentation and rebuilds the dispatch table.
+		The patterns of a range subscription keep sharing one handler.
+		"""
+		for cob_id, handlers in self._subscribers.items():
+			mask = 0x1FFFFFFF if cob_id & (1 << 29) else 0x7FF
+			for callback, handler in handlers.items():
+				handlers[callback] = self._rewrap(cob_id, mask, callback, handler)
+
+		rewrapped = {}
+		for pattern, handlers in self._patterns.items():
+			for callback, handler in handlers.items():
+				key = self._pattern_keys[(pattern, callback)]
+				if (key, callback) not in rewrapped:
+					rewrapped[(key, callback)] = self._rewrap(key[0], key[1], callback, handler)
+				handlers[callback] = rewrapped[(key, callback)]
+		self._publish_patterns()
+
+		for cob_id in range(2048):
+			self._rebuild(cob_id)
+		self._rebuild_pattern(1 << 29, 0)
+
+	def _release_handler(self, handler):
+		""" Stops the worker of the handler, if it is not used anymore.
+		"""
+		if isinstance(handler, QueuedCallback):
+			if self._pool is not None and handler.worker in self._pool:
+				if self._pool.release():
+					self._pool.stop()
+					self._pool = None
+			else:
+				handler.worker.stop()
+
+	def _rewrap(self, cob_id, mask, callback, handler):
+		""" Returns the handler of the callback wrapped for the current instrumentation. A queued handler keeps its worker.
+		"""
+		inner = callback
+		if self._instrumentation is not None:
+			inner = self._instrumentation.wrap(cob_id, mask, callback)
+		if isinstance(handler, QueuedCallback):
+			return QueuedCallback(inner, handler.worker, handler.block)
+		return inner
+
+	def _resolve_extended(self, can_id):
+		""" Returns the callbacks for an extended frame identifier without an entry in the sparse map and adds the entry.
+		It runs in the receive thread and reads only the published map of the subscribed cob ids and tuple of the mask subscriptions. The entry is not added, if the subscriptions changed and the map was replaced meanwhile.
+		The number of resolved entries is limited, the map is cleared if the limit is reached.
+		"""
+		dispatch = self._dispatch_extended
+		callbacks = self._extended_base.get(can_id)
+		if callbacks is None:
+			callbacks = self._matching((1 << 29) | can_id)
+		if len(dispatch) >= 4096:
+			dispatch.clear()
+		if self._dispatch_extended is dispatch:
+			dispatch[can_id] = callbacks
+		return callbacks
+
+	def _sdo_clients(self, nodes):
+		""" Returns a list of the nodes identified by the node ids or names, or of all nodes with a SDO client if nodes is None.
+
+		:raises: KeyError, ValueError
+		"""
+		if nodes is None:
+			return [node for node in self._nodes_id.values() if isinstance(getattr(node, "sdo", None), SDOClient)]
+		nodes = [self[key] for key in nodes]
+		for node in nodes:
+			if not isinstance(getattr(node, "sdo", None), SDOClient):
+				raise ValueError("The node {} has no SDO client.".format(node.id))
+		return nodes
+
+	def _subscribe_patterns(self, patterns, callback, execution, overflow, queue_size):
+		""" Adds the callback for the mask subscriptions and rebuilds the dispatch table.
+		All patterns share one handler, so a range subscription has one worker and one set of counters, which are keyed by the first pattern.
+		"""
+		key = patterns[0]
+		handler = self._create_handler(key[0], key[1], callback, execution, overflow, queue_size)
+		for pattern in patterns:
+			if pattern not in self._patterns:
+				self._patterns[pattern] = {}
+			self._patterns[pattern][callback] = handler
+			self._pattern_keys[(pattern, callback)] = key
+			self._publish_patterns()
+			self._rebuild_pattern(*pattern)
+		self._update_filters()
+
+	def _unsubscribe_patterns(self, patterns, callback):
+		""" Removes the callback from the mask subscriptions and rebuilds the dispatch table.
+		The shared handler is released, when it is not used by any other pattern.
+		"""
+		handlers = []
+		for pattern in patterns:
+			handler = self._patterns[pattern].pop(callback)
+			del self._pattern_keys[(pattern, callback)]
+			if not self._patterns[pattern]:
+				del self._patterns[pattern]
+			self._publish_patterns()
+			self._rebuild_pattern(*pattern)
+			if not any(handler is other for other in handlers):
+				handlers.append(handler)
+		for handler in handlers:
+			if not any(handler is other for pattern_handlers in self._patterns.values() for other in pattern_handlers.values()):
+				self._release_handler(handler)
+		self._update_filters()
+
+	def _update_filters(self):
+		""" Computes the acceptance filters from the subscribed cob ids and applies them to the CAN bus, if filtering is enabled.
+		"""
+		if self._bus is None or not self._filters:
+			return
+		cob_ids = [cob_id for cob_id, callbacks in self._subscribers.items() if callbacks]
+		masks = [pattern for pattern, callbacks in self._patterns.items() if callbacks]
+		self._bus.set_filters(compute_filters(cob_ids, self._filter_budget, masks))
+
 	def add(self, node):
 		""" Adds a node to the network. It may be accessed later by the node id.
 		Raises ValueError if a node with the node id is already in the network.
@@ -93,22 +322,77 @@ class Network(object):
 		"""
 		return self._bus
 
-	def connect(self, bus):
+	def connect(self, bus, filters = False, filter_budget = None, transmit_queue_size = None, notifier = True):
 		""" Connects this network to a CAN bus. Disconnects the network first if it is already connected to a bus.
+
+		:param bus: The CAN bus to connect to.
+
+		:param filters: If True, acceptance filters for the subscribed cob ids are applied to the CAN bus and updated on each change of the subscriptions.
+			Frames with other identifiers are dropped by the interface (or python-can) and are not passed to the network.
+
+		:param filter_budget: The maximum number of filters supported by the interface or None for no limit.
+			If there are more filters needed, the filters get merged and accept some additional identifiers.
+
+		:param transmit_queue_size: If None, the messages are passed to the bus directly by send. Otherwise the messages are queued by priority and sent by a single writer thread.
+			The size limits the number of queued messages.
+
+		:param notifier: If True, the received messages are dispatched by a notifier thread. If False, the application has to call poll to receive and dispatch the messages in its own thread.
+
+		:raises: ValueError
 		"""
+		if filter_budget is not None and filter_budget < 1:
+			raise ValueError("The filter budget must be at least 1.")
+		if transmit_queue_size is not None and transmit_queue_size < 1:
+			raise ValueError("The transmit queue size must be at least 1.")
 		if self.is_connected():
 			self.disconnect()
 		self._bus = bus
-		self._notifier = can.Notifier(bus = self._bus, listeners = self._listeners, timeout = 0.1)
+		self._filters = bool(filters)
+		self._filter_budget = filter_budget
+		self._update_filters()
+		if transmit_queue_size is not None:
+			self._transmit_queue = TransmitQueue(bus, transmit_queue_size)
+		if notifier:
+			self._notifier = self._create_notifier()
 
 	def disconnect(self):
-		""" Disconnect from the current CAN bus.
+		""" Disconnect from the current CAN bus. The queued messages are sent before.
 		"""
 		if self._notifier is not None:
 			self._notifier.stop()
 			self._notifier = None
+		if self._transmit_queue is not None:
+			self._transmit_queue.stop()
+			self._transmit_queue = None
+		if self._bus is not None and self._filters:
+			self._bus.set_filters(None)
+		self._filters = False
+		self._filter_budget = None
 		self._bus = None
 
+	def disable_instrumentation(self):
+		""" Disables the instrumentation of the dispatching. The collected counters are discarded.
+		"""
+		if self._instrumentation is None:
+			return
+		self._instrumentation = None
+		self._rebuild_all()
+
+	def enable_instrumentation(self):
+		""" Enables the instrumentation of the dispatching. Counts the received frames and bytes for each cob id, the calls, exceptions and runtimes of each callback and the latency from reception to the completion of the callbacks.
+		If the instrumentation is already enabled, the counters are kept.
+		"""
+		if self._instrumentation is not None:
+			return
+		self._instrumentation = Instrumentation()
+		self._rebuild_all()
+
+	@property
+	def instrumentation(self):
+		""" Returns the instrumentation of the dispatching or None if it is disabled.
+		"""
+		return self._instrumentation
+
 	def is_connected(self):
 		""" Returns True if the network is connected to a CAN bus.
 		"""
@@ -116,34 +400,124 @@ class Network(object):
 
 	def on_message_received(self, message):
 		""" Handler for received messages. It distributes the message to all callbacks that are registered to the message id.
+		Base frames are looked up in a table with one slot per 11-bit identifier, extended frames in a sparse map. Mask and range subscriptions are resolved into the entries of the table and the map.
 		"""
 		if message.is_extended_id:
-			cob_id = (1 << 29) | message.arbitration_id
+			try:
+				callbacks = self._dispatch_extended[message.arbitration_id]
+			except KeyError:
+				callbacks = self._resolve_extended(message.arbitration_id)
 		else:
-			cob_id = message.arbitration_id
-		try:
-			for callback in self._subscribers[cob_id]:
-				try:
-					callback(message)
-				except:
-					pass
-		except KeyError:
-			return
+			try:
+				callbacks = self._dispatch_base[message.arbitration_id]
+			except IndexError:
+				return
+		instrumentation = self._instrumentation
+		if instrumentation is not None:
+			instrumentation.count(message)
+		for callback in callbacks:
+			try:
+				callback(message)
+			except:
+				pass
+
+	def poll(self, timeout = 0.0, max_frames = None):
+		""" Receives the messages from the CAN bus and dispatches them in the calling thread. Waits up to the timeout for the first message, then dispatches all messages already received without waiting.
+		Raises RuntimeError if the network is not connected to a bus or the messages are dispatched by a notifier thread.
+
+		:param timeout: The time in seconds to wait for the first message. If None, waits until a message is received.
+
+		:param max_frames: The maximum number of messages to dispatch or None for no limit.
+
+		:returns: The number of dispatched messages.
+
+		:raises: RuntimeError
+		"""
+		if not self.is_connected():
+			raise RuntimeError("The network is not connected to a CAN bus.")
+		if self._notifier is not None:
+			raise RuntimeError("The messages are dispatched by the notifier of the network.")
+
+		count = 0
+		recv = self._bus.recv
+		message = recv(timeout)
+		while message is not None:
+			self.on_message_received(message)
+			count += 1
+			if max_frames is not None and count >= max_frames:
+				break
+			message = recv(0.0)
+		return count
+
+	def read_many(self, entries, nodes = None, block = False):
+		""" Reads the entries from several nodes with their SDO clients. Returns a SDOFuture, which is completed with a dict of the node ids to the lists of SDOResult in the order of the entries.
+		The transfers of each node are queued in its SDO client and the transfers to different nodes run in parallel. A failed transfer does not stop the others, its error and abort code are kept in its result.
+		The entries are looked up for all nodes before any transfer is started.
+		Raises KeyError if a node is not in the network or an entry is not in the object dictionary of a node. Raises ValueError if a node has no SDO client.
+
+		:param entries: An iterable of the tuples (index, subindex) of the entries.
 
-	def send(self, message):
+		:param nodes: An iterable of the node ids or names or None for all nodes with a SDO client.
+
+		:param block: If True, the block upload is used.
+
+		:raises: KeyError, ValueError
+		"""
+		entries = list(entries)
+		nodes = self._sdo_clients(nodes)
+		variables = [node.sdo._variables(entries) for node in nodes]
+		futures = [node.sdo._read_many(node_variables, block) for node, node_variables in zip(nodes, variables)]
+		return gather(futures, lambda futures: {node.id: future.result() for node, future in zip(nodes, futures)})
+
+	def send(self, message, timeout = None):
 		""" Sends a CAN message on the CAN bus.
 		Raises RuntimeError if the network is not connected to a bus.
+		If the network uses a transmit queue, the message is queued. Raises RuntimeError if the transmit queue is still full after the timeout.
 
 		:param message: The message to send.
 
+		:param timeout: The time in seconds to wait for space in the transmit queue. If None, waits until there is space.
+
 		:raises: RuntimeError
 		"""
 		if not self.is_connected():
 			raise RuntimeError("The network is not connected to a CAN bus.")
 
-		self._bus.send(message)
+		if self._transmit_queue is not None:
+			self._transmit_queue.put(message, timeout)
+		else:
+			self._bus.send(message)
+
+	def send_many(self, messages, timeout = None):
+		""" Sends several CAN messages on the CAN bus. With a transmit queue, the messages are queued in one batch, so the writer thread is woken up once.
+		Stops at the first message, which is not accepted by the bus (or the transmit queue). The number of accepted messages is returned, so the caller may resume with the remaining messages.
+		Raises RuntimeError if the network is not connected to a bus.
+
+		:param messages: An iterable of messages to send.
+
+		:param timeout: The time in seconds to wait for space in the transmit queue for each message. If None, waits until there is space.
 
-	def subscribe(self, cob_id, callback):
+		:returns: The number of accepted messages.
+
+		:raises: RuntimeError
+		"""
+		if not self.is_connected():
+			raise RuntimeError("The network is not connected to a CAN bus.")
+
+		if self._transmit_queue is not None:
+			return self._transmit_queue.put_many(messages, timeout)
+
+		count = 0
+		send = self._bus.send
+		try:
+			for message in messages:
+				send(message)
+				count += 1
+		except can.CanError:
+			pass
+		return count
+
+	def subscribe(self, cob_id, callback, execution = "inline", overflow = "block", queue_size = None):
 		""" Subscribe to CAN messages with the specified identifier. For each message id multiple differend callbacks are allowed. The frame type (base or extended) is encoded into bit 29 and forms the cob_id.
 		A ValueError is raised if the callback is already registered for the specified message id.
 
@@ -152,6 +526,15 @@ class Network(object):
 
 		:param callback: The callback.
 
+		:param execution: A string. Must be one of "inline", "pool", "queue".
+			"inline" calls the callback directly from the receiving thread.
+			"pool" calls the callback from a worker thread of the network. All messages of one cob id are handled by the same worker, so the order is kept.
+			"queue" calls the callback from a worker thread dedicated to this subscription.
+
+		:param overflow: A string. Must be one of "block", "drop". Selects whether the receiving thread waits or the message is dropped, if the queue of the worker is full.
+
+		:param queue_size: The size of the queue for the execution "queue" or None to use the default size of the network. Must be None for the execution "pool", as the queues of the pool are shared.
+
 		:raises: ValueError
 		"""
 		cob_id = int(cob_id)
@@ -160,13 +543,79 @@ class Network(object):
 		else:
 			cob_id &= 0x7FF
 
+		if callback in self._subscribers.get(cob_id, {}):
+			raise ValueError("The specified callback is already registered for this cob id.")
+
+		if cob_id & (1 << 29):
+			handler = self._create_handler(cob_id, 0x1FFFFFFF, callback, execution, overflow, queue_size)
+		else:
+			handler = self._create_handler(cob_id, 0x7FF, callback, execution, overflow, queue_size)
+
 		if cob_id not in self._subscribers:
-			self._subscribers[cob_id] = []
+			self._subscribers[cob_id] = {}
+		self._subscribers[cob_id][callback] = handler
+		self._rebuild(cob_id)
+		if len(self._subscribers[cob_id]) == 1:
+			self._update_filters()
 
-		if callback in self._subscribers[cob_id]:
-			raise ValueError("The specified callback is already registered for this cob id.")
+	def subscribe_mask(self, cob_id, mask, callback, execution = "inline", overflow = "block", queue_size = None):
+		""" Subscribe to CAN messages with all identifiers matching the cob id in the bits set in the mask. The frame type (base or extended) is encoded into bit 29 of the cob id.
+		The matching callbacks are resolved into the dispatch table, so the dispatching does not depend on the number of mask subscriptions.
+		A ValueError is raised if the callback is already registered for the specified cob id and mask.
+
+		:param cob_id: The CAN object id to match. Bit 29 (frame) indicates the CAN message identifier length.
+
+		:param mask: The mask of the identifier bits to compare.
+
+		:param callback: The callback.
+
+		:param execution: A string. Must be one of "inline", "pool", "queue". See subscribe.
+
+		:param overflow: A string. Must be one of "block", "drop". See subscribe.
+
+		:param queue_size: The size of the queue for the execution "queue" or None to use the default size of the network. Must be None for the execution "pool", as the queues of the pool are shared.
+
+		:raises: ValueError
+		"""
+		cob_id = int(cob_id)
+		mask = int(mask)
+		if cob_id & (1 << 29):
+			mask &= 0x1FFFFFFF
+		else:
+			mask &= 0x7FF
+		pattern = ((cob_id & (1 << 29)) | (cob_id & mask), mask)
+
+		if callback in self._patterns.get(pattern, {}):
+			raise ValueError("The specified callback is already registered for this cob id and mask.")
+
+		self._subscribe_patterns([pattern], callback, execution, overflow, queue_size)
+
+	def subscribe_range(self, first, last, callback, execution = "inline", overflow = "block", queue_size = None):
+		""" Subscribe to CAN messages with all identifiers in the range from first to last (inclusive). The frame type (base or extended) is encoded into bit 29 of the cob ids.
+		The range is split into aligned blocks, which are subscribed as mask subscriptions.
+		A ValueError is raised if the range is empty, the frame types of first and last differ or the callback is already registered for the range.
+
+		:param first: The first CAN object id of the range.
+
+		:param last: The last CAN object id of the range.
+
+		:param callback: The callback.
+
+		:param execution: A string. Must be one of "inline", "pool", "queue". See subscribe.
+
+		:param overflow: A string. Must be one of "block", "drop". See subscribe.
+
+		:param queue_size: The size of the queue for the execution "queue" or None to use the default size of the network. Must be None for the execution "pool", as the queues of the pool are shared.
+
+		:raises: ValueError
+		"""
+		patterns = range_masks(int(first), int(last))
+
+		for pattern in patterns:
+			if callback in self._patterns.get(pattern, {}):
+				raise ValueError("The specified callback is already registered for this range.")
 
-		self._subscribers[cob_id].append(callback)
+		self._subscribe_patterns(patterns, callback, execution, overflow, queue_size)
 
 	def subscribed(self, cob_id, callback):
 		""" Returns True if the callback is registered for the specified message id. The frame type (base or extended) is encoded into bit 29 and forms the cob_id.
@@ -182,6 +631,12 @@ class Network(object):
 		except KeyError:
 			return False
 
+	@property
+	def transmit_queue(self):
+		""" Returns the transmit queue of the network or None if the messages are passed to the bus directly.
+		"""
+		return self._transmit_queue
+
 	def unsubscribe(self, cob_id, callback):
 		""" Unregister the callback for the message id. The frame type (base or extended) is encoded into bit 29 and forms the cob_id.
 		A ValueError is raised if the callback is not in the list of callbacks (was not registered).
@@ -194,11 +649,84 @@ class Network(object):
 		:raises: ValueError
 		"""
 		cob_id = int(cob_id)
+		if cob_id & (1 << 29):
+			cob_id &= 0x3FFFFFFF
+		else:
+			cob_id &= 0x7FF
 
 		try:
-			self._subscribers[cob_id].remove(callback)
+			handler = self._subscribers[cob_id].pop(callback)
 		except KeyError:
-			raise ValueError("There are no callbacks registered for the specified cob id.")
+			raise ValueError("The specified callback is not registered for this cob id.")
+		self._rebuild(cob_id)
+		self._release_handler(handler)
+		if not self._subscribers[cob_id]:
+			self._update_filters()
+
+	def unsubscribe_mask(self, cob_id, mask, callback):
+		""" Unregister the callback for the cob id and mask. The frame type (base or extended) is encoded into bit 29 of the cob id.
+		A ValueError is raised if the callback was not registered for the cob id and mask.
+
+		:param cob_id: The CAN object id of the subscription.
+
+		:param mask: The mask of the subscription.
+
+		:param callback: The callback.
+
+		:raises: ValueError
+		"""
+		cob_id = int(cob_id)
+		mask = int(mask)
+		if cob_id & (1 << 29):
+			mask &= 0x1FFFFFFF
+		else:
+			mask &= 0x7FF
+		pattern = ((cob_id & (1 << 29)) | (cob_id & mask), mask)
+
+		if callback not in self._patterns.get(pattern, {}):
+			raise ValueError("The specified callback is not registered for this cob id and mask.")
+
+		self._unsubscribe_patterns([pattern], callback)
+
+	def unsubscribe_range(self, first, last, callback):
+		""" Unregister the callback for the range from first to last (inclusive). The frame type (base or extended) is encoded into bit 29 of the cob ids.
+		A ValueError is raised if the callback was not registered for the range.
+
+		:param first: The first CAN object id of the range.
+
+		:param last: The last CAN object id of the range.
+
+		:param callback: The callback.
+
+		:raises: ValueError
+		"""
+		patterns = range_masks(int(first), int(last))
+
+		for pattern in patterns:
+			if callback not in self._patterns.get(pattern, {}):
+				raise ValueError("The specified callback is not registered for this range.")
+
+		self._unsubscribe_patterns(patterns, callback)
+
+	def write_many(self, values, nodes = None, block = False):
+		""" Writes the values to several nodes with their SDO clients. Returns a SDOFuture, which is completed with a dict of the node ids to the lists of SDOResult in the order of the values.
+		The transfers of each node are queued in its SDO client and the transfers to different nodes run in parallel. A failed transfer does not stop the others, its error and abort code are kept in its result.
+		The values are encoded for all nodes before any transfer is started, so no node is written if an entry is invalid for one of them.
+		Raises KeyError if a node is not in the network or an entry is not in the object dictionary of a node. Raises ValueError if a node has no SDO client or a value cannot be encoded.
+
+		:param values: A mapping of the tuples (index, subindex) of the entries to the values.
+
+		:param nodes: An iterable of the node ids or names or None for all nodes with a SDO client.
+
+		:param block: If True, the block download is used for data above the protocol switch threshold.
+
+		:raises: KeyError, ValueError
+		"""
+		values = dict(values)
+		nodes = self._sdo_clients(nodes)
+		requests = [node.sdo._requests(values) for node in nodes]
+		futures = [node.sdo._write_many(node_requests, block) for node, node_requests in zip(nodes, requests)]
+		return gather(futures, lambda futures: {node.id: future.result() for node, future in zip(nodes, futures)})
 
 
 class MessageListener(can.Listener):
@@ -0,0 +1,90 @@
+import can
+import os
+import time
+
+
+class Replay(object):
+	""" Replay of recorded CAN messages through a network.
+
+	The messages are read lazily from a log file (all formats supported by python-can, e.g. ASC, BLF, CSV) or from an iterable and dispatched with Network.on_message_received, as if they were received from a bus.
+	The replay runs as fast as possible or paced to the timestamps of the recorded messages.
+	"""
+
+	__slots__ = ["_duration", "_frames", "_network"]
+
+	def __init__(self, network):
+		"""
+		:param network: The network to dispatch the messages to.
+		"""
+		self._network = network
+		self._frames = 0
+		self._duration = 0.0
+
+	def _run(self, messages, realtime, speed):
+		on_message_received = self._network.on_message_received
+		frames = 0
+		start = time.perf_counter()
+		first_timestamp = None
+
+		for message in messages:
+			if message.is_error_frame:
+				continue
+			if realtime:
+				if first_timestamp is None:
+					first_timestamp = message.timestamp
+				delay = (message.timestamp - first_timestamp) / speed - (time.perf_counter() - start)
+				if delay > 0:
+					time.sleep(delay)
+			on_message_received(message)
+			frames += 1
+
+		self._duration = time.perf_counter() - start
+		self._frames = frames
+		return frames
+
+	@property
+	def duration(self):
+		""" Returns the duration of the last replay in seconds.
+		"""
+		return self._duration
+
+	@property
+	def frames(self):
+		""" Returns the number of messages dispatched in the last replay.
+		"""
+		return self._frames
+
+	@property
+	def frames_per_second(self):
+		""" Returns the throughput of the last replay in messages per second.
+		"""
+		if self._duration == 0.0:
+			return 0.0
+		return self._frames / self._duration
+
+	@property
+	def network(self):
+		""" Returns the network the messages are dispatched to.
+		"""
+		return self._network
+
+	def run(self, source, realtime = False, speed = 1.0):
+		""" Replays the messages. Error frames are skipped.
+
+		:param source: The file name of a log file or an iterable of messages.
+
+		:param realtime: If True, the messages are paced to their timestamps. If False, the messages are dispatched as fast as possible.
+
+		:param speed: The factor to scale the pace of a realtime replay, e.g. 2.0 replays twice as fast as recorded. Must be greater than 0.
+
+		:returns: The number of dispatched messages.
+
+		:raises: ValueError
+		"""
+		if speed <= 0:
+			raise ValueError("The speed must be greater than 0.")
+
+		if isinstance(source, (str, os.PathLike)):
+			with can.LogReader(source) as reader:
+				return self._run(reader, realtime, speed)
+		return self._run(source, realtime, speed)
@@ -0,0 +1,179 @@
+import can
+import heapq
+import itertools
+import threading
+import time
+
+
+def priority(message):
+	""" Returns the priority of a message as the CAN arbitration would order it. Lower values win.
+
+	A base frame wins over an extended frame with the same 11 most significant identifier bits, because the IDE bit of the extended frame is recessive.
+	"""
+	if message.is_extended_id:
+		return ((message.arbitration_id >> 18) << 19) | (1 << 18) | (message.arbitration_id & 0x3FFFF)
+	return message.arbitration_id << 19
+
+
+class TransmitQueue(object):
+	""" Transmit pipeline of a network.
+
+	The messages are queued in a priority queue and a single writer thread passes them to the bus. The messages with the highest priority (lowest identifier) are sent first.
+	If the bus reports an error (e.g. the transmit buffer is full), the message is retried after a delay.
+	"""
+
+	__slots__ = ["_bus", "_counters", "_heap", "_lock", "_not_empty", "_not_full", "_queue_size", "_retries", "_retry_delay", "_sequence", "_thread"]
+
+	# Sorts behind all messages, so the queue is drained before the thread stops
+	__stop = 1 << 32
+
+	def __init__(self, bus, queue_size = 1024, retries = 10, retry_delay = 0.001):
+		"""
+		:param bus: The CAN bus to send the messages on.
+
+		:param queue_size: The maximum number of queued messages. Must be at least 1.
+
+		:param retries: The number of retries for a message, if the bus reports an error. Must be at least 0.
+
+		:param retry_delay: The delay in seconds between two retries.
+
+		:raises: ValueError
+		"""
+		if queue_size < 1:
+			raise ValueError("The queue size must be at least 1.")
+		if retries < 0:
+			raise ValueError("The number of retries must be at least 0.")
+
+		self._bus = bus
+		self._retries = int(retries)
+		self._retry_delay = retry_delay
+		self._queue_size = int(queue_size)
+		self._heap = []
+		mutex = threading.Lock()
+		self._not_empty = threading.Condition(mutex)
+		self._not_full = threading.Condition(mutex)
+		self._sequence = itertools.count()
+		self._counters = {}
+		self._lock = threading.Lock()
+		self._thread = threading.Thread(target = self._run, daemon = True)
+		self._thread.start()
+
+	def _count(self, message, counter):
+		self._count_many([message], counter)
+
+	def _count_many(self, messages, counter):
+		with self._lock:
+			for message in messages:
+				if message.is_extended_id:
+					cob_id = (1 << 29) | message.arbitration_id
+				else:
+					cob_id = message.arbitration_id
+				try:
+					counters = self._counters[cob_id]
+				except KeyError:
+					counters = {"queued": 0, "sent": 0, "retries": 0, "errors": 0}
+					self._counters[cob_id] = counters
+				counters[counter] += 1
+
+	def _run(self):
+		while True:
+			with self._not_empty:
+				while not self._heap:
+					self._not_empty.wait()
+				key, _, message = heapq.heappop(self._heap)
+				self._not_full.notify()
+			if key == self.__stop:
+				return
+			for attempt in range(self._retries + 1):
+				try:
+					self._bus.send(message)
+				except can.CanError:
+					if attempt == self._retries:
+						self._count(message, "errors")
+					else:
+						self._count(message, "retries")
+						time.sleep(self._retry_delay)
+				else:
+					self._count(message, "sent")
+					break
+
+	def _wait_for_space(self, timeout):
+		""" Waits until there is space in the queue. The caller must hold the lock of the queue.
+
+		:returns: False if the queue is still full after the timeout, True otherwise.
+		"""
+		if timeout is not None:
+			deadline = time.monotonic() + timeout
+		while len(self._heap) >= self._queue_size:
+			if timeout is None:
+				self._not_full.wait()
+			else:
+				remaining = deadline - time.monotonic()
+				if remaining <= 0.0:
+					return False
+				self._not_full.wait(remaining)
+		return True
+
+	def put(self, message, timeout = None):
+		""" Queues a message for sending.
+		Raises RuntimeError if the queue is still full after the timeout.
+
+		:param message: The message to send.
+
+		:param timeout: The time in seconds to wait for space in the queue. If None, waits until there is space. If 0, does not wait at all.
+
+		:raises: RuntimeError
+		"""
+		with self._not_full:
+			if not self._wait_for_space(timeout):
+				raise RuntimeError("The transmit queue is full.")
+			heapq.heappush(self._heap, (priority(message), next(self._sequence), message))
+			self._not_empty.notify()
+		self._count(message, "queued")
+
+	def put_many(self, messages, timeout = None):
+		""" Queues several messages for sending. The messages are queued under one lock and the writer thread is notified once, not for each message.
+		Stops at the first message, for which the queue is still full after the timeout. The number of queued messages is returned.
+
+		:param messages: An iterable of messages to send.
+
+		:param timeout: The time in seconds to wait for space in the queue for each message. If None, waits until there is space. If 0, does not wait at all.
+
+		:returns: The number of queued messages.
+		"""
+		messages = list(messages)
+		queued = 0
+		notify = False
+		with self._not_full:
+			for message in messages:
+				if len(self._heap) >= self._queue_size:
+					# The writer thread must be woken up to make space
+					if notify:
+						self._not_empty.notify()
+						notify = False
+					if not self._wait_for_space(timeout):
+						break
+				heapq.heappush(self._heap, (priority(message), next(self._sequence), message))
+				queued += 1
+				notify = True
+			if notify:
+				self._not_empty.notify()
+		self._count_many(messages[:queued], "queued")
+		return queued
+
+	def statistics(self):
+		""" Returns a snapshot of the counters for each cob id. The frame type (base or extended) is encoded into bit 29.
+
+		:returns: A dict, which maps the cob id to a dict with the counters "queued", "sent", "retries" and "errors".
+		"""
+		with self._lock:
+			return {cob_id: dict(counters) for cob_id, counters in self._counters.items()}
+
+	def stop(self):
+		""" Stops the writer thread after all queued messages are sent.
+		"""
+		# The stop key is queued even if the queue is full, so stop does not wait for space
+		with self._not_empty:
+			heapq.heappush(self._heap, (self.__stop, next(self._sequence), None))
+			self._not_empty.notify()
+		self._thread.join()
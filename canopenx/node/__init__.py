@@ -1,3 +1,4 @@
 from .localnode import LocalNode
 from .node import Node
 from .remotenode import RemoteNode
+from .valuestore import ValueStore
@@ -2,15 +2,18 @@ from .node import Node
 from .service.nmt import LocalNMTSlave
 from .service.emcy import EMCYProducer
 from .service.sdo import SDOServer
+from .valuestore import ValueStore
 
 
 class LocalNode(Node):
 	""" Representation of a local CANopen node.
 
 	This class represents a local CANopen node and can be accessed by other nodes on the bus.
+	The current values of the entries are kept in the ValueStore values, which is initialised with the default values of the object dictionary.
 	"""
 	def __init__(self, node_id, dictionary):
 		Node.__init__(self, node_id, dictionary)
+		self.values = ValueStore(dictionary, node_id)
 		self.nmt = LocalNMTSlave()
 		self.emcy = EMCYProducer()
 		self.sdo = SDOServer()
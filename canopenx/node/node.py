@@ -1,5 +1,8 @@
+from canopenx.objectdictionary.collectionproxy import CollectionProxy
+
+
 class Node(object):
-	__slots__ = ["_dictionary", "_id", "_name", "_network"]
+	__slots__ = ["_dictionary", "_id", "_name", "_network", "_proxies", "_proxies_items", "_proxies_version"]
 
 	def __eq__(self, other):
 		""" Indicates whether some other object is "equal to" this one.
@@ -9,7 +12,48 @@ class Node(object):
 		return self is other or (self._dictionary == other._dictionary and self._id == other._id and self._name == other._name)
 
 	def __getitem__(self, key):
-		return self._dictionary[key].proxy(self)
+		""" Returns the proxy of the item identified by the index or name, the tuple (index, subindex) or the dotted path "name.subname".
+		The proxies are cached until the object dictionary changes, so repeated lookups return the same proxy.
+
+		:raises: KeyError
+		"""
+		if self._proxies_version != self._dictionary._version:
+			self._proxies = {}
+			self._proxies_items = {}
+			self._proxies_version = self._dictionary._version
+		try:
+			return self._proxies[key]
+		except KeyError:
+			pass
+
+		if type(key) is tuple:
+			if len(key) != 2:
+				raise KeyError("The specified item was not found.")
+			proxy = self[key[0]]
+			if isinstance(proxy, CollectionProxy):
+				proxy = proxy[key[1]]
+			elif key[1] != proxy.subindex:
+				raise KeyError("The specified item was not found.")
+		else:
+			try:
+				item = self._dictionary[key]
+			except KeyError:
+				if not isinstance(key, str) or "." not in key:
+					raise
+				name, subname = key.split(".", 1)
+				proxy = self[name]
+				if not isinstance(proxy, CollectionProxy):
+					raise
+				proxy = proxy[subname]
+			else:
+				# The index and the name of an item share the proxy
+				try:
+					proxy = self._proxies_items[id(item)]
+				except KeyError:
+					proxy = item.proxy(self)
+					self._proxies_items[id(item)] = proxy
+		self._proxies[key] = proxy
+		return proxy
 
 	def __init__(self, node_id, dictionary, name = None):
 		"""
@@ -31,6 +75,9 @@ class Node(object):
 			self._name = str(name)
 		self._dictionary = dictionary
 		self._network = None
+		self._proxies = {}
+		self._proxies_items = {}
+		self._proxies_version = None
 
 	def attach(self, network):
 		""" Attach a Node to a Network. Detaches if the Node is already attached to a Network.
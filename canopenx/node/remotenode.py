@@ -14,6 +14,7 @@ class RemoteNode(Node):
 		self.nmt = RemoteNMTSlave()
 		self.emcy = EMCYConsumer()
 		self.sdo = SDOClient()
+		self.nmt.add_callback("reset", self.sdo.cache.clear)
 
 	def attach(self, network):
 		Node.attach(self, network)
@@ -5,8 +5,16 @@ from canopenx.nmt.states import *
 
 
 class RemoteNMTSlave(NMTService):
+	""" RemoteNMTSlave
+
+	This class is the representation of the NMT slave of a remote node.
+
+	The event "reset" is notified, if a reset command is sent to the node or the boot-up message of the node is received.
+	"""
+
 	def __init__(self):
 		NMTService.__init__(self)
+		self._add_event("reset")
 
 	def attach(self, node):
 		NMTService.attach(self, node)
@@ -27,6 +35,9 @@ class RemoteNMTSlave(NMTService):
 			return
 
 		self._state = message.data[0] & 0x7F
+		if message.data[0] == 0x00:
+			# The boot-up message is sent after a reset of the node
+			self.notify("reset")
 
 	def reset_communication(self):
 		""" Sends a NMT reset communication command to the node.
@@ -48,6 +59,8 @@ class RemoteNMTSlave(NMTService):
 		d = struct.pack("<BB", command, self._node.id)
 		request = can.Message(arbitration_id = 0x000, is_extended_id = False, data = d)
 		self._node.network.send(request)
+		if command in (0x81, 0x82):
+			self.notify("reset")
 
 	@property
 	def state(self):
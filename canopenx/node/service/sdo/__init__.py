@@ -1,2 +1,6 @@
+from .sdoabortederror import SDOAbortedError
+from .sdocache import SDOCache
 from .sdoclient import SDOClient
+from .sdofuture import SDOFuture
+from .sdoresult import SDOResult
 from .sdoserver import SDOServer
@@ -0,0 +1,55 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class Scheduler(object):
+	""" A single thread, which calls the scheduled callbacks at their deadlines.
+
+	The timeouts of all SDO clients share one scheduler, so the number of threads does not grow with the number of outstanding transfers. The thread is started with the first scheduled call.
+	The callbacks are called one after another, so they must not block.
+	"""
+
+	__slots__ = ["_condition", "_heap", "_sequence", "_thread"]
+
+	def __init__(self):
+		self._condition = threading.Condition()
+		self._heap = []
+		self._sequence = itertools.count()
+		self._thread = None
+
+	def _run(self):
+		while True:
+			with self._condition:
+				while True:
+					if not self._heap:
+						self._condition.wait()
+						continue
+					remaining = self._heap[0][0] - time.monotonic()
+					if remaining <= 0.0:
+						break
+					self._condition.wait(remaining)
+				_, _, callback, args = heapq.heappop(self._heap)
+			try:
+				callback(*args)
+			except:
+				pass
+
+	def call_later(self, delay, callback, *args):
+		""" Calls the callback with the arguments from the thread of the scheduler after the delay.
+		A scheduled call cannot be cancelled, the callback has to ignore calls, which are no longer needed.
+
+		:param delay: The delay in seconds.
+
+		:param callback: The callback to call.
+		"""
+		with self._condition:
+			heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), callback, args))
+			if self._thread is None:
+				self._thread = threading.Thread(target = self._run, daemon = True)
+				self._thread.start()
+			self._condition.notify()
+
+
+scheduler = Scheduler()
@@ -0,0 +1,17 @@
+class SDOAbortedError(Exception):
+	""" SDOAbortedError
+
+	Raised if a SDO transfer is aborted by the client or the server. The abort code is one of the codes in canopenx.sdo.abortcodes.
+	"""
+	def __init__(self, code, index, subindex):
+		"""
+		:param code: The abort code.
+
+		:param index: The index of the transferred entry.
+
+		:param subindex: The subindex of the transferred entry.
+		"""
+		Exception.__init__(self, "The SDO transfer of 0x{:04X}sub{:X} was aborted with the code 0x{:08X}.".format(index, subindex, code))
+		self.code = code
+		self.index = index
+		self.subindex = subindex
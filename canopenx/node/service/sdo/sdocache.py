@@ -0,0 +1,141 @@
+import threading
+import time
+
+
+class SDOCache(object):
+	""" SDOCache
+
+	Read-through cache of the uploaded data of the entries of a node, keyed by the tuple of index and subindex.
+	The policy is selected by the access type of the variable: "const" entries are cached until the cache is cleared, "ro" entries are cached for the time to live and "rw" or "wo" entries are never cached.
+	The cache is cleared on a reset of the node. Data of uploads, which were started before the cache was cleared, is not stored.
+	"""
+
+	__slots__ = ["_entries", "_generation", "_hits", "_lock", "_misses", "_ttl"]
+
+	def __contains__(self, key):
+		""" Returns True if the cache contains valid data for the tuple of index and subindex.
+		"""
+		with self._lock:
+			return self._lookup(key) is not None
+
+	def __init__(self, ttl = 0.0):
+		"""
+		:param ttl: The time to live of the data of "ro" entries in seconds. 0 disables the caching of "ro" entries.
+
+		:raises: ValueError
+		"""
+		if ttl < 0:
+			raise ValueError("The time to live must not be negative.")
+
+		self._ttl = float(ttl)
+		self._lock = threading.Lock()
+		self._entries = {}
+		self._generation = 0
+		self._hits = 0
+		self._misses = 0
+
+	def __len__(self):
+		""" Returns the number of cached entries, including expired entries not yet removed.
+		"""
+		return len(self._entries)
+
+	def _lookup(self, key):
+		""" Returns the valid data for the key or None. Expired data is removed. Must be called with the lock held.
+		"""
+		try:
+			data, expiry = self._entries[key]
+		except KeyError:
+			return None
+		if expiry is not None and time.monotonic() >= expiry:
+			del self._entries[key]
+			return None
+		return data
+
+	def cacheable(self, variable):
+		""" Returns True if the data of the variable may be cached.
+		"""
+		return variable.access_type == "const" or (variable.access_type == "ro" and self._ttl > 0)
+
+	def clear(self):
+		""" Removes all entries from the cache. Uploads, which are in progress, do not store their data.
+		"""
+		with self._lock:
+			self._entries.clear()
+			self._generation += 1
+
+	def discard(self, index, subindex):
+		""" Removes an entry from the cache, if it is present.
+		"""
+		with self._lock:
+			self._entries.pop((index, subindex), None)
+
+	@property
+	def generation(self):
+		""" Returns the number of times the cache was cleared. It is passed to put to detect, whether the cache was cleared during an upload.
+		"""
+		return self._generation
+
+	def get(self, variable):
+		""" Returns the cached data of the variable or None. The hits and misses are counted for cacheable variables only.
+		"""
+		if not self.cacheable(variable):
+			return None
+		with self._lock:
+			data = self._lookup((variable.index, variable.subindex))
+			if data is None:
+				self._misses += 1
+			else:
+				self._hits += 1
+			return data
+
+	@property
+	def hits(self):
+		""" Returns the number of reads, which were served from the cache.
+		"""
+		return self._hits
+
+	@property
+	def misses(self):
+		""" Returns the number of reads of cacheable entries, which were not in the cache.
+		"""
+		return self._misses
+
+	def put(self, variable, data, generation):
+		""" Stores the data of the variable, if it is cacheable and the cache was not cleared since the generation.
+
+		:param variable: The variable of the entry.
+
+		:param data: The uploaded data as bytes.
+
+		:param generation: The generation of the cache at the start of the upload.
+		"""
+		if not self.cacheable(variable):
+			return
+		expiry = None if variable.access_type == "const" else time.monotonic() + self._ttl
+		with self._lock:
+			if generation == self._generation:
+				self._entries[(variable.index, variable.subindex)] = (data, expiry)
+
+	def reset_statistics(self):
+		""" Sets the hits and misses to 0.
+		"""
+		with self._lock:
+			self._hits = 0
+			self._misses = 0
+
+	@property
+	def ttl(self):
+		""" Returns the time to live of the data of "ro" entries in seconds.
+		"""
+		return self._ttl
+
+	@ttl.setter
+	def ttl(self, value):
+		"""
+		:param value: The time to live in seconds. Data, which is already cached, keeps its expiry time.
+
+		:raises: ValueError
+		"""
+		if value < 0:
+			raise ValueError("The time to live must not be negative.")
+		self._ttl = float(value)
@@ -1,16 +1,414 @@
+import can
+import collections
+import concurrent.futures
+import struct
+import threading
+import time
+from canopenx.objectdictionary import Variable
+from canopenx.sdo.abortcodes import GENERAL_ERROR, SDO_PROTOCOL_TIMED_OUT
 from ..service import Service
+from .scheduler import scheduler
+from .sdoabortederror import SDOAbortedError
+from .sdocache import SDOCache
+from .sdofuture import SDOFuture, gather
+from .sdoresult import SDOResult
+from .transfers import BlockDownloadTransfer, BlockUploadTransfer, DownloadTransfer, UploadTransfer
 
 
 class SDOClient(Service):
+	""" SDOClient
+
+	This class is an implementation of a SDO client with expedited, segmented and block transfers.
+
+	The methods upload and download return a SDOFuture immediately. The SDOFuture is a concurrent.futures.Future, which can be awaited in a coroutine. The SDO channel of a node allows only one transfer at a time, so the transfers of a client are queued and processed one after another.
+	Each transfer is a state machine, which is advanced by the responses of the server in the receiving thread of the network. No thread waits for a response, so the transfers to different nodes run concurrently.
+	If the server does not respond within the timeout, the transfer is aborted and the future raises an SDOAbortedError.
+	Block transfers move up to 127 segments per confirmation and are used for large entries, e.g. domains. Data up to the protocol switch threshold is transferred expedited or segmented, as the block protocol has more overhead for small data.
+	Uploads of "const" and "ro" entries are served from the cache, if the cached data is valid. See SDOCache for the policy.
+	"""
+
+	__slots__ = ["_block_size", "_cache", "_deadline", "_lock", "_queue", "_scheduled", "_sequence", "_threshold", "_timeout", "_transfer"]
+
+	def __init__(self, timeout = 1.0, block_size = 127, threshold = 32, ttl = 0.0):
+		"""
+		:param timeout: The time in seconds to wait for each response of the server.
+
+		:param block_size: The number of segments per sub-block of block uploads. Must be in range 1 .. 127.
+
+		:param threshold: The protocol switch threshold of block transfers in bytes. Must be in range 0 .. 255.
+			Block downloads of data up to the threshold use the expedited or segmented download. For block uploads, the server may switch to the expedited or segmented upload, if the size of the data is not above the threshold. 0 disables the switch.
+
+		:param ttl: The time in seconds, for which the data of "ro" entries is cached. 0 disables the caching of "ro" entries.
+
+		:raises: ValueError
+		"""
+		if timeout <= 0:
+			raise ValueError("The timeout must be greater than 0.")
+		if block_size < 1 or block_size > 127:
+			raise ValueError("The block size is out of range 1 .. 127.")
+		if threshold < 0 or threshold > 255:
+			raise ValueError("The threshold is out of range 0 .. 255.")
+
+		Service.__init__(self)
+		self._timeout = float(timeout)
+		self._block_size = int(block_size)
+		self._threshold = int(threshold)
+		self._cache = SDOCache(ttl)
+		self._deadline = None
+		self._lock = threading.Lock()
+		self._queue = collections.deque()
+		self._scheduled = False
+		self._sequence = 0
+		self._transfer = None
+
+	def _cancel(self, transfer):
+		""" Aborts the transfer, if it is active. Called by the future of the transfer, when it gets cancelled.
+		"""
+		finished = []
+		with self._lock:
+			if self._transfer is not transfer:
+				# A queued transfer is skipped when it is its turn
+				return
+			self._stop_timer()
+			self._send_abort(transfer, GENERAL_ERROR)
+			self._next(finished)
+		self._finish(finished)
+
+	def _check(self, index, subindex):
+		if index < 0x0000 or index > 0xFFFF:
+			raise ValueError("The specified index is out of range 0x0000 .. 0xFFFF.")
+		if subindex < 0x00 or subindex > 0xFF:
+			raise ValueError("The specified subindex is out of range 0x00 .. 0xFF.")
+
+	def _enqueue(self, transfer):
+		""" Appends the transfer to the queue and returns its future. Starts the transfer, if no other transfer is active.
+
+		:raises: RuntimeError
+		"""
+		if not self.is_attached():
+			raise RuntimeError("The SDO client is not attached to a node.")
+
+		transfer.client = self
+		finished = []
+		with self._lock:
+			self._queue.append(transfer)
+			if self._transfer is None:
+				self._next(finished)
+		self._finish(finished)
+		return transfer.future
+
+	def _finish(self, finished):
+		""" Completes the futures of the finished transfers. Must be called without holding the lock, as the callbacks of the futures may start new transfers.
+		"""
+		for transfer, exception in finished:
+			if transfer.future.done():
+				continue
+			try:
+				if exception is None:
+					transfer.future.set_result(transfer.result)
+				else:
+					transfer.future.set_exception(exception)
+			except Exception:
+				# The future was cancelled meanwhile
+				pass
+
+	def _next(self, finished):
+		""" Starts the next transfer of the queue. Must be called with the lock held.
+		"""
+		self._transfer = None
+		while self._queue:
+			transfer = self._queue.popleft()
+			if transfer.future.cancelled():
+				continue
+			try:
+				self._send(transfer.initiate())
+			except (RuntimeError, can.CanError) as e:
+				finished.append((transfer, e))
+				continue
+			self._transfer = transfer
+			self._start_timer()
+			return
+
+	def _on_timeout(self, sequence):
+		finished = []
+		with self._lock:
+			if self._sequence != sequence:
+				# The timeout was cancelled before it expired
+				return
+			self._scheduled = False
+			if self._transfer is None or self._deadline is None:
+				return
+			remaining = self._deadline - time.monotonic()
+			if remaining > 0:
+				# The deadline was extended by a response
+				self._schedule(remaining)
+				return
+			transfer = self._transfer
+			self._send_abort(transfer, SDO_PROTOCOL_TIMED_OUT)
+			finished.append((transfer, transfer._abort(SDO_PROTOCOL_TIMED_OUT)))
+			self._next(finished)
+		self._finish(finished)
+
+	def _read_many(self, variables, block):
+		""" Starts the uploads of the variables and returns the SDOFuture of the list of SDOResult.
+		"""
+		futures = [self.upload(variable.index, variable.subindex, block) for variable in variables]
+		return gather(futures, lambda futures: [self._result(future, variable) for future, variable in zip(futures, variables)])
+
+	def _requests(self, values):
+		""" Returns a list of the tuples (variable, value, data) of the values to write.
+
+		:raises: KeyError, ValueError
+		"""
+		items = [(self._variable(index, subindex), value) for (index, subindex), value in values.items()]
+		return [(variable, value, variable.encode(value)) for variable, value in items]
+
+	def _result(self, future, variable, value = None):
+		""" Returns the SDOResult of a done transfer. For an upload the value is decoded with the variable. The value of a failed transfer is None.
+		"""
+		try:
+			data = future.result()
+			if value is None:
+				value = variable.decode(data)
+		except (concurrent.futures.CancelledError, RuntimeError, SDOAbortedError, ValueError) as e:
+			return SDOResult(variable.index, variable.subindex, None, e)
+		return SDOResult(variable.index, variable.subindex, value)
+
+	def _schedule(self, interval):
+		self._sequence += 1
+		self._scheduled = True
+		scheduler.call_later(interval, self._on_timeout, self._sequence)
+
+	def _send(self, requests):
+		""" Sends the requests to the server.
+
+		:raises: RuntimeError
+		"""
+		cob_id = 0x600 + self._node.id
+		messages = [can.Message(arbitration_id = cob_id, is_extended_id = False, data = data) for data in requests]
+		if self._node.network.send_many(messages) < len(messages):
+			raise RuntimeError("The requests could not be sent.")
+
+	def _send_abort(self, transfer, code):
+		""" Sends an abort request for the transfer. Errors are ignored, as the transfer is finished anyway.
+		"""
+		try:
+			self._send([struct.pack("<BHBL", 0x80, transfer.index, transfer.subindex, code)])
+		except (RuntimeError, can.CanError):
+			pass
+
+	def _start_timer(self):
+		""" Sets the deadline for the next response. The check of the deadline is only scheduled if none is pending, so the segments of a block transfer do not schedule a check each.
+		"""
+		self._deadline = time.monotonic() + self._timeout
+		if not self._scheduled:
+			self._schedule(self._timeout)
+
+	def _stop_timer(self):
+		""" Clears the deadline. The pending check of the deadline is ignored on expiry.
+		"""
+		self._deadline = None
+
+	def _store(self, future, variable, generation):
+		""" Stores the data of a successful upload in the cache.
+		"""
+		if not future.cancelled() and future.exception() is None:
+			self._cache.put(variable, future.result(), generation)
+
+	def _variable(self, index, subindex):
+		""" Returns the variable of an entry of the object dictionary of the node.
+
+		:raises: KeyError
+		"""
+		item = self._node.dictionary[index]
+		if not isinstance(item, Variable):
+			return item[subindex]
+		if item.subindex != subindex:
+			raise KeyError("The specified entry was not found.")
+		return item
+
+	def _variables(self, entries):
+		""" Returns a list of the variables of the entries.
+
+		:raises: KeyError
+		"""
+		return [self._variable(index, subindex) for index, subindex in entries]
+
+	def _write_many(self, requests, block):
+		""" Starts the downloads of the tuples (variable, value, data) returned by _requests and returns the SDOFuture of the list of SDOResult.
+		"""
+		futures = [self.download(variable.index, variable.subindex, data, block) for variable, value, data in requests]
+		return gather(futures, lambda futures: [self._result(future, variable, value) for future, (variable, value, data) in zip(futures, requests)])
+
 	def attach(self, node):
 		Service.attach(self, node)
 		self._node.network.subscribe(0x580 + self._node.id, self.on_sdo_message)
 
+	@property
+	def block_size(self):
+		""" Returns the number of segments per sub-block of block uploads.
+		"""
+		return self._block_size
+
+	@property
+	def cache(self):
+		""" Returns the SDOCache of the client.
+		"""
+		return self._cache
+
 	def detach(self):
+		""" Detach handler. The active transfer is aborted with a general error, the futures of the active and all queued transfers raise RuntimeError.
+		"""
+		finished = []
+		with self._lock:
+			self._stop_timer()
+			if self._scheduled:
+				self._sequence += 1
+				self._scheduled = False
+			if self._transfer is not None:
+				self._send_abort(self._transfer, GENERAL_ERROR)
+				finished.append((self._transfer, RuntimeError("The SDO client was detached.")))
+				self._transfer = None
+			while self._queue:
+				transfer = self._queue.popleft()
+				if not transfer.future.cancelled():
+					finished.append((transfer, RuntimeError("The SDO client was detached.")))
+		self._finish(finished)
+
 		self._node.network.unsubscribe(0x580 + self._node.id, self.on_sdo_message)
 		Service.detach(self)
 
+	def download(self, index, subindex, data, block = False):
+		""" Starts the download of the data to an entry of the server. Returns a SDOFuture, which is completed with None if the transfer succeeded.
+		The future raises SDOAbortedError if the transfer is aborted by the server or the client (e.g. on timeout).
+		Raises RuntimeError if the client is not attached. Raises ValueError if the index or subindex is out of range.
+
+		:param index: The index of the entry.
+
+		:param subindex: The subindex of the entry.
+
+		:param data: A byte-like object with the CANopen representation of the value.
+
+		:param block: If True, the block download is used for data above the protocol switch threshold.
+
+		:raises: RuntimeError, ValueError
+		"""
+		self._check(index, subindex)
+		self._cache.discard(index, subindex)
+		if block and len(data) > self._threshold:
+			return self._enqueue(BlockDownloadTransfer(index, subindex, data))
+		return self._enqueue(DownloadTransfer(index, subindex, data))
+
 	def on_sdo_message(self, message):
-		""" Handler for the responses from the SDO server.
+		""" Handler for the responses from the SDO server. Advances the state machine of the active transfer.
+		"""
+		if message.is_remote_frame or message.dlc != 8:
+			return
+
+		data = bytes(message.data)
+		finished = []
+		with self._lock:
+			transfer = self._transfer
+			if transfer is None:
+				return
+			self._stop_timer()
+
+			# The first byte of an abort is unique, a segment of a block upload has a sequence number of at least 1
+			if data[0] == 0x80:
+				finished.append((transfer, transfer._abort(struct.unpack_from("<L", data, 4)[0])))
+			else:
+				try:
+					requests = transfer.on_response(data)
+					self._send(requests)
+				except SDOAbortedError as e:
+					self._send_abort(transfer, e.code)
+					finished.append((transfer, e))
+				except (RuntimeError, can.CanError) as e:
+					finished.append((transfer, e))
+				else:
+					if transfer.done:
+						finished.append((transfer, None))
+					else:
+						self._start_timer()
+
+			if finished:
+				self._next(finished)
+		self._finish(finished)
+
+	def read_many(self, entries, block = False):
+		""" Starts the uploads of several entries and returns a SDOFuture, which is completed with a list of SDOResult in the order of the entries.
+		The values are decoded with the variables of the object dictionary of the node. All uploads are queued at once, a failed transfer does not stop the others. Its error and abort code are kept in its result.
+		Raises KeyError if an entry is not in the object dictionary. Raises RuntimeError if the client is not attached.
+
+		:param entries: An iterable of the tuples (index, subindex) of the entries.
+
+		:param block: If True, the block upload is used.
+
+		:raises: KeyError, RuntimeError
+		"""
+		return self._read_many(self._variables(entries), block)
+
+	@property
+	def threshold(self):
+		""" Returns the protocol switch threshold of block transfers in bytes.
+		"""
+		return self._threshold
+
+	@property
+	def timeout(self):
+		""" Returns the time in seconds to wait for each response of the server.
+		"""
+		return self._timeout
+
+	def upload(self, index, subindex, block = False):
+		""" Starts the upload of an entry from the server. Returns a SDOFuture, which is completed with the CANopen representation of the value as bytes.
+		The future raises SDOAbortedError if the transfer is aborted by the server or the client (e.g. on timeout).
+		Raises RuntimeError if the client is not attached. Raises ValueError if the index or subindex is out of range.
+
+		:param index: The index of the entry.
+
+		:param subindex: The subindex of the entry.
+
+		:param block: If True, the block upload is used. The server may switch to the expedited or segmented upload for data up to the protocol switch threshold.
+
+		:raises: RuntimeError, ValueError
+		"""
+		self._check(index, subindex)
+
+		variable = None
+		if self.is_attached():
+			try:
+				variable = self._variable(index, subindex)
+			except KeyError:
+				pass
+		if variable is not None and self._cache.cacheable(variable):
+			data = self._cache.get(variable)
+			if data is not None:
+				future = SDOFuture()
+				future.set_result(data)
+				return future
+		else:
+			# Entries, which are not in the object dictionary of the node, are never cached
+			variable = None
+
+		generation = self._cache.generation
+		if block:
+			future = self._enqueue(BlockUploadTransfer(index, subindex, self._block_size, self._threshold))
+		else:
+			future = self._enqueue(UploadTransfer(index, subindex))
+		if variable is not None:
+			future.add_done_callback(lambda future: self._store(future, variable, generation))
+		return future
+
+	def write_many(self, values, block = False):
+		""" Starts the downloads of several entries and returns a SDOFuture, which is completed with a list of SDOResult in the order of the values.
+		The values are encoded with the variables of the object dictionary of the node. All downloads are queued at once, a failed transfer does not stop the others. Its error and abort code are kept in its result.
+		Raises KeyError if an entry is not in the object dictionary. Raises ValueError if a value cannot be encoded. Raises RuntimeError if the client is not attached.
+
+		:param values: A mapping of the tuples (index, subindex) of the entries to the values.
+
+		:param block: If True, the block download is used for data above the protocol switch threshold.
+
+		:raises: KeyError, RuntimeError, ValueError
 		"""
-		pass
+		return self._write_many(self._requests(values), block)
@@ -0,0 +1,65 @@
+import asyncio
+import concurrent.futures
+import threading
+
+
+class SDOFuture(concurrent.futures.Future):
+	""" SDOFuture
+
+	The future of a SDO transfer. It is a concurrent.futures.Future, which can be awaited in a coroutine, e.g. "data = await node.sdo.upload(0x1000, 0x00)".
+	The future stays pending until the transfer is finished, so it can be cancelled at any time. Cancelling an active transfer sends an abort request to the server. Cancelling the awaiting task (e.g. by asyncio.wait_for) cancels the transfer too.
+	"""
+	def __await__(self):
+		return asyncio.wrap_future(self).__await__()
+
+	def __init__(self, on_cancel = None):
+		"""
+		:param on_cancel: A callable, which is called when the future gets cancelled, e.g. to abort the transfer.
+		"""
+		concurrent.futures.Future.__init__(self)
+		self._on_cancel = on_cancel
+
+	def cancel(self):
+		""" Cancels the transfer. If the transfer is active, an abort request is sent to the server. Returns False if the transfer is already finished.
+		"""
+		if not concurrent.futures.Future.cancel(self):
+			return False
+		if self._on_cancel is not None:
+			self._on_cancel()
+		return True
+
+
+def gather(futures, function):
+	""" Returns a SDOFuture, which is completed with the result of the function, when all futures are done. Cancelling the returned future cancels all futures.
+
+	:param futures: An iterable of futures.
+
+	:param function: A callable, which gets the list of the done futures and returns the result.
+	"""
+	futures = list(futures)
+	result = SDOFuture(lambda: [future.cancel() for future in futures])
+	lock = threading.Lock()
+	remaining = [len(futures)]
+
+	def on_done(future):
+		with lock:
+			remaining[0] -= 1
+			if remaining[0] > 0:
+				return
+		if result.done():
+			return
+		try:
+			result.set_result(function(futures))
+		except Exception as e:
+			try:
+				result.set_exception(e)
+			except Exception:
+				# The future was cancelled meanwhile
+				pass
+
+	if len(futures) == 0:
+		remaining[0] = 1
+		on_done(None)
+	for future in futures:
+		future.add_done_callback(on_done)
+	return result
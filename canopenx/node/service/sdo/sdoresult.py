@@ -0,0 +1,64 @@
+from .sdoabortederror import SDOAbortedError
+
+
+class SDOResult(object):
+	""" SDOResult
+
+	The result of the transfer of one entry by read_many or write_many. A failed transfer does not stop the other transfers, its error is kept in the result.
+	"""
+
+	__slots__ = ["_error", "_index", "_subindex", "_value"]
+
+	def __init__(self, index, subindex, value = None, error = None):
+		"""
+		:param index: The index of the entry.
+
+		:param subindex: The subindex of the entry.
+
+		:param value: The read or written value.
+
+		:param error: The exception, if the transfer failed, or None.
+		"""
+		self._index = index
+		self._subindex = subindex
+		self._value = value
+		self._error = error
+
+	def __repr__(self):
+		if self._error is None:
+			return "SDOResult(0x{:04X}, 0x{:02X}, value = {!r})".format(self._index, self._subindex, self._value)
+		return "SDOResult(0x{:04X}, 0x{:02X}, error = {!r})".format(self._index, self._subindex, self._error)
+
+	@property
+	def code(self):
+		""" Returns the abort code, if the transfer was aborted, or None.
+		"""
+		if isinstance(self._error, SDOAbortedError):
+			return self._error.code
+		return None
+
+	@property
+	def error(self):
+		""" Returns the exception, if the transfer failed, or None.
+		"""
+		return self._error
+
+	@property
+	def index(self):
+		return self._index
+
+	@property
+	def ok(self):
+		""" Returns True if the transfer succeeded.
+		"""
+		return self._error is None
+
+	@property
+	def subindex(self):
+		return self._subindex
+
+	@property
+	def value(self):
+		""" Returns the read or written value. For a failed transfer it is None.
+		"""
+		return self._value
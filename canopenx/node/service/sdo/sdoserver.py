@@ -1,11 +1,276 @@
+import binascii
+import can
+import struct
+from canopenx.sdo.abortcodes import *
 from ..service import Service
+from .sdoabortederror import SDOAbortedError
 
 
 class SDOServer(Service):
+	""" SDOServer
+
+	This class is an implementation of a SDO server with expedited, segmented and block transfers.
+
+	The values of the entries are read from and written to the ValueStore values of the node. The requests are handled in the receiving thread of the network, one transfer at a time.
+	"""
+
+	__slots__ = ["_block_size", "_buffer", "_crc", "_index", "_position", "_sequence", "_size", "_state", "_subindex", "_toggle", "_transfer_block_size"]
+
+	def __init__(self, block_size = 127):
+		"""
+		:param block_size: The number of segments per sub-block of block downloads. Must be in range 1 .. 127.
+
+		:raises: ValueError
+		"""
+		if block_size < 1 or block_size > 127:
+			raise ValueError("The block size is out of range 1 .. 127.")
+
+		Service.__init__(self)
+		self._block_size = int(block_size)
+		self._reset()
+
+	def _abort(self, code):
+		""" Returns the SDOAbortedError for the current transfer with the specified abort code.
+		"""
+		return SDOAbortedError(code, self._index, self._subindex)
+
+	def _block(self):
+		""" Sends the segments of the next sub-block of a block upload.
+		"""
+		segments = max(1, (len(self._buffer) + 6) // 7)
+		count = min(self._transfer_block_size, segments - self._position)
+		responses = []
+		for sequence in range(1, count + 1):
+			position = self._position + sequence - 1
+			segment = self._buffer[position * 7:position * 7 + 7]
+			c = 0x80 if position == segments - 1 else 0x00
+			responses.append(bytes([c | sequence]) + segment + bytes(7 - len(segment)))
+		self._sequence = count
+		self._respond(*responses)
+
+	def _initiate(self, data):
+		""" Resets the state for a new transfer of the entry in the request.
+		"""
+		self._reset()
+		self._index, self._subindex = struct.unpack_from("<HB", data, 1)
+
+	def _on_block_download(self, data):
+		if data[0] & 0x01 == 0x00:
+			self._initiate(data)
+			self._variable(("ro", "const"), WRITE_OF_READ_ONLY_OBJECT)
+			if data[0] & 0x02:
+				self._size = struct.unpack_from("<L", data, 4)[0]
+			self._crc = bool(data[0] & 0x04)
+			self._buffer = bytearray()
+			self._sequence = 0
+			self._state = "block download"
+			self._respond(struct.pack("<BHBB3x", 0xA4, self._index, self._subindex, self._block_size))
+			return
+
+		if self._state != "block download end":
+			raise self._abort(COMMAND_SPECIFIER_NOT_VALID)
+		n = (data[0] >> 2) & 0x07
+		if n > 0:
+			del self._buffer[-n:]
+		if self._crc and binascii.crc_hqx(self._buffer, 0) != struct.unpack_from("<H", data, 1)[0]:
+			raise self._abort(CRC_ERROR)
+		self._write()
+		self._reset()
+		self._respond(b"\xA1" + bytes(7))
+
+	def _on_block_download_segment(self, data):
+		sequence = data[0] & 0x7F
+		if sequence == self._sequence + 1:
+			self._buffer += data[1:8]
+			self._sequence = sequence
+			if data[0] & 0x80:
+				self._state = "block download end"
+		if not data[0] & 0x80 and sequence < self._block_size:
+			return
+		# The sub-block is complete, if a segment was lost the client repeats the segments after the acknowledged sequence number
+		acknowledged = self._sequence
+		self._sequence = 0
+		self._respond(struct.pack("<BBB5x", 0xA2, acknowledged, self._block_size))
+
+	def _on_block_upload(self, data):
+		command = data[0] & 0x03
+		if command == 0x00:
+			self._initiate(data)
+			self._read()
+			block_size = data[4]
+			threshold = data[5]
+			if block_size < 1 or block_size > 127:
+				raise self._abort(INVALID_BLOCK_SIZE)
+			if threshold > 0 and len(self._buffer) <= threshold:
+				# Protocol switch, the data is small enough for an expedited or segmented upload
+				self._upload()
+				return
+			self._crc = bool(data[0] & 0x04)
+			self._transfer_block_size = block_size
+			self._position = 0
+			self._state = "block upload"
+			self._respond(struct.pack("<BHBL", 0xC6, self._index, self._subindex, len(self._buffer)))
+		elif command == 0x03:
+			if self._state != "block upload":
+				raise self._abort(COMMAND_SPECIFIER_NOT_VALID)
+			self._block()
+		elif command == 0x02:
+			if self._state != "block upload":
+				raise self._abort(COMMAND_SPECIFIER_NOT_VALID)
+			if data[1] > self._sequence:
+				raise self._abort(INVALID_SEQUENCE_NUMBER)
+			if data[2] < 1 or data[2] > 127:
+				raise self._abort(INVALID_BLOCK_SIZE)
+			self._position += data[1]
+			self._transfer_block_size = data[2]
+			segments = max(1, (len(self._buffer) + 6) // 7)
+			if self._position < segments:
+				self._block()
+				return
+			self._state = "block upload end"
+			n = segments * 7 - len(self._buffer)
+			crc = binascii.crc_hqx(self._buffer, 0) if self._crc else 0
+			self._respond(struct.pack("<BH5x", 0xC1 | (n << 2), crc))
+		else:
+			if self._state != "block upload end":
+				raise self._abort(COMMAND_SPECIFIER_NOT_VALID)
+			self._reset()
+
+	def _on_download_initiate(self, data):
+		self._initiate(data)
+		variable = self._variable(("ro", "const"), WRITE_OF_READ_ONLY_OBJECT)
+		if data[0] & 0x02:
+			# Expedited transfer, without the size indicated the length of the data type is used, data types below 8 bits (e.g. BOOLEAN) take one byte
+			if data[0] & 0x01:
+				size = 4 - ((data[0] >> 2) & 0x03)
+			else:
+				size = (variable.size + 7) // 8 if 0 < variable.size <= 32 else 4
+			self._buffer = data[4:4 + size]
+			self._write()
+			self._respond(struct.pack("<BHB4x", 0x60, self._index, self._subindex))
+			self._reset()
+		else:
+			if data[0] & 0x01:
+				self._size = struct.unpack_from("<L", data, 4)[0]
+			self._buffer = bytearray()
+			self._state = "download"
+			self._respond(struct.pack("<BHB4x", 0x60, self._index, self._subindex))
+
+	def _on_download_segment(self, data):
+		if self._state != "download":
+			raise self._abort(COMMAND_SPECIFIER_NOT_VALID)
+		if data[0] & 0x10 != self._toggle:
+			raise self._abort(TOGGLE_BIT_NOT_ALTERNATED)
+		n = (data[0] >> 1) & 0x07
+		self._buffer += data[1:8 - n]
+		toggle = self._toggle
+		if data[0] & 0x01:
+			self._write()
+			self._reset()
+		else:
+			self._toggle ^= 0x10
+		self._respond(bytes([0x20 | toggle]) + bytes(7))
+
+	def _on_upload_initiate(self, data):
+		self._initiate(data)
+		self._read()
+		self._upload()
+
+	def _on_upload_segment(self, data):
+		if self._state != "upload":
+			raise self._abort(COMMAND_SPECIFIER_NOT_VALID)
+		if data[0] & 0x10 != self._toggle:
+			raise self._abort(TOGGLE_BIT_NOT_ALTERNATED)
+		segment = self._buffer[self._position:self._position + 7]
+		self._position += len(segment)
+		n = 7 - len(segment)
+		toggle = self._toggle
+		if self._position >= len(self._buffer):
+			c = 0x01
+			self._reset()
+		else:
+			c = 0x00
+			self._toggle ^= 0x10
+		self._respond(bytes([toggle | (n << 1) | c]) + segment + bytes(n))
+
+	def _read(self):
+		""" Reads the data of the entry of the transfer into the buffer.
+
+		:raises: SDOAbortedError
+		"""
+		self._variable(("wo",), READ_OF_WRITE_ONLY_OBJECT)
+		self._buffer = bytes(self._node.values.read(self._index, self._subindex))
+
+	def _reset(self):
+		self._state = None
+		self._index = 0x0000
+		self._subindex = 0x00
+		self._buffer = None
+		self._crc = False
+		self._position = 0
+		self._sequence = 0
+		self._size = None
+		self._toggle = 0x00
+		self._transfer_block_size = 0
+
+	def _respond(self, *responses):
+		cob_id = 0x580 + self._node.id
+		self._node.network.send_many([can.Message(arbitration_id = cob_id, is_extended_id = False, data = data) for data in responses])
+
+	def _upload(self):
+		""" Starts the expedited or segmented upload of the data in the buffer.
+		"""
+		size = len(self._buffer)
+		if 1 <= size <= 4:
+			self._respond(struct.pack("<BHB", 0x43 | ((4 - size) << 2), self._index, self._subindex) + self._buffer + bytes(4 - size))
+			self._reset()
+		else:
+			self._position = 0
+			self._state = "upload"
+			self._respond(struct.pack("<BHBL", 0x41, self._index, self._subindex, size))
+
+	def _variable(self, access_types, code):
+		""" Returns the variable of the entry of the transfer.
+
+		:param access_types: The access types, which are not allowed for the transfer.
+
+		:param code: The abort code, if the access type of the entry is not allowed.
+
+		:raises: SDOAbortedError
+		"""
+		try:
+			variable = self._node.values.variable(self._index, self._subindex)
+		except KeyError:
+			if self._index in self._node.dictionary:
+				raise self._abort(SUBINDEX_DOES_NOT_EXIST)
+			raise self._abort(OBJECT_DOES_NOT_EXIST)
+		if variable.access_type in access_types:
+			raise self._abort(code)
+		return variable
+
+	def _write(self):
+		""" Writes the data in the buffer to the entry of the transfer.
+
+		:raises: SDOAbortedError
+		"""
+		if self._size is not None and len(self._buffer) != self._size:
+			raise self._abort(DATA_TYPE_LENGTH_MISMATCH)
+		try:
+			self._node.values.write(self._index, self._subindex, self._buffer)
+		except ValueError:
+			raise self._abort(DATA_TYPE_LENGTH_MISMATCH)
+
 	def attach(self, node):
 		Service.attach(self, node)
+		self._reset()
 		self._node.network.subscribe(0x600 + self._node.id, self.on_sdo_message)
 
+	@property
+	def block_size(self):
+		""" Returns the number of segments per sub-block of block downloads.
+		"""
+		return self._block_size
+
 	def detach(self):
 		self._node.network.unsubscribe(0x600 + self._node.id, self.on_sdo_message)
 		Service.detach(self)
@@ -13,4 +278,34 @@ class SDOServer(Service):
 	def on_sdo_message(self, message):
 		""" Handler for the request by the SDO client.
 		"""
-		pass
+		if message.is_remote_frame or message.dlc != 8:
+			return
+
+		data = bytes(message.data)
+		if data[0] == 0x80:
+			self._reset()
+			return
+
+		try:
+			if self._state == "block download":
+				# All messages of a sub-block are segments
+				self._on_block_download_segment(data)
+				return
+			command = data[0] & 0xE0
+			if command == 0x20:
+				self._on_download_initiate(data)
+			elif command == 0x00:
+				self._on_download_segment(data)
+			elif command == 0x40:
+				self._on_upload_initiate(data)
+			elif command == 0x60:
+				self._on_upload_segment(data)
+			elif command == 0xC0:
+				self._on_block_download(data)
+			elif command == 0xA0:
+				self._on_block_upload(data)
+			else:
+				raise self._abort(COMMAND_SPECIFIER_NOT_VALID)
+		except SDOAbortedError as e:
+			self._reset()
+			self._respond(struct.pack("<BHBL", 0x80, e.index, e.subindex, e.code))
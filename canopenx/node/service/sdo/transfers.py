@@ -0,0 +1,345 @@
+import binascii
+import struct
+from canopenx.sdo.abortcodes import COMMAND_SPECIFIER_NOT_VALID, CRC_ERROR, DATA_TYPE_LENGTH_MISMATCH, GENERAL_ERROR, INVALID_BLOCK_SIZE, INVALID_SEQUENCE_NUMBER, TOGGLE_BIT_NOT_ALTERNATED
+from .sdoabortederror import SDOAbortedError
+from .sdofuture import SDOFuture
+
+
+class Transfer(object):
+	""" Base class of the state machines of the SDO transfers of the client.
+
+	The method initiate returns the first requests, the method on_response consumes a response of the server and returns the next requests. A transfer is finished, if the property done is True.
+	A violation of the protocol by the server is raised as SDOAbortedError, the client sends the abort code to the server.
+	"""
+
+	__slots__ = ["_client", "_done", "_future", "_index", "_result", "_subindex", "_toggle"]
+
+	def __init__(self, index, subindex):
+		"""
+		:param index: The index of the entry.
+
+		:param subindex: The subindex of the entry.
+		"""
+		self._index = index
+		self._subindex = subindex
+		self._client = None
+		self._future = SDOFuture(self._cancel)
+		self._done = False
+		self._result = None
+		self._toggle = 0x00
+
+	def _abort(self, code):
+		""" Returns the SDOAbortedError for this transfer with the specified abort code.
+		"""
+		return SDOAbortedError(code, self._index, self._subindex)
+
+	def _cancel(self):
+		""" Aborts the transfer, when the future gets cancelled.
+		"""
+		if self._client is not None:
+			self._client._cancel(self)
+
+	def _check_block_size(self, block_size):
+		""" Raises SDOAbortedError if the block size requested by the server is out of range 1 .. 127.
+
+		:raises: SDOAbortedError
+		"""
+		if block_size < 1 or block_size > 127:
+			raise self._abort(INVALID_BLOCK_SIZE)
+
+	def _check_command(self, data, command, mask = 0xE0):
+		""" Raises SDOAbortedError if the response has not the expected server command specifier (and subcommand for block transfers).
+
+		:raises: SDOAbortedError
+		"""
+		if data[0] & mask != command:
+			raise self._abort(COMMAND_SPECIFIER_NOT_VALID)
+
+	def _check_multiplexer(self, data):
+		""" Raises SDOAbortedError if the index and subindex of the response do not match the transfer.
+
+		:raises: SDOAbortedError
+		"""
+		if struct.unpack_from("<HB", data, 1) != (self._index, self._subindex):
+			raise self._abort(GENERAL_ERROR)
+
+	def _check_toggle(self, data):
+		""" Raises SDOAbortedError if the toggle bit of the response does not match the request.
+
+		:raises: SDOAbortedError
+		"""
+		if data[0] & 0x10 != self._toggle:
+			raise self._abort(TOGGLE_BIT_NOT_ALTERNATED)
+
+	@property
+	def client(self):
+		""" Returns the client, which processes the transfer, or None if the transfer is not queued.
+		"""
+		return self._client
+
+	@client.setter
+	def client(self, value):
+		self._client = value
+
+	@property
+	def done(self):
+		""" Returns True if the transfer is finished.
+		"""
+		return self._done
+
+	@property
+	def future(self):
+		""" Returns the future of the transfer.
+		"""
+		return self._future
+
+	@property
+	def index(self):
+		return self._index
+
+	def initiate(self):
+		""" Returns a list of the requests to start the transfer.
+		"""
+		raise NotImplementedError()
+
+	def on_response(self, data):
+		""" Consumes a response of the server and returns a list of the next requests.
+		Raises SDOAbortedError if the response violates the protocol.
+
+		:param data: The 8 data bytes of the response.
+
+		:raises: SDOAbortedError
+		"""
+		raise NotImplementedError()
+
+	@property
+	def result(self):
+		""" Returns the result of the finished transfer.
+		"""
+		return self._result
+
+	@property
+	def subindex(self):
+		return self._subindex
+
+
+class BlockDownloadTransfer(Transfer):
+	""" Block download of data from the client to the server. The server selects the block size, the data is verified with a CRC, if the server supports it.
+	"""
+
+	__slots__ = ["_block_size", "_crc", "_data", "_position", "_segments", "_sent", "_state"]
+
+	def __init__(self, index, subindex, data):
+		"""
+		:param data: A byte-like object.
+		"""
+		Transfer.__init__(self, index, subindex)
+		self._data = bytes(data)
+		self._segments = max(1, (len(self._data) + 6) // 7)
+		self._block_size = 0
+		self._crc = False
+		self._position = 0
+		self._sent = 0
+		self._state = "initiate"
+
+	def _block(self):
+		""" Returns the segments of the next sub-block. The sequence numbers start at 1 in each sub-block.
+		"""
+		count = min(self._block_size, self._segments - self._position)
+		requests = []
+		for sequence in range(1, count + 1):
+			position = self._position + sequence - 1
+			segment = self._data[position * 7:position * 7 + 7]
+			c = 0x80 if position == self._segments - 1 else 0x00
+			requests.append(bytes([c | sequence]) + segment + bytes(7 - len(segment)))
+		self._sent = count
+		return requests
+
+	def initiate(self):
+		return [struct.pack("<BHBL", 0xC6, self._index, self._subindex, len(self._data))]
+
+	def on_response(self, data):
+		if self._state == "initiate":
+			self._check_command(data, 0xA0, 0xE3)
+			self._check_multiplexer(data)
+			self._check_block_size(data[4])
+			self._crc = bool(data[0] & 0x04)
+			self._block_size = data[4]
+			self._state = "download"
+			return self._block()
+
+		if self._state == "download":
+			self._check_command(data, 0xA2, 0xE3)
+			if data[1] > self._sent:
+				raise self._abort(INVALID_SEQUENCE_NUMBER)
+			self._check_block_size(data[2])
+			# The segments after the acknowledged sequence number are repeated in the next sub-block
+			self._position += data[1]
+			self._block_size = data[2]
+			if self._position < self._segments:
+				return self._block()
+			self._state = "end"
+			n = self._segments * 7 - len(self._data)
+			crc = binascii.crc_hqx(self._data, 0) if self._crc else 0
+			return [struct.pack("<BH5x", 0xC1 | (n << 2), crc)]
+
+		self._check_command(data, 0xA1, 0xE3)
+		self._done = True
+		return []
+
+
+class DownloadTransfer(Transfer):
+	""" Expedited or segmented download of data from the client to the server. Data up to 4 bytes is transferred expedited.
+	"""
+
+	__slots__ = ["_data", "_offset"]
+
+	def __init__(self, index, subindex, data):
+		"""
+		:param data: A byte-like object.
+		"""
+		Transfer.__init__(self, index, subindex)
+		self._data = bytes(data)
+		self._offset = None
+
+	def _segment(self):
+		segment = self._data[self._offset:self._offset + 7]
+		self._offset += len(segment)
+		n = 7 - len(segment)
+		c = 0x01 if self._offset >= len(self._data) else 0x00
+		return bytes([self._toggle | (n << 1) | c]) + segment + bytes(n)
+
+	def initiate(self):
+		size = len(self._data)
+		if 1 <= size <= 4:
+			return [struct.pack("<BHB", 0x23 | ((4 - size) << 2), self._index, self._subindex) + self._data + bytes(4 - size)]
+		return [struct.pack("<BHBL", 0x21, self._index, self._subindex, size)]
+
+	def on_response(self, data):
+		if self._offset is None:
+			self._check_command(data, 0x60)
+			self._check_multiplexer(data)
+			if 1 <= len(self._data) <= 4:
+				self._done = True
+				return []
+			self._offset = 0
+			return [self._segment()]
+
+		self._check_command(data, 0x20)
+		self._check_toggle(data)
+		if self._offset >= len(self._data):
+			self._done = True
+			return []
+		self._toggle ^= 0x10
+		return [self._segment()]
+
+
+class UploadTransfer(Transfer):
+	""" Expedited or segmented upload of data from the server to the client. The server selects the type of the transfer. The result is the data as bytes.
+	"""
+
+	__slots__ = ["_buffer", "_size"]
+
+	def __init__(self, index, subindex):
+		Transfer.__init__(self, index, subindex)
+		self._buffer = None
+		self._size = None
+
+	def _request(self):
+		return bytes([0x60 | self._toggle]) + bytes(7)
+
+	def initiate(self):
+		return [struct.pack("<BHB4x", 0x40, self._index, self._subindex)]
+
+	def on_response(self, data):
+		if self._buffer is None:
+			self._check_command(data, 0x40)
+			self._check_multiplexer(data)
+			if data[0] & 0x02:
+				# Expedited transfer, the size is optional
+				size = 4 - ((data[0] >> 2) & 0x03) if data[0] & 0x01 else 4
+				self._result = bytes(data[4:4 + size])
+				self._done = True
+				return []
+			if data[0] & 0x01:
+				self._size = struct.unpack_from("<L", data, 4)[0]
+			self._buffer = bytearray()
+			return [self._request()]
+
+		self._check_command(data, 0x00)
+		self._check_toggle(data)
+		n = (data[0] >> 1) & 0x07
+		self._buffer += data[1:8 - n]
+		if data[0] & 0x01:
+			if self._size is not None and len(self._buffer) != self._size:
+				raise self._abort(DATA_TYPE_LENGTH_MISMATCH)
+			self._result = bytes(self._buffer)
+			self._done = True
+			return []
+		self._toggle ^= 0x10
+		return [self._request()]
+
+
+class BlockUploadTransfer(UploadTransfer):
+	""" Block upload of data from the server to the client. If the size of the data is not above the protocol switch threshold, the server may switch to the expedited or segmented upload.
+	"""
+
+	__slots__ = ["_block_size", "_crc", "_sequence", "_state", "_threshold"]
+
+	def __init__(self, index, subindex, block_size, threshold):
+		"""
+		:param block_size: The number of segments per sub-block. Must be in range 1 .. 127.
+
+		:param threshold: The protocol switch threshold in bytes. Must be in range 0 .. 255, 0 disables the switch.
+		"""
+		UploadTransfer.__init__(self, index, subindex)
+		self._block_size = block_size
+		self._threshold = threshold
+		self._crc = False
+		self._sequence = 0
+		self._state = "initiate"
+
+	def initiate(self):
+		return [struct.pack("<BHBBB2x", 0xA4, self._index, self._subindex, self._block_size, self._threshold)]
+
+	def on_response(self, data):
+		if self._state == "initiate" and data[0] & 0xE0 == 0x40:
+			self._state = "switched"
+		if self._state == "switched":
+			return UploadTransfer.on_response(self, data)
+
+		if self._state == "initiate":
+			self._check_command(data, 0xC0, 0xE1)
+			self._check_multiplexer(data)
+			self._crc = bool(data[0] & 0x04)
+			if data[0] & 0x02:
+				self._size = struct.unpack_from("<L", data, 4)[0]
+			self._buffer = bytearray()
+			self._state = "upload"
+			return [b"\xA3" + bytes(7)]
+
+		if self._state == "upload":
+			sequence = data[0] & 0x7F
+			if sequence == self._sequence + 1:
+				self._buffer += data[1:8]
+				self._sequence = sequence
+				if data[0] & 0x80:
+					self._state = "end"
+			if not data[0] & 0x80 and sequence < self._block_size:
+				return []
+			# The sub-block is complete, if a segment was lost the server repeats the segments after the acknowledged sequence number
+			acknowledged = self._sequence
+			self._sequence = 0
+			return [struct.pack("<BBB5x", 0xA2, acknowledged, self._block_size)]
+
+		self._check_command(data, 0xC1, 0xE3)
+		n = (data[0] >> 2) & 0x07
+		if n > 0:
+			del self._buffer[-n:]
+		if self._crc and binascii.crc_hqx(self._buffer, 0) != struct.unpack_from("<H", data, 1)[0]:
+			raise self._abort(CRC_ERROR)
+		if self._size is not None and len(self._buffer) != self._size:
+			raise self._abort(DATA_TYPE_LENGTH_MISMATCH)
+		self._result = bytes(self._buffer)
+		self._done = True
+		return [b"\xA1" + bytes(7)]
@@ -0,0 +1,155 @@
+from canopenx.objectdictionary import Array, NodeIdValue, Record, Variable
+
+
+class ValueStore(object):
+	""" Storage of the current values of the entries of an object dictionary in CANopen representation.
+
+	All entries with fixed size are placed in one contiguous bytearray at precomputed offsets, ordered by index and subindex. The entries with variable length (strings and domains) are kept separately as bytes.
+	The raw accessors return zero-copy memoryviews of the representation, e.g. to serve an SDO upload or fill a PDO. The typed accessors encode and decode the values with the data type of the entry.
+	The entries are determined on construction, entries added to the object dictionary later are not part of the store.
+	"""
+
+	__slots__ = ["_buffer", "_entries", "_node_id", "_variables", "_view"]
+
+	def __contains__(self, key):
+		""" Returns True if the store contains the entry with the specified tuple of index and subindex.
+		"""
+		return key in self._entries
+
+	def __init__(self, dictionary, node_id = None):
+		"""
+		:param dictionary: The object dictionary.
+
+		:param node_id: The node id to resolve default values of the type NodeIdValue.
+
+		:raises: ValueError
+		"""
+		self._node_id = node_id
+		self._entries = {}
+		self._variables = {}
+
+		items = []
+		for item in dictionary:
+			if isinstance(item, (Array, Record)):
+				items.extend(item)
+			elif isinstance(item, Variable):
+				items.append(item)
+		items.sort(key = lambda item: (item.index, item.subindex))
+
+		offset = 0
+		for item in items:
+			length = item._codec.length
+			if length > 0:
+				self._entries[(item.index, item.subindex)] = (offset, length, item)
+				offset += length
+			else:
+				self._entries[(item.index, item.subindex)] = (None, 0, item)
+
+		self._buffer = bytearray(offset)
+		self._view = memoryview(self._buffer)
+		self.reset()
+
+	def __iter__(self):
+		""" Returns an iterator over the tuples of index and subindex of all entries.
+		"""
+		return iter(self._entries)
+
+	def __len__(self):
+		""" Returns the number of entries.
+		"""
+		return len(self._entries)
+
+	def _entry(self, index, subindex):
+		try:
+			return self._entries[(index, subindex)]
+		except KeyError:
+			raise KeyError("The specified entry was not found.")
+
+	@property
+	def buffer(self):
+		""" Returns the bytearray with the representations of all entries with fixed size.
+		"""
+		return self._buffer
+
+	def get(self, index, subindex):
+		""" Returns the decoded value of an entry.
+		Raises KeyError if the entry is not in the store.
+
+		:raises: KeyError
+		"""
+		offset, length, variable = self._entry(index, subindex)
+		if offset is None:
+			return variable.decode(self._variables[(index, subindex)])
+		return variable.decode(self._view[offset:offset + length])
+
+	def location(self, index, subindex):
+		""" Returns the tuple of offset and length of an entry in the buffer, e.g. to precompute the mapping of a PDO.
+		Raises KeyError if the entry is not in the store. Raises ValueError if the entry has variable length.
+
+		:raises: KeyError, ValueError
+		"""
+		offset, length, variable = self._entry(index, subindex)
+		if offset is None:
+			raise ValueError("The specified entry has variable length.")
+		return (offset, length)
+
+	def read(self, index, subindex):
+		""" Returns the representation of an entry as memoryview without copying. The memoryview of an entry with fixed size reflects later writes.
+		Raises KeyError if the entry is not in the store.
+
+		:raises: KeyError
+		"""
+		offset, length, variable = self._entry(index, subindex)
+		if offset is None:
+			return memoryview(self._variables[(index, subindex)])
+		return self._view[offset:offset + length]
+
+	def reset(self):
+		""" Sets all entries to the default values of the object dictionary.
+		Raises ValueError if a default value depends on the node id and the store has no node id.
+
+		:raises: ValueError
+		"""
+		for key, (offset, length, variable) in self._entries.items():
+			value = variable.default_value
+			if isinstance(value, NodeIdValue):
+				if self._node_id is None:
+					raise ValueError("The default value of the entry 0x{:04X}sub{:X} depends on the node id.".format(*key))
+				value = value.resolve(self._node_id)
+			data = variable.encode(value)
+			if offset is None:
+				self._variables[key] = data
+			else:
+				self._view[offset:offset + length] = data
+
+	def set(self, index, subindex, value):
+		""" Encodes the value with the data type of the entry and stores it.
+		Raises KeyError if the entry is not in the store. Raises ValueError if the value cannot be encoded.
+
+		:raises: KeyError, ValueError
+		"""
+		self.write(index, subindex, self._entry(index, subindex)[2].encode(value))
+
+	def variable(self, index, subindex):
+		""" Returns the variable of the object dictionary, which describes an entry.
+		Raises KeyError if the entry is not in the store.
+
+		:raises: KeyError
+		"""
+		return self._entry(index, subindex)[2]
+
+	def write(self, index, subindex, data):
+		""" Stores the representation of an entry. For entries with fixed size, the data is copied into the buffer.
+		Raises KeyError if the entry is not in the store. Raises ValueError if the length of the data does not match the size of the entry.
+
+		:param data: A byte-like object.
+
+		:raises: KeyError, ValueError
+		"""
+		offset, length, variable = self._entry(index, subindex)
+		if offset is None:
+			self._variables[(index, subindex)] = bytes(data)
+			return
+		if len(data) != length:
+			raise ValueError("The length of the data does not match the size of the entry.")
+		self._view[offset:offset + length] = data
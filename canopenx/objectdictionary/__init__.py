@@ -3,6 +3,8 @@ from .datatypes import *
 from .defstruct import DefStruct
 from .deftype import DefType
 from .domain import Domain
+from .layout import Layout
+from .nodeidvalue import NodeIdValue
 from .objectdictionary import ObjectDictionary
 from .record import Record
 from .variable import Variable
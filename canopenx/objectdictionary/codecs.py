@@ -0,0 +1,336 @@
+import calendar
+import struct
+from .datatypes import *
+
+
+class Codec(object):
+	""" Base class of the codecs, which convert between the values of a data type and their CANopen representation.
+
+	The codecs are stateless and shared by all variables of the same data type. They raise struct.error, TypeError or OverflowError if a value does not fit to the data type, the variable converts these into ValueError.
+	"""
+
+	__slots__ = ["_length"]
+
+	def __init__(self, length):
+		"""
+		:param length: The length of the CANopen representation in bytes or 0 for data types with variable length.
+		"""
+		self._length = length
+
+	def _view(self, numpy, buffer, dtype, count, stride, offset):
+		""" Returns an array of count elements of the dtype in the buffer. The array shares the memory of the buffer.
+		Raises ValueError if the data type has variable length or the elements do not fit into the buffer.
+
+		:raises: ValueError
+		"""
+		if self._length == 0:
+			raise ValueError("Data types with variable length cannot be processed in batches.")
+		if stride is None:
+			stride = self._length
+		if stride < self._length:
+			raise ValueError("The stride must be at least the length of the data type.")
+		if offset < 0:
+			raise ValueError("The offset must not be negative.")
+		size = memoryview(buffer).nbytes
+		if count is None:
+			count = max(0, (size - offset - self._length) // stride + 1)
+		if count < 0:
+			raise ValueError("The count must not be negative.")
+		if count > 0 and offset + (count - 1) * stride + self._length > size:
+			raise ValueError("The buffer is too small for the specified count, stride and offset.")
+		return numpy.ndarray(shape = (count,), dtype = dtype, buffer = buffer, offset = offset, strides = (stride,))
+
+	def decode(self, data):
+		""" Returns the value for the byte-like CANopen representation.
+		"""
+		raise NotImplementedError()
+
+	def decode_many(self, buffer, count = None, stride = None, offset = 0):
+		""" Returns a numpy array of the values of count elements in the buffer. Element n starts at offset + n * stride.
+		Raises ValueError if the data type has variable length or the elements do not fit into the buffer.
+
+		:raises: ValueError
+		"""
+		raise ValueError("Data types with variable length cannot be processed in batches.")
+
+	def encode(self, value):
+		""" Returns the CANopen representation of the value as bytes.
+		"""
+		raise NotImplementedError()
+
+	def encode_many(self, values, buffer, stride = None, offset = 0):
+		""" Writes the CANopen representations of the values into the writable buffer. Element n starts at offset + n * stride.
+		Raises ValueError if the data type has variable length, a value cannot be represented or the elements do not fit into the buffer.
+
+		:raises: ValueError
+		"""
+		raise ValueError("Data types with variable length cannot be processed in batches.")
+
+	@property
+	def length(self):
+		""" Returns the length of the CANopen representation in bytes or 0 for data types with variable length.
+		"""
+		return self._length
+
+
+class StructCodec(Codec):
+	""" Codec for the data types with a native struct format, e.g. INTEGER16 or REAL32.
+	"""
+
+	__slots__ = ["_dtype", "_pack", "_struct", "_unpack_from"]
+
+	def __init__(self, format, dtype):
+		"""
+		:param format: The struct format of the data type.
+
+		:param dtype: The numpy dtype of the data type as string, e.g. "<i2".
+		"""
+		self._dtype = dtype
+		self._struct = struct.Struct(format)
+		self._pack = self._struct.pack
+		self._unpack_from = self._struct.unpack_from
+		Codec.__init__(self, self._struct.size)
+
+	def decode(self, data):
+		return self._unpack_from(data)[0]
+
+	def decode_many(self, buffer, count = None, stride = None, offset = 0):
+		import numpy
+		return self._view(numpy, buffer, self._dtype, count, stride, offset).astype(self._dtype[1:])
+
+	def encode(self, value):
+		return self._pack(value)
+
+	def encode_many(self, values, buffer, stride = None, offset = 0):
+		import numpy
+		dtype = numpy.dtype(self._dtype)
+		if dtype.kind in "iu":
+			info = numpy.iinfo(dtype)
+			values = _integers(numpy, values, int(info.min), int(info.max), dtype)
+		else:
+			values = numpy.asarray(values)
+		self._view(numpy, buffer, dtype, len(values), stride, offset)[:] = values
+
+	@property
+	def format(self):
+		""" Returns the struct format of the data type.
+		"""
+		return self._struct.format
+
+
+class IntegerCodec(Codec):
+	""" Codec for the integer data types without a native struct format (24, 40, 48 and 56 bits).
+	"""
+
+	__slots__ = ["_signed"]
+
+	def __init__(self, length, signed):
+		"""
+		:param length: The length of the data type in bytes.
+
+		:param signed: True for the INTEGER and False for the UNSIGNED data types.
+		"""
+		Codec.__init__(self, length)
+		self._signed = signed
+
+	def _bytes(self, numpy, buffer, count, stride, offset):
+		""" Returns a two-dimensional array of the bytes of the elements in the buffer.
+		"""
+		return self._view(numpy, buffer, numpy.dtype((numpy.uint8, (self._length,))), count, stride, offset)
+
+	def decode(self, data):
+		if len(data) < self._length:
+			raise ValueError("Decoding requires a buffer of at least " + str(self._length) + " bytes.")
+		return int.from_bytes(data[0:self._length], "little", signed = self._signed)
+
+	def decode_many(self, buffer, count = None, stride = None, offset = 0):
+		import numpy
+		data = self._bytes(numpy, buffer, count, stride, offset)
+		values = numpy.zeros((len(data), 8), dtype = numpy.uint8)
+		values[:, :self._length] = data
+		if self._signed:
+			values[:, self._length:] = numpy.where(data[:, -1:] & 0x80, 0xFF, 0x00)
+			return values.view("<i8").reshape(-1).astype(numpy.int64)
+		return values.view("<u8").reshape(-1).astype(numpy.uint64)
+
+	def encode(self, value):
+		return int.to_bytes(value, self._length, "little", signed = self._signed)
+
+	def encode_many(self, values, buffer, stride = None, offset = 0):
+		import numpy
+		bits = self._length * 8
+		if self._signed:
+			values = _integers(numpy, values, -(1 << (bits - 1)), (1 << (bits - 1)) - 1, "<i8")
+		else:
+			values = _integers(numpy, values, 0, (1 << bits) - 1, "<u8")
+		data = values.reshape(-1, 1).view(numpy.uint8)
+		self._bytes(numpy, buffer, len(values), stride, offset)[:] = data[:, :self._length]
+
+
+class StringCodec(Codec):
+	""" Codec for the string data types. Undecodable bytes are replaced.
+	"""
+
+	__slots__ = ["_encoding"]
+
+	def __init__(self, encoding):
+		"""
+		:param encoding: The name of the encoding.
+		"""
+		Codec.__init__(self, 0)
+		self._encoding = encoding
+
+	def decode(self, data):
+		return str(data, self._encoding, "replace")
+
+	def encode(self, value):
+		return str.encode(value, self._encoding)
+
+
+class DomainCodec(Codec):
+	""" Codec for the data type DOMAIN. The data is passed unchanged.
+	"""
+
+	__slots__ = []
+
+	def __init__(self):
+		Codec.__init__(self, 0)
+
+	def decode(self, data):
+		return data
+
+	def encode(self, value):
+		return bytes(value)
+
+
+class TimeCodec(Codec):
+	""" Codec for the data types TIME_OF_DAY and TIME_DIFFERENCE. The values are in seconds.
+
+	The CANopen representation consists of the milliseconds after midnight (28 bits) and the days (16 bits). For TIME_OF_DAY the days are counted from the CANopen epoch (1984-01-01), the value is a POSIX timestamp.
+	"""
+
+	__slots__ = ["_epoch", "_struct"]
+
+	__day = 24 * 60 * 60
+	__dtype = [("ms", "<u4"), ("days", "<u2")]
+
+	def __init__(self, epoch):
+		"""
+		:param epoch: The POSIX timestamp of day 0 or None for time differences.
+		"""
+		Codec.__init__(self, 6)
+		self._epoch = epoch
+		self._struct = struct.Struct("<LH")
+
+	def decode(self, data):
+		m, d = self._struct.unpack_from(data)
+		value = d * self.__day + (m & 0xFFFFFFF) / 1000
+		if self._epoch is not None:
+			value += self._epoch
+		return value
+
+	def decode_many(self, buffer, count = None, stride = None, offset = 0):
+		""" Returns a numpy array of datetime64 (TIME_OF_DAY) or timedelta64 (TIME_DIFFERENCE) values in milliseconds.
+		"""
+		import numpy
+		view = self._view(numpy, buffer, self.__dtype, count, stride, offset)
+		ms = view["days"].astype(numpy.int64) * (self.__day * 1000) + (view["ms"] & 0xFFFFFFF)
+		values = ms.astype("timedelta64[ms]")
+		if self._epoch is not None:
+			values = numpy.datetime64(self._epoch * 1000, "ms") + values
+		return values
+
+	def encode(self, value):
+		if self._epoch is None:
+			if value < 0:
+				value = -value
+		else:
+			if value < self._epoch:
+				raise ValueError("Encoding times before CANopen epoch is not defined.")
+			value -= self._epoch
+		d, m = divmod(value, self.__day)
+		return self._struct.pack(round(m * 1000), int(d))
+
+	def encode_many(self, values, buffer, stride = None, offset = 0):
+		""" Writes datetime64 (TIME_OF_DAY) or timedelta64 (TIME_DIFFERENCE) values with millisecond resolution into the buffer.
+		"""
+		import numpy
+		if self._epoch is None:
+			ms = numpy.abs(numpy.asarray(values, dtype = "timedelta64[ms]").astype(numpy.int64))
+		else:
+			ms = (numpy.asarray(values, dtype = "datetime64[ms]") - numpy.datetime64(self._epoch * 1000, "ms")).astype(numpy.int64)
+			if ms.size > 0 and ms.min() < 0:
+				raise ValueError("Encoding times before CANopen epoch is not defined.")
+		days, ms = numpy.divmod(ms, self.__day * 1000)
+		if days.size > 0 and days.max() > 0xFFFF:
+			raise ValueError("A value is out of the range of the data type.")
+		view = self._view(numpy, buffer, self.__dtype, len(ms), stride, offset)
+		view["ms"] = ms
+		view["days"] = days
+
+
+def _integers(numpy, values, low, high, dtype):
+	""" Returns the values as numpy array of the dtype.
+	Raises ValueError if there are values, which are not integers or out of the range from low to high.
+
+	:raises: ValueError
+	"""
+	if not isinstance(values, numpy.ndarray):
+		array = numpy.asarray(values)
+		if array.dtype.kind not in "biu":
+			# Python integers beyond the range of int64 are converted to float by numpy
+			array = numpy.array(values, dtype = object)
+		values = array
+	if values.dtype.kind == "O":
+		if not all(isinstance(value, int) for value in values.flat):
+			raise ValueError("Integer data types require integer values.")
+	elif values.dtype.kind not in "biu":
+		raise ValueError("Integer data types require integer values.")
+	if values.size > 0 and (values.min() < low or values.max() > high):
+		raise ValueError("A value is out of the range of the data type.")
+	return values.astype(dtype)
+
+
+CANOPEN_EPOCH = calendar.timegm((1984, 1, 1, 0, 0, 0))
+
+_codecs = {
+	BOOLEAN: StructCodec("<?", "<?"),
+	INTEGER8: StructCodec("<b", "<i1"),
+	INTEGER16: StructCodec("<h", "<i2"),
+	INTEGER32: StructCodec("<l", "<i4"),
+	UNSIGNED8: StructCodec("<B", "<u1"),
+	UNSIGNED16: StructCodec("<H", "<u2"),
+	UNSIGNED32: StructCodec("<L", "<u4"),
+	REAL32: StructCodec("<f", "<f4"),
+	VISIBLE_STRING: StringCodec("ascii"),
+	OCTET_STRING: StringCodec("utf-8"),
+	UNICODE_STRING: StringCodec("utf-16-le"),
+	TIME_OF_DAY: TimeCodec(CANOPEN_EPOCH),
+	TIME_DIFFERENCE: TimeCodec(None),
+	DOMAIN: DomainCodec(),
+	INTEGER24: IntegerCodec(3, True),
+	REAL64: StructCodec("<d", "<f8"),
+	INTEGER40: IntegerCodec(5, True),
+	INTEGER48: IntegerCodec(6, True),
+	INTEGER56: IntegerCodec(7, True),
+	INTEGER64: StructCodec("<q", "<i8"),
+	UNSIGNED24: IntegerCodec(3, False),
+	UNSIGNED40: IntegerCodec(5, False),
+	UNSIGNED48: IntegerCodec(6, False),
+	UNSIGNED56: IntegerCodec(7, False),
+	UNSIGNED64: StructCodec("<Q", "<u8")
+}
+
+
+def codec(data_type):
+	""" Returns the codec of the data type.
+	Raises ValueError if the data type is not supported.
+
+	:param data_type: An integer. One of the data types as defined in DS301 v4.02 Table 44: Object dictionary data types.
+
+	:raises: ValueError
+	"""
+	try:
+		return _codecs[data_type]
+	except (KeyError, TypeError):
+		raise ValueError("The specified data_type is not allowed.")
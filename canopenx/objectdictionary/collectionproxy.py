@@ -1,6 +1,6 @@
 class CollectionProxy(object):
 
-	__slots__ = ["_node", "_original"]
+	__slots__ = ["_items", "_node", "_original", "_proxies", "_version"]
 
 	def __contains__(self, key):
 		""" Returns True if the proxied object contains an item with the specified subindex or name.
@@ -9,8 +9,26 @@ class CollectionProxy(object):
 
 	def __getitem__(self, key):
 		""" Returns the item identified by the name or the subindex.
+		The proxies of the items are cached until the proxied object changes.
 		"""
-		return self._original[key].proxy(self._node)
+		if self._version != self._original._version:
+			self._proxies = {}
+			self._items = {}
+			self._version = self._original._version
+		try:
+			return self._proxies[key]
+		except KeyError:
+			pass
+
+		# The subindex and the name of an item share the proxy
+		item = self._original[key]
+		try:
+			proxy = self._items[id(item)]
+		except KeyError:
+			proxy = item.proxy(self._node)
+			self._items[id(item)] = proxy
+		self._proxies[key] = proxy
+		return proxy
 
 	def __iter__(self):
 		""" Returns an iterator over all items in the proxied object.
@@ -20,6 +38,9 @@ class CollectionProxy(object):
 	def __init__(self, original, node):
 		self._original = original
 		self._node = node
+		self._proxies = {}
+		self._items = {}
+		self._version = original._version
 
 	def __len__(self):
 		""" Returns the number of items in the proxied object.
@@ -0,0 +1,299 @@
+""" Loader of electronic data sheets (EDS) and device configuration files (DCF) as defined in DS306.
+
+The parsed object dictionary is cached in a compiled form next to the source file. The cache is keyed by the SHA-256 hash of the content, so it is used as long as the source file is unchanged.
+The cache is plain JSON data, from which the items are built again. So a manipulated cache file can corrupt the object dictionary, but not execute code.
+"""
+import configparser
+import hashlib
+import json
+import os
+import re
+from .array import Array
+from .datatypes import *
+from .defstruct import DefStruct
+from .deftype import DefType
+from .domain import Domain
+from .nodeidvalue import NodeIdValue
+from .objectdictionary import ObjectDictionary
+from .record import Record
+from .variable import Variable
+
+
+CACHE_SUFFIX = ".cache"
+
+# The cache is invalidated, if the format of the cache changes
+_format = "canopenx-od/2"
+_access_types = {"ro": "ro", "wo": "wo", "rw": "rw", "rwr": "rw", "rww": "rw", "const": "const"}
+_float_types = [REAL32, REAL64]
+_string_types = [VISIBLE_STRING, OCTET_STRING, UNICODE_STRING]
+_time_types = [TIME_OF_DAY, TIME_DIFFERENCE]
+_index_pattern = re.compile(r"^([0-9A-Fa-f]{4})$")
+_subindex_pattern = re.compile(r"^([0-9A-Fa-f]{4})sub([0-9A-Fa-f]{1,2})$", re.IGNORECASE)
+_nodeid_pattern = re.compile(r"\$NODEID", re.IGNORECASE)
+_collection_types = {"Array": Array, "DefStruct": DefStruct, "Record": Record}
+
+
+def _integer(text):
+	""" Returns the integer of a number in the notation of DS306 (decimal, hexadecimal with prefix 0x or octal with prefix 0).
+	"""
+	text = text.strip()
+	sign = 1
+	if text.startswith("-"):
+		sign = -1
+		text = text[1:].strip()
+	elif text.startswith("+"):
+		text = text[1:].strip()
+	if text[:2].lower() == "0x":
+		return sign * int(text[2:], 16)
+	if len(text) > 1 and text.startswith("0"):
+		return sign * int(text[1:], 8)
+	return sign * int(text, 10)
+
+
+def _expression(text, node_id):
+	""" Returns the integer of a value, which may contain the node id as $NODEID, e.g. "$NODEID+0x180".
+	"""
+	value = 0
+	for term in _nodeid_pattern.sub(lambda match: str(node_id), text).split("+"):
+		value += _integer(term)
+	return value
+
+
+def _compile(item):
+	""" Returns the item as plain JSON data: a list of the class name and the arguments of its constructor, collections with the compiled items as last element.
+	"""
+	if isinstance(item, (Array, Record)):
+		items = [_compile(variable) for variable in item]
+		if type(item) is DefStruct:
+			return ["DefStruct", item.name, item.index, items]
+		return [type(item).__name__, item.name, item.index, item.data_type, items]
+	if type(item) is Domain:
+		return ["Domain", item.name, item.index, item.access_type]
+	if type(item) is DefType:
+		return ["DefType", item.name, item.index, _compile_value(item)]
+	return ["Variable", item.name, item.index, item.subindex, item.data_type, item.access_type, _compile_value(item)]
+
+
+def _compile_value(variable):
+	""" Returns the default value of the variable as plain JSON data. Bytes and NodeIdValues are tagged, default values of time types are built again by the Variable.
+	"""
+	value = variable.default_value
+	if isinstance(value, NodeIdValue):
+		return {"nodeid": value.offset}
+	if isinstance(value, (bytes, bytearray)):
+		return {"bytes": bytes(value).hex()}
+	if variable.data_type in _time_types:
+		return None
+	return value
+
+
+def _decompile(data):
+	""" Returns the item built from the plain JSON data returned by _compile.
+	Raises ValueError if the data is not valid.
+
+	:raises: ValueError
+	"""
+	try:
+		name = data[0]
+		if name in _collection_types:
+			collection = _collection_types[name](*data[1:-1])
+			for variable in data[-1]:
+				collection.add(_decompile(variable))
+			return collection
+		if name == "Domain":
+			return Domain(*data[1:])
+		if name == "DefType":
+			return DefType(data[1], data[2], _decompile_value(data[3]))
+		if name == "Variable":
+			return Variable(*data[1:6], _decompile_value(data[6]))
+	except (IndexError, KeyError, TypeError) as e:
+		raise ValueError("The compiled item is invalid: " + str(e))
+	raise ValueError("The compiled item is invalid.")
+
+
+def _decompile_value(value):
+	if isinstance(value, dict):
+		if "nodeid" in value:
+			return NodeIdValue(value["nodeid"])
+		return bytes.fromhex(value["bytes"])
+	return value
+
+
+def _default_value(section, data_type, node_id):
+	""" Returns the default value of an entry or None, if the entry has no default value.
+	A DCF stores the configured value as ParameterValue, which takes precedence over the DefaultValue.
+	"""
+	text = section.get("parametervalue", "").strip() or section.get("defaultvalue", "").strip()
+	if text == "":
+		return None
+	if data_type in _string_types:
+		return text
+	if data_type == DOMAIN:
+		return None
+	if data_type in _float_types:
+		return float(text)
+	if data_type in _time_types:
+		return None
+	if node_id is None and _nodeid_pattern.search(text) is not None:
+		return NodeIdValue(_expression(text, 0))
+	value = _expression(text, node_id)
+	if data_type == BOOLEAN:
+		return value != 0
+	return value
+
+
+def _variable(section, index, subindex, node_id, data_type = None, name = None):
+	""" Returns the Variable of an entry. Entries of the data type DOMAIN are Variables too, as a Domain has no subindex.
+	"""
+	if name is None:
+		name = section.get("parametername", "").strip()
+	if data_type is None:
+		data_type = _integer(section.get("datatype", "0"))
+	access_type = _access_types.get(section.get("accesstype", "rw").strip().lower(), "rw")
+	default_value = _default_value(section, data_type, node_id)
+	return Variable(name, index, subindex, data_type, access_type, default_value)
+
+
+def _object(parser, index, section, subindices, node_id):
+	""" Returns the item of the object dictionary for the index.
+	"""
+	section = parser[section]
+	name = section.get("parametername", "").strip()
+	object_type = _integer(section.get("objecttype", "0x7") or "0x7")
+
+	if object_type == 0x2:
+		return Domain(name, index, _access_types.get(section.get("accesstype", "rw").strip().lower(), "rw"))
+	if object_type == 0x5:
+		return DefType(name, index, _default_value(section, UNSIGNED32, node_id))
+	if object_type == 0x7:
+		variable = _variable(section, index, 0x00, node_id)
+		if variable.data_type == DOMAIN:
+			return Domain(name, index, variable.access_type)
+		return variable
+
+	if object_type == 0x6:
+		collection = DefStruct(name, index)
+	elif object_type == 0x8:
+		if "datatype" in section:
+			data_type = _integer(section["datatype"])
+		elif 1 in subindices:
+			data_type = _integer(parser[subindices[1]].get("datatype", "0"))
+		else:
+			data_type = _integer(section.get("datatype", "0"))
+		collection = Array(name, index, data_type)
+	elif object_type == 0x9:
+		collection = Record(name, index, _integer(section.get("datatype", "0")))
+	else:
+		raise ValueError("The object type 0x{:X} of index 0x{:04X} is not supported.".format(object_type, index))
+
+	compact = _integer(section.get("compactsubobj", "0") or "0")
+	if compact > 0:
+		# The sub-objects are not described individually, DS306 defines their names and types
+		collection.add(Variable("NrOfObjects", index, 0x00, UNSIGNED8, "ro", compact))
+		data_type = _integer(section.get("datatype", "0"))
+		for subindex in range(1, compact + 1):
+			collection.add(_variable(section, index, subindex, node_id, data_type, name + str(subindex)))
+	else:
+		for subindex in sorted(subindices):
+			collection.add(_variable(parser[subindices[subindex]], index, subindex, node_id))
+	return collection
+
+
+def _node_id(parser, node_id):
+	if node_id is not None:
+		return int(node_id)
+	try:
+		return _integer(parser["DeviceComissioning"]["nodeid"])
+	except (KeyError, ValueError):
+		return None
+
+
+def load(filename, node_id = None, cache = True):
+	""" Returns the ObjectDictionary described by an EDS or DCF file.
+	If cache is True, the compiled object dictionary is stored next to the file (with the suffix ".cache") and used on the next load, as long as the content of the file is unchanged. If the cache cannot be read or written, the file is parsed.
+	Raises ValueError if the file cannot be parsed or an entry is invalid.
+
+	:param filename: The path of the EDS or DCF file.
+
+	:param node_id: The node id to substitute for $NODEID in the values. See loads.
+
+	:param cache: If True, the compiled cache is used.
+
+	:raises: OSError, ValueError
+	"""
+	with open(filename, "rb") as f:
+		content = f.read()
+
+	key = hashlib.sha256(_format.encode("ascii") + b"\x00" + str(node_id).encode("ascii") + b"\x00" + content).hexdigest()
+	cache_filename = os.fspath(filename) + CACHE_SUFFIX
+
+	if cache:
+		try:
+			with open(cache_filename, "r", encoding = "utf-8") as f:
+				data = json.load(f)
+			if data["format"] == _format and data["key"] == key:
+				dictionary = ObjectDictionary()
+				for item in data["items"]:
+					dictionary.add(_decompile(item))
+				return dictionary
+		except Exception:
+			# A damaged or outdated cache is replaced
+			pass
+
+	try:
+		text = content.decode("utf-8")
+	except UnicodeDecodeError:
+		text = content.decode("latin-1")
+	dictionary = loads(text, node_id)
+
+	if cache:
+		temporary_filename = cache_filename + "." + str(os.getpid())
+		try:
+			with open(temporary_filename, "w", encoding = "utf-8") as f:
+				json.dump({"format": _format, "key": key, "items": [_compile(item) for item in dictionary]}, f, separators = (",", ":"))
+			os.replace(temporary_filename, cache_filename)
+		except OSError:
+			try:
+				os.remove(temporary_filename)
+			except OSError:
+				pass
+
+	return dictionary
+
+
+def loads(text, node_id = None):
+	""" Returns the ObjectDictionary described by the text of an EDS or DCF.
+	Raises ValueError if the text cannot be parsed or an entry is invalid.
+
+	:param text: The content of the file as string.
+
+	:param node_id: The node id to substitute for $NODEID in the values. If None, the node id of the section DeviceComissioning of a DCF is used.
+		Without a node id, the values are kept as NodeIdValue and resolved for each node, so the object dictionary can be shared by all nodes of the device type.
+
+	:raises: ValueError
+	"""
+	parser = configparser.ConfigParser(interpolation = None, strict = False, delimiters = ("=",), comment_prefixes = (";",), inline_comment_prefixes = None)
+	try:
+		parser.read_string(text)
+	except configparser.Error as e:
+		raise ValueError("The text is not a valid EDS or DCF: " + str(e))
+	node_id = _node_id(parser, node_id)
+
+	indices = {}
+	subindices = {}
+	for name in parser.sections():
+		match = _index_pattern.match(name)
+		if match is not None:
+			indices[int(match.group(1), 16)] = name
+			continue
+		match = _subindex_pattern.match(name)
+		if match is not None:
+			subindices.setdefault(int(match.group(1), 16), {})[int(match.group(2), 16)] = name
+
+	dictionary = ObjectDictionary()
+	for index in sorted(indices):
+		try:
+			dictionary.add(_object(parser, index, indices[index], subindices.get(index, {}), node_id))
+		except (KeyError, TypeError, ValueError) as e:
+			raise ValueError("The entry 0x{:04X} is invalid: {}".format(index, e))
+	return dictionary
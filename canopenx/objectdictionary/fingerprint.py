@@ -0,0 +1,12 @@
+import hashlib
+
+
+MASK = (1 << 64) - 1
+
+
+def fingerprint(*values):
+	""" Returns a 64 bit fingerprint of the values. The values must have a stable representation (e.g. strings and integers), so the fingerprint is the same in every process.
+
+	The fingerprints of the items of a collection are summed up modulo 2 ** 64. Thus the fingerprint of the collection does not depend on the order of the items and can be updated in constant time, when an item is added or removed.
+	"""
+	return int.from_bytes(hashlib.blake2b(repr(values).encode("utf-8"), digest_size = 8).digest(), "little")
@@ -1,3 +1,6 @@
+from .nodeidvalue import NodeIdValue
+
+
 class ItemProxy(object):
 
 	__slots__ = ["_node", "_original"]
@@ -20,9 +23,12 @@ class ItemProxy(object):
 
 	@property
 	def default_value(self):
-		""" Returns the default value of the object.
+		""" Returns the default value of the object. A NodeIdValue is resolved with the node id of the node.
 		"""
-		return self._original.default_value
+		value = self._original.default_value
+		if isinstance(value, NodeIdValue):
+			return value.resolve(self._node.id)
+		return value
 
 	@property
 	def index(self):
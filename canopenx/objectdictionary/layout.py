@@ -0,0 +1,124 @@
+import struct
+from .codecs import StructCodec
+
+
+class Layout(object):
+	""" Compiled layout of the fixed-size items of a Record or an Array.
+
+	The items are placed in the order of their subindices without gaps. All items are packed and unpacked with a single struct.Struct. Items without a native struct format (e.g. INTEGER24 or TIME_OF_DAY) are represented as bytes in the struct and converted by their codec.
+	Items with variable length (strings and domains) are not part of the layout.
+	"""
+
+	__slots__ = ["_converters", "_names", "_struct", "_subindices"]
+
+	def __init__(self, items):
+		"""
+		:param items: An iterable of the variables of the collection.
+		"""
+		items = sorted((item for item in items if item._codec.length > 0), key = lambda item: item.subindex)
+
+		format = "<"
+		converters = []
+		for position, item in enumerate(items):
+			codec = item._codec
+			if isinstance(codec, StructCodec):
+				format += codec.format.lstrip("<")
+			else:
+				format += str(codec.length) + "s"
+				converters.append((position, codec))
+
+		self._names = tuple(item.name for item in items)
+		self._subindices = tuple(item.subindex for item in items)
+		self._converters = tuple(converters)
+		self._struct = struct.Struct(format)
+
+	def __len__(self):
+		""" Returns the number of items in the layout.
+		"""
+		return len(self._names)
+
+	@property
+	def format(self):
+		""" Returns the struct format of the layout.
+		"""
+		return self._struct.format
+
+	@property
+	def names(self):
+		""" Returns a tuple of the names of the items in the order of the layout.
+		"""
+		return self._names
+
+	def pack(self, values):
+		""" Returns the CANopen representation of all items of the layout as bytes.
+		Raises KeyError if a value is missing. Raises ValueError if a value cannot be encoded with the data type of its item.
+
+		:param values: A mapping of the names or subindices of the items to the values. The names are looked up first.
+
+		:raises: KeyError, ValueError
+		"""
+		fields = []
+		for name, subindex in zip(self._names, self._subindices):
+			try:
+				fields.append(values[name])
+			except KeyError:
+				fields.append(values[subindex])
+
+		try:
+			for position, codec in self._converters:
+				fields[position] = codec.encode(fields[position])
+			return self._struct.pack(*fields)
+		except (struct.error, TypeError):
+			raise ValueError("Could not encode the specified data. Maybe the data format does not match the data type of an item.")
+		except OverflowError:
+			raise ValueError("Could not encode the specified data. The value overflowed, maybe a negative value should be encoded as unsigned.")
+
+	@property
+	def size(self):
+		""" Returns the size of the CANopen representation of the layout in bytes.
+		"""
+		return self._struct.size
+
+	@property
+	def subindices(self):
+		""" Returns a tuple of the subindices of the items in the order of the layout.
+		"""
+		return self._subindices
+
+	def unpack_from(self, buffer, offset = 0):
+		""" Returns a dict of the names of the items to the values decoded from the buffer.
+		Raises ValueError if the buffer is too small.
+
+		:param buffer: A byte-like object.
+
+		:param offset: The position of the layout in the buffer.
+
+		:raises: ValueError
+		"""
+		return self.unpack_into(buffer, {}, offset)
+
+	def unpack_into(self, buffer, target, offset = 0):
+		""" Decodes the values from the buffer and stores them in the target by the names of the items. Returns the target.
+		Raises ValueError if the buffer is too small.
+
+		:param buffer: A byte-like object.
+
+		:param target: A mutable mapping, e.g. a dict.
+
+		:param offset: The position of the layout in the buffer.
+
+		:raises: ValueError
+		"""
+		try:
+			fields = self._struct.unpack_from(buffer, offset)
+		except struct.error:
+			raise ValueError("Could not decode the specified data. The buffer is too small for the layout.")
+
+		if self._converters:
+			fields = list(fields)
+			for position, codec in self._converters:
+				fields[position] = codec.decode(fields[position])
+
+		for name, value in zip(self._names, fields):
+			target[name] = value
+		return target
@@ -0,0 +1,37 @@
+class NodeIdValue(object):
+	""" A value, which depends on the node id, e.g. the default COB-ID $NODEID+0x180 of the first TPDO.
+
+	It may be used as default value of a variable, so one object dictionary can be shared by all nodes of the same device type. The value is resolved with the node id, when the default value is accessed through a node.
+	"""
+
+	__slots__ = ["_offset"]
+
+	def __eq__(self, other):
+		""" Indicates whether some other object is "equal to" this one.
+		"""
+		if type(self) != type(other):
+			return False
+		return self._offset == other._offset
+
+	def __hash__(self):
+		return hash(self._offset)
+
+	def __init__(self, offset = 0):
+		"""
+		:param offset: An integer. The value is the node id plus the offset.
+		"""
+		self._offset = int(offset)
+
+	def __repr__(self):
+		return "$NODEID+0x{:X}".format(self._offset) if self._offset >= 0 else "$NODEID-0x{:X}".format(-self._offset)
+
+	@property
+	def offset(self):
+		""" Returns the offset to the node id.
+		"""
+		return self._offset
+
+	def resolve(self, node_id):
+		""" Returns the value for the specified node id.
+		"""
+		return node_id + self._offset
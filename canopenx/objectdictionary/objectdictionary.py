@@ -1,10 +1,12 @@
+import bisect
 from .array import Array
+from .fingerprint import MASK
 from .record import Record
 from .variable import Variable
 
 
 class ObjectDictionary(object):
-	__slots__ = ["_items_index", "_items_name"]
+	__slots__ = ["_items_index", "_items_name", "_fingerprint", "_frozen", "_indices", "_version"]
 
 	def __contains__(self, key):
 		""" Returns True if the object dictionary contains an item with the specified index or name.
@@ -19,15 +21,22 @@ class ObjectDictionary(object):
 	def __delitem__(self, key):
 		""" Removes the item identified by the name or the index from the object dictionary.
 		"""
+		if self._frozen:
+			raise RuntimeError("The object dictionary is frozen.")
 		item = self[key]
 		del self._items_index[item.index]
 		del self._items_name[item.name]
+		del self._indices[bisect.bisect_left(self._indices, item.index)]
+		item._owners[:] = [owner for owner in item._owners if owner is not self]
+		self._update_fingerprint(item._fingerprint, 0)
 
 	def __eq__(self, other):
 		""" Indicates whether some other object is "equal to" this one.
 		"""
 		if type(self) != type(other):
 			return False
+		if self._fingerprint != other._fingerprint:
+			return False
 		return self is other or (self._items_index == other._items_index)
 
 	def __getitem__(self, key):
@@ -39,6 +48,16 @@ class ObjectDictionary(object):
 			return self._items_name[key]
 		raise KeyError("The specified item was not found.")
 
+	def __hash__(self):
+		""" Returns the fingerprint of a frozen object dictionary.
+		Raises TypeError if the object dictionary is not frozen.
+
+		:raises: TypeError
+		"""
+		if not self._frozen:
+			raise TypeError("The object dictionary must be frozen to be hashable.")
+		return self._fingerprint
+
 	def __iter__(self):
 		""" Returns an iterator over all items in the object dictionary.
 		"""
@@ -47,12 +66,22 @@ class ObjectDictionary(object):
 	def __init__(self):
 		self._items_index = {}
 		self._items_name = {}
+		self._indices = []
+		self._fingerprint = 0
+		self._frozen = False
+		self._version = 0
 
 	def __len__(self):
 		""" Returns the number of items in the object dictionary.
 		"""
 		return len(self._items_index)
 
+	def _update_fingerprint(self, old, new):
+		""" Replaces the fingerprint of an item in the fingerprint of the object dictionary. Each change increments the version, so the proxies of the nodes get renewed.
+		"""
+		self._fingerprint = (self._fingerprint - old + new) & MASK
+		self._version += 1
+
 	def add(self, item):
 		""" Adds an item to the object dictionary. It may be accessed later by the name or the index.
 
@@ -63,5 +92,48 @@ class ObjectDictionary(object):
 		if item.index in self._items_index or item.name in self._items_name:
 			raise ValueError("A item with this index or name is already in the object dictionary.")
 
+		if self._frozen:
+			raise RuntimeError("The object dictionary is frozen.")
+
 		self._items_index[item.index] = item
 		self._items_name[item.name] = item
+		bisect.insort(self._indices, item.index)
+		item._owners.append(self)
+		self._update_fingerprint(0, item._fingerprint)
+
+	@property
+	def fingerprint(self):
+		""" Returns the 64 bit fingerprint of all items. It is updated, when an item is added, removed or changed.
+		"""
+		return self._fingerprint
+
+	def freeze(self):
+		""" Freezes the object dictionary and all items. A frozen object dictionary is hashable and can be used as key in a dict, items cannot be added or removed anymore.
+		"""
+		for item in self._items_index.values():
+			item.freeze()
+		self._frozen = True
+
+	@property
+	def frozen(self):
+		""" Returns True if the object dictionary is frozen.
+		"""
+		return self._frozen
+
+	def items_in_range(self, first, last):
+		""" Returns a list of the items with an index in the range from first to last (inclusive), sorted by the index.
+		"""
+		start = bisect.bisect_left(self._indices, first)
+		stop = bisect.bisect_right(self._indices, last)
+		return [self._items_index[index] for index in self._indices[start:stop]]
+
+	def iter_sorted(self):
+		""" Returns an iterator over all items in the object dictionary, sorted by the index.
+		"""
+		return (self._items_index[index] for index in self._indices)
+
+	@property
+	def version(self):
+		""" Returns the version of the object dictionary. It is incremented on each change of the items.
+		"""
+		return self._version
@@ -1,6 +1,8 @@
 from .domain import Domain
+from .fingerprint import MASK, fingerprint
 from .variable import Variable
 from .collectionproxy import CollectionProxy
+from .layout import Layout
 from canopenx.objectdictionary import objecttypes
 
 
@@ -12,7 +14,7 @@ class Record(object):
 
 	object_type = objecttypes.RECORD
 
-	__slots__ = ["_name", "_index", "_data_type", "_items_subindex", "_items_name"]
+	__slots__ = ["_name", "_index", "_data_type", "_items_subindex", "_items_name", "_layout", "_fingerprint", "_frozen", "_owners", "_version"]
 
 	def __contains__(self, key):
 		""" Returns True if the Record contains an item with the specified subindex or name.
@@ -27,15 +29,22 @@ class Record(object):
 	def __delitem__(self, key):
 		""" Removes the item identified by the name or the subindex from the Record.
 		"""
+		if self._frozen:
+			raise RuntimeError("The Record is frozen.")
 		item = self[key]
 		del self._items_subindex[item.subindex]
 		del self._items_name[item.name]
+		self._layout = None
+		item._owners[:] = [owner for owner in item._owners if owner is not self]
+		self._update_fingerprint(item._fingerprint, 0)
 
 	def __eq__(self, other):
 		""" Indicates whether some other object is "equal to" this one.
 		"""
 		if type(self) != type(other):
 			return False
+		if self._fingerprint != other._fingerprint:
+			return False
 		return self is other or (self._name == other._name and self._index == other._index and self._data_type == other._data_type and self._items_subindex == other._items_subindex)
 
 	def __getitem__(self, key):
@@ -49,6 +58,16 @@ class Record(object):
 			except:
 				raise KeyError("The specified item was not found.")
 
+	def __hash__(self):
+		""" Returns the fingerprint of a frozen Record.
+		Raises TypeError if the Record is not frozen.
+
+		:raises: TypeError
+		"""
+		if not self._frozen:
+			raise TypeError("The Record must be frozen to be hashable.")
+		return self._fingerprint
+
 	def __iter__(self):
 		""" Returns an iterator over all items in the Record.
 		"""
@@ -75,12 +94,26 @@ class Record(object):
 
 		self._items_subindex = {}
 		self._items_name = {}
+		self._layout = None
+		self._owners = []
+		self._frozen = False
+		self._version = 0
+		self._fingerprint = fingerprint(type(self).__name__, self._name, self._index, self._data_type)
 
 	def __len__(self):
 		""" Returns the number of items in the Record.
 		"""
 		return len(self._items_subindex)
 
+	def _update_fingerprint(self, old, new):
+		""" Replaces the fingerprint of an item in the fingerprint of the Record and passes the change to the owner.
+		"""
+		previous = self._fingerprint
+		self._fingerprint = (previous - old + new) & MASK
+		self._version += 1
+		for owner in self._owners:
+			owner._update_fingerprint(previous, self._fingerprint)
+
 	def add(self, item):
 		""" Adds an item to the Record. It may be accessed later by the name or the subindex.
 
@@ -92,9 +125,22 @@ class Record(object):
 			raise ValueError("A item with this subindex or name is already in the Record.")
 		if item.index != self.index:
 			raise ValueError("The index of the item must match the index of the Record.")
+		if self._frozen:
+			raise RuntimeError("The Record is frozen.")
 
 		self._items_subindex[item.subindex] = item
 		self._items_name[item.name] = item
+		self._layout = None
+		item._owners.append(self)
+		self._update_fingerprint(0, item._fingerprint)
+
+	def compile_layout(self):
+		""" Returns the Layout of the fixed-size items of the Record, which packs and unpacks all of them at once.
+		The layout is cached until an item is added or removed.
+		"""
+		if self._layout is None:
+			self._layout = Layout(self._items_subindex.values())
+		return self._layout
 
 	@property
 	def data_type(self):
@@ -102,6 +148,25 @@ class Record(object):
 		"""
 		return self._data_type
 
+	@property
+	def fingerprint(self):
+		""" Returns the 64 bit fingerprint of the Record and its items. It is updated, when an item is added, removed or changed.
+		"""
+		return self._fingerprint
+
+	def freeze(self):
+		""" Freezes the Record and all items. A frozen Record is hashable, items cannot be added or removed anymore.
+		"""
+		for item in self._items_subindex.values():
+			item.freeze()
+		self._frozen = True
+
+	@property
+	def frozen(self):
+		""" Returns True if the Record is frozen.
+		"""
+		return self._frozen
+
 	@property
 	def index(self):
 		""" Returns the index of the Record.
@@ -118,3 +183,9 @@ class Record(object):
 		""" Returns a proxy bound to a specific node.
 		"""
 		return CollectionProxy(self, node)
+
+	@property
+	def version(self):
+		""" Returns the version of the Record. It is incremented on each change of the items.
+		"""
+		return self._version
@@ -1,7 +1,9 @@
-import calendar
 import struct
+from .codecs import CANOPEN_EPOCH, codec
 from .datatypes import *
+from .fingerprint import fingerprint
 from .itemproxy import ItemProxy
+from .nodeidvalue import NodeIdValue
 from canopenx.objectdictionary import objecttypes
 
 
@@ -13,9 +15,8 @@ class Variable(object):
 
 	object_type = objecttypes.VARIABLE
 
-	__slots__ = ["_name", "_index", "_subindex", "_data_type", "_access_type", "_default_value"]
+	__slots__ = ["_name", "_index", "_subindex", "_data_type", "_access_type", "_default_value", "_codec", "_fingerprint", "_frozen", "_owners"]
 
-	__canopen_epoch = calendar.timegm((1984, 1, 1, 0, 0, 0))
 	__sizes = {BOOLEAN: 1, INTEGER8: 8, INTEGER16: 16, INTEGER32: 32, UNSIGNED8: 8, UNSIGNED16: 16, UNSIGNED32: 32, REAL32: 32, VISIBLE_STRING: 0, OCTET_STRING: 0, UNICODE_STRING: 0, TIME_OF_DAY: 48, TIME_DIFFERENCE: 48, DOMAIN: 0, INTEGER24: 24, REAL64: 64, INTEGER40: 40, INTEGER48: 48, INTEGER56: 56, INTEGER64: 64, UNSIGNED24: 24, UNSIGNED40: 40, UNSIGNED48: 48, UNSIGNED56: 56, UNSIGNED64: 64}
 
 	def __eq__(self, other):
@@ -23,8 +24,20 @@ class Variable(object):
 		"""
 		if type(self) != type(other):
 			return False
+		if self._fingerprint != other._fingerprint:
+			return False
 		return self is other or (self._name == other._name and self._index == other._index and self._subindex == other._subindex and self._data_type == other._data_type and self._access_type == other._access_type)
 
+	def __hash__(self):
+		""" Returns the fingerprint of a frozen Variable.
+		Raises TypeError if the Variable is not frozen.
+
+		:raises: TypeError
+		"""
+		if not self._frozen:
+			raise TypeError("The Variable must be frozen to be hashable.")
+		return self._fingerprint
+
 	def __init__(self, name, index, subindex, data_type, access_type = "rw", default_value = None):
 		"""
 		:param name: A string. The name of this variable.
@@ -60,7 +73,7 @@ class Variable(object):
 			elif data_type == DOMAIN:
 				default_value = b""
 			elif data_type == TIME_OF_DAY:
-				default_value = self.__canopen_epoch
+				default_value = CANOPEN_EPOCH
 			else:
 				default_value = 0
 
@@ -69,12 +82,30 @@ class Variable(object):
 		self._subindex = int(subindex)
 		self._data_type = int(data_type)
 		self._access_type = str(access_type)
+		self._codec = codec(self._data_type)
+		self._owners = []
+		self._frozen = False
+		self._fingerprint = self._compute_fingerprint()
+
+		self._check_default_value(default_value)
+		self._default_value = default_value
+
+	def _check_default_value(self, value):
+		""" Raises ValueError if the default value cannot be encoded. A NodeIdValue must be encodable for all node ids.
 
+		:raises: ValueError
+		"""
 		try:
-			self.encode(default_value)
+			if isinstance(value, NodeIdValue):
+				self.encode(value.resolve(1))
+				self.encode(value.resolve(127))
+			else:
+				self.encode(value)
 		except ValueError:
 			raise ValueError("The specfied default_value cannot be encoded with the specified data type.")
-		self._default_value = default_value
+
+	def _compute_fingerprint(self):
+		return fingerprint(type(self).__name__, self._name, self._index, self._subindex, self._data_type, self._access_type)
 
 	@property
 	def access_type(self):
@@ -86,7 +117,13 @@ class Variable(object):
 	def access_type(self, x):
 		if x not in ["rw", "wo", "ro", "const"]:
 			raise ValueError("The specified access_type is not one of \"rw\", \"wo\", \"ro\", \"const\".")
+		if self._frozen:
+			raise RuntimeError("The Variable is frozen.")
 		self._access_type = x
+		old = self._fingerprint
+		self._fingerprint = self._compute_fingerprint()
+		for owner in self._owners:
+			owner._update_fingerprint(old, self._fingerprint)
 
 	@property
 	def data_type(self):
@@ -99,120 +136,37 @@ class Variable(object):
 
 		:raises: ValueError
 		"""
-		value = None
-
 		try:
-			if self._data_type == BOOLEAN:
-				value, = struct.unpack_from("<?", data)
-
-			if self._data_type == INTEGER8:
-				value, = struct.unpack_from("<b", data)
-
-			if self._data_type == INTEGER16:
-				value, = struct.unpack_from("<h", data)
-
-			if self._data_type == INTEGER32:
-				value, = struct.unpack_from("<l", data)
-
-			if self._data_type == UNSIGNED8:
-				value, = struct.unpack_from("<B", data)
-
-			if self._data_type == UNSIGNED16:
-				value, = struct.unpack_from("<H", data)
-
-			if self._data_type == UNSIGNED32:
-				value, = struct.unpack_from("<L", data)
-
-			if self._data_type == REAL32:
-				value, = struct.unpack_from("<f", data)
-
-			if self._data_type == VISIBLE_STRING:
-				value = bytes.decode(data, "ascii", errors = "replace")
-
-			if self._data_type == OCTET_STRING:
-				value = bytes.decode(data, "utf-8", errors = "replace")
-
-			if self._data_type == UNICODE_STRING:
-				value = bytes.decode(data, "utf-16-le", errors = "replace")
-
-			if self._data_type == TIME_OF_DAY:
-				m, d = struct.unpack_from("<LH", data)
-				m &= 0xFFFFFFF
-				value = d * 24 * 60 * 60 + m / 1000 + self.__canopen_epoch
-
-			if self._data_type == TIME_DIFFERENCE:
-				m, d = struct.unpack_from("<LH", data)
-				m &= 0xFFFFFFF
-				value = d * 24 * 60 * 60 + m / 1000
-
-			if self._data_type == DOMAIN:
-				value = data
-
-			if self._data_type == INTEGER24:
-				if len(data) < 3:
-					raise ValueError("Decoding requires a buffer of at least 3 bytes.")
-				value = int.from_bytes(data[0:3], "little", signed = True)
-
-			if self._data_type == REAL64:
-				value, = struct.unpack_from("<q", data)
-
-			if self._data_type == INTEGER40:
-				if len(data) < 5:
-					raise ValueError("Decoding requires a buffer of at least 5 bytes.")
-				value = int.from_bytes(data[0:5], "little", signed = True)
-
-			if self._data_type == INTEGER48:
-				if len(data) < 6:
-					raise ValueError("Decoding requires a buffer of at least 6 bytes.")
-				value = int.from_bytes(data[0:6], "little", signed = True)
-
-			if self._data_type == INTEGER56:
-				if len(data) < 7:
-					raise ValueError("Decoding requires a buffer of at least 7 bytes.")
-				value = int.from_bytes(data[0:7], "little", signed = True)
-
-			if self._data_type == INTEGER64:
-				value, = struct.unpack_from("<q", data)
+			return self._codec.decode(data)
+		except struct.error:
+			raise ValueError("Could not decode the specified data. Maybe the data format does not match the data type of the Variable.")
 
-			if self._data_type == UNSIGNED24:
-				if len(data) < 3:
-					raise ValueError("Decoding requires a buffer of at least 3 bytes.")
-				value = int.from_bytes(data[0:3], "little", signed = False)
+	def decode_many(self, buffer, count = None, stride = None, offset = 0):
+		""" Returns a numpy array of the values of count elements in the buffer, e.g. the payloads of logged PDOs. Requires numpy.
+		The integer and floating point types are returned with the matching numpy dtype, TIME_OF_DAY as datetime64 and TIME_DIFFERENCE as timedelta64 in milliseconds.
+		Raises ValueError if the data type has variable length or the elements do not fit into the buffer.
 
-			if self._data_type == UNSIGNED40:
-				if len(data) < 5:
-					raise ValueError("Decoding requires a buffer of at least 5 bytes.")
-				value = int.from_bytes(data[0:5], "little", signed = False)
+		:param buffer: A byte-like object.
 
-			if self._data_type == UNSIGNED48:
-				if len(data) < 6:
-					raise ValueError("Decoding requires a buffer of at least 6 bytes.")
-				value = int.from_bytes(data[0:6], "little", signed = False)
+		:param count: The number of elements or None for as many as fit into the buffer.
 
-			if self._data_type == UNSIGNED56:
-				if len(data) < 7:
-					raise ValueError("Decoding requires a buffer of at least 7 bytes.")
-				value = int.from_bytes(data[0:7], "little", signed = False)
+		:param stride: The distance of two elements in bytes or None for the length of the data type.
 
-			if self._data_type == UNSIGNED64:
-				value, = struct.unpack_from("<Q", data)
-		except struct.error:
-			raise ValueError("Could not decode the specified data. Maybe the data format does not match the data type of the Variable.")
+		:param offset: The position of the first element in the buffer.
 
-		return value
+		:raises: ValueError
+		"""
+		return self._codec.decode_many(buffer, count, stride, offset)
 
 	@property
 	def default_value(self):
-		""" Returns the default value for this Variable.
+		""" Returns the default value for this Variable. It may be a NodeIdValue, which is resolved by the proxy of a node.
 		"""
 		return self._default_value
 
 	@default_value.setter
 	def default_value(self, x):
-		try:
-			self.encode(x)
-		except ValueError:
-			raise ValueError("The specfied default_value cannot be encoded with the specified data type.")
+		self._check_default_value(x)
 		self._default_value = x
 
 	def encode(self, value):
@@ -220,99 +174,51 @@ class Variable(object):
 
 		:raises: ValueError
 		"""
-		data = b""
-
 		try:
-			if self._data_type == BOOLEAN:
-				data = struct.pack("?", value)
-
-			if self._data_type == INTEGER8:
-				data = struct.pack("<b", value)
-
-			if self._data_type == INTEGER16:
-				data = struct.pack("<h", value)
-
-			if self._data_type == INTEGER32:
-				data = struct.pack("<l", value)
-
-			if self._data_type == UNSIGNED8:
-				data = struct.pack("<B", value)
-
-			if self._data_type == UNSIGNED16:
-				data = struct.pack("<H", value)
-
-			if self._data_type == UNSIGNED32:
-				data = struct.pack("<L", value)
-
-			if self._data_type == REAL32:
-				data = struct.pack("<f", value)
-
-			if self._data_type == VISIBLE_STRING:
-				data = str.encode(value, "ascii")
-
-			if self._data_type == OCTET_STRING:
-				data = str.encode(value, "utf-8")
-
-			if self._data_type == UNICODE_STRING:
-				data = str.encode(value, "utf-16-le")
-
-			if self._data_type == TIME_OF_DAY:
-				if value < self.__canopen_epoch:
-					raise ValueError("Encoding times before CANopen epoch is not defined.")
-				x = divmod(value - self.__canopen_epoch, 24 * 60 * 60)
-				d = int(x[0])
-				m = round(x[1] * 1000)
-				data = struct.pack("<LH", m, d)
-
-			if self._data_type == TIME_DIFFERENCE:
-				if value < 0:
-					value = -value
-				x = divmod(value, 24 * 60 * 60)
-				d = int(x[0])
-				m = round(x[1] * 1000)
-				data = struct.pack("<LH", m, d)
-
-			if self._data_type == DOMAIN:
-				data = bytes(value)
-
-			if self._data_type == INTEGER24:
-				data = int.to_bytes(value, 3, "little", signed = True)
-
-			if self._data_type == REAL64:
-				data = struct.pack("<d", value)
-
-			if self._data_type == INTEGER40:
-				data = int.to_bytes(value, 5, "little", signed = True)
+			return self._codec.encode(value)
+		except (struct.error, TypeError):
+			raise ValueError("Could not encode the specified data. Maybe the data format does not match the data type of the Variable.")
+		except OverflowError:
+			raise ValueError("Could not encode the specified data. The value overflowed, maybe a negative value should be encoded as unsigned.")
 
-			if self._data_type == INTEGER48:
-				data = int.to_bytes(value, 6, "little", signed = True)
+	def encode_many(self, values, buffer = None, stride = None, offset = 0):
+		""" Writes the CANopen representations of the values into the buffer and returns the buffer. Requires numpy.
+		Raises ValueError if the data type has variable length, a value cannot be represented or the elements do not fit into the buffer.
 
-			if self._data_type == INTEGER56:
-				data = int.to_bytes(value, 7, "little", signed = True)
+		:param values: A sequence or numpy array of values. TIME_OF_DAY expects datetime64 and TIME_DIFFERENCE timedelta64 values.
 
-			if self._data_type == INTEGER64:
-				data = struct.pack("<q", value)
+		:param buffer: A writable byte-like object or None to create a bytearray.
 
-			if self._data_type == UNSIGNED24:
-				data = int.to_bytes(value, 3, "little", signed = False)
+		:param stride: The distance of two elements in bytes or None for the length of the data type.
 
-			if self._data_type == UNSIGNED40:
-				data = int.to_bytes(value, 5, "little", signed = False)
+		:param offset: The position of the first element in the buffer.
 
-			if self._data_type == UNSIGNED48:
-				data = int.to_bytes(value, 6, "little", signed = False)
+		:raises: ValueError
+		"""
+		if buffer is None:
+			length = self._codec.length
+			if stride is None:
+				stride = length
+			buffer = bytearray(offset + max(0, len(values) - 1) * stride + length if len(values) > 0 else offset)
+		self._codec.encode_many(values, buffer, stride, offset)
+		return buffer
 
-			if self._data_type == UNSIGNED56:
-				data = int.to_bytes(value, 7, "little", signed = False)
+	@property
+	def fingerprint(self):
+		""" Returns the 64 bit fingerprint of the attributes compared by the equality.
+		"""
+		return self._fingerprint
 
-			if self._data_type == UNSIGNED64:
-				data = struct.pack("<Q", value)
-		except (struct.error, TypeError):
-			raise ValueError("Could not encode the specified data. Maybe the data format does not match the data type of the Variable.")
-		except OverflowError:
-			raise ValueError("Could not encode the specified data. The value overflowed, maybe a negative value should be encoded as unsigned.")
+	def freeze(self):
+		""" Freezes the Variable. A frozen Variable is hashable, its access type cannot be changed anymore.
+		"""
+		self._frozen = True
 
-		return data
+	@property
+	def frozen(self):
+		""" Returns True if the Variable is frozen.
+		"""
+		return self._frozen
 
 	@property
 	def index(self):
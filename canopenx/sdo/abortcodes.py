@@ -0,0 +1,31 @@
+TOGGLE_BIT_NOT_ALTERNATED = 0x05030000
+SDO_PROTOCOL_TIMED_OUT = 0x05040000
+COMMAND_SPECIFIER_NOT_VALID = 0x05040001
+INVALID_BLOCK_SIZE = 0x05040002
+INVALID_SEQUENCE_NUMBER = 0x05040003
+CRC_ERROR = 0x05040004
+OUT_OF_MEMORY = 0x05040005
+UNSUPPORTED_ACCESS = 0x06010000
+READ_OF_WRITE_ONLY_OBJECT = 0x06010001
+WRITE_OF_READ_ONLY_OBJECT = 0x06010002
+OBJECT_DOES_NOT_EXIST = 0x06020000
+OBJECT_CANNOT_BE_MAPPED = 0x06040041
+PDO_LENGTH_EXCEEDED = 0x06040042
+PARAMETER_INCOMPATIBILITY = 0x06040043
+INTERNAL_INCOMPATIBILITY = 0x06040047
+HARDWARE_ERROR = 0x06060000
+DATA_TYPE_LENGTH_MISMATCH = 0x06070010
+DATA_TYPE_LENGTH_TOO_HIGH = 0x06070012
+DATA_TYPE_LENGTH_TOO_LOW = 0x06070013
+SUBINDEX_DOES_NOT_EXIST = 0x06090011
+INVALID_VALUE = 0x06090030
+VALUE_TOO_HIGH = 0x06090031
+VALUE_TOO_LOW = 0x06090032
+MAXIMUM_LESS_THAN_MINIMUM = 0x06090036
+RESOURCE_NOT_AVAILABLE = 0x060A0023
+GENERAL_ERROR = 0x08000000
+DATA_CANNOT_BE_TRANSFERRED = 0x08000020
+DATA_CANNOT_BE_TRANSFERRED_LOCAL_CONTROL = 0x08000021
+DATA_CANNOT_BE_TRANSFERRED_DEVICE_STATE = 0x08000022
+NO_OBJECT_DICTIONARY = 0x08000023
+NO_DATA_AVAILABLE = 0x08000024
@@ -38,11 +38,15 @@ setuptools.setup(
 		"Topic :: Utilities"
 	],
 
-	python_requires = ">=3.6",
+	python_requires = ">=3.8",
 
 	packages = setuptools.find_packages(include = ["canopenx*"]),
 
 	install_requires = [
 		"python-can>=3.0.0"
-	]
+	],
+
+	extras_require = {
+		"numpy": ["numpy"]
+	}
 )
@@ -0,0 +1,205 @@
+import asyncio
+import can
+import struct
+import threading
+import unittest
+
+from canopenx import AsyncNetwork, ObjectDictionary
+from canopenx.node import RemoteNode
+from canopenx.node.service.emcy import EMCYEvent
+
+
+class AsyncNetworkTestCase(unittest.IsolatedAsyncioTestCase):
+	async def test_connect(self):
+		bus = can.Bus(interface = "virtual", channel = 0)
+		network = AsyncNetwork()
+
+		self.assertIsNone(network.loop)
+
+		network.connect(bus)
+		self.assertTrue(network.is_connected())
+		self.assertIs(network.loop, asyncio.get_running_loop())
+
+		network.disconnect()
+		self.assertFalse(network.is_connected())
+		self.assertIsNone(network.loop)
+
+		bus.shutdown()
+
+	def test_connect_without_loop(self):
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 0)
+		network = AsyncNetwork()
+
+		#### Test step: The notifier needs an event loop
+		with self.assertRaises(RuntimeError):
+			network.connect(bus1)
+
+		#### Test step: Without notifier, the messages are polled
+		network.connect(bus1, notifier = False)
+		self.assertTrue(network.is_connected())
+		self.assertIsNone(network.loop)
+
+		received = []
+		network.subscribe(0x100, received.append)
+		bus2.send(can.Message(arbitration_id = 0x100, is_extended_id = False))
+		self.assertEqual(network.poll(1.0), 1)
+		self.assertEqual([message.arbitration_id for message in received], [0x100])
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	async def test_send_receive(self):
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 0)
+		network = AsyncNetwork()
+
+		#### Test step: Send on detached bus
+		with self.assertRaises(RuntimeError):
+			await network.send(can.Message(arbitration_id = 0x00, dlc = 0))
+
+		network.connect(bus1)
+
+		#### Test step: Awaitable send
+		await network.send(can.Message(arbitration_id = 0x100, is_extended_id = False, data = b"\x11\x22"))
+		message = bus2.recv(1.0)
+		self.assertEqual(message.arbitration_id, 0x100)
+		self.assertEqual(message.data, b"\x11\x22")
+
+		#### Test step: Awaitable receive
+		task = asyncio.ensure_future(network.receive(0x200, 1.0))
+		await asyncio.sleep(0)
+		bus2.send(can.Message(arbitration_id = 0x201, is_extended_id = False, data = b"\x01"))
+		bus2.send(can.Message(arbitration_id = 0x200, is_extended_id = False, data = b"\x02"))
+		message = await task
+		self.assertEqual(message.arbitration_id, 0x200)
+		self.assertEqual(message.data, b"\x02")
+
+		#### Test step: Receive timeout
+		with self.assertRaises(asyncio.TimeoutError):
+			await network.receive(0x200, 0.01)
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	async def test_send_backpressure(self):
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 0)
+		network = AsyncNetwork()
+		network.connect(bus1, transmit_queue_size = 1)
+
+		release = threading.Event()
+		bus_send = bus1.send
+
+		def blocking_send(message, timeout = None):
+			release.wait()
+			bus_send(message, timeout)
+
+		bus1.send = blocking_send
+
+		#### Test step: The writer thread blocks on the bus, the transmit queue fills up
+		network.send(can.Message(arbitration_id = 0x101, is_extended_id = False))
+		await asyncio.sleep(0.05)
+		network.send(can.Message(arbitration_id = 0x102, is_extended_id = False))
+
+		#### Test step: The send does not block the event loop, the awaitable waits for space
+		with self.assertRaises(RuntimeError):
+			network.send(can.Message(arbitration_id = 0x103, is_extended_id = False), 0)
+		task = asyncio.ensure_future(network.send(can.Message(arbitration_id = 0x104, is_extended_id = False)))
+		network.send(can.Message(arbitration_id = 0x105, is_extended_id = False))
+		await asyncio.sleep(0.05)
+		self.assertFalse(task.done())
+
+		release.set()
+		await asyncio.wait_for(task, 1.0)
+
+		#### Test step: The messages keep their order
+		received = [bus2.recv(1.0).arbitration_id for _ in range(4)]
+		self.assertEqual(received, [0x101, 0x102, 0x104, 0x105])
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	async def test_send_many_backpressure(self):
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 0)
+		network = AsyncNetwork()
+		network.connect(bus1, transmit_queue_size = 1)
+
+		release = threading.Event()
+		bus_send = bus1.send
+
+		def blocking_send(message, timeout = None):
+			release.wait()
+			bus_send(message, timeout)
+
+		bus1.send = blocking_send
+
+		def messages(*arbitration_ids):
+			return [can.Message(arbitration_id = arbitration_id, is_extended_id = False) for arbitration_id in arbitration_ids]
+
+		#### Test step: The writer thread blocks on the bus, the transmit queue fills up
+		network.send(messages(0x101)[0])
+		await asyncio.sleep(0.05)
+		self.assertEqual(network.send_many(messages(0x102)), 1)
+
+		#### Test step: send_many does not block the event loop, the batch is handed over to the sender thread
+		self.assertEqual(network.send_many(messages(0x103), 0), 0)
+		self.assertEqual(network.send_many(messages(0x104, 0x105)), 2)
+		network.send(messages(0x106)[0])
+		self.assertEqual(network.send_many(messages(0x107, 0x108)), 2)
+		task = asyncio.ensure_future(network.send(messages(0x109)[0]))
+		await asyncio.sleep(0.05)
+		self.assertFalse(task.done())
+
+		release.set()
+		await asyncio.wait_for(task, 1.0)
+
+		#### Test step: The messages of send and send_many keep their order
+		received = [bus2.recv(1.0).arbitration_id for _ in range(8)]
+		self.assertEqual(received, [0x101, 0x102, 0x104, 0x105, 0x106, 0x107, 0x108, 0x109])
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	async def test_services(self):
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 0)
+		network = AsyncNetwork()
+		node = RemoteNode(10, ObjectDictionary())
+		network.add(node)
+		network.connect(bus1)
+
+		events = []
+		threads = []
+
+		def on_emcy(event):
+			events.append(event)
+			threads.append(threading.current_thread())
+
+		node.emcy.add_callback("emcy", on_emcy)
+
+		bus2.send(can.Message(arbitration_id = 0x8A, is_extended_id = False, data = struct.pack("<HB5s", 0x1000, 0x01, b"\x00\x00\x00\x00\x00")))
+		bus2.send(can.Message(arbitration_id = 0x70A, is_extended_id = False, data = b"\x05"))
+		for _ in range(100):
+			if events and node.nmt.state == 0x05:
+				break
+			await asyncio.sleep(0.01)
+
+		self.assertEqual(events, [EMCYEvent(0x1000, 0x01, b"\x00\x00\x00\x00\x00")])
+		self.assertEqual(threads, [threading.current_thread()])
+		self.assertEqual(node.nmt.state, 0x05)
+
+		#### Test step: Services send without awaiting
+		node.nmt.reset_communication()
+		message = bus2.recv(1.0)
+		self.assertEqual(message.arbitration_id, 0x000)
+		self.assertEqual(message.data, b"\x82\x0A")
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
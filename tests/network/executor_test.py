@@ -0,0 +1,111 @@
+import mock
+import threading
+import unittest
+
+from canopenx.network.executor import QueuedCallback, QueueWorker, WorkerPool
+
+
+class QueueWorkerTestCase(unittest.TestCase):
+	def test_init(self):
+		with self.assertRaises(ValueError):
+			QueueWorker(0)
+
+	def test_submit(self):
+		examinee = QueueWorker(10)
+		received = []
+
+		for i in range(10):
+			self.assertTrue(examinee.submit(received.append, i))
+		examinee.stop()
+
+		self.assertEqual(received, list(range(10)))
+
+	def test_overflow(self):
+		examinee = QueueWorker(1)
+		event = threading.Event()
+		started = threading.Event()
+
+		def blocker(message):
+			started.set()
+			event.wait()
+
+		callback = mock.Mock(side_effect = Exception())
+
+		examinee.submit(blocker, None)
+		started.wait()
+		self.assertTrue(examinee.submit(callback, 1, False))
+		self.assertFalse(examinee.submit(callback, 2, False))
+		event.set()
+		examinee.stop()
+
+		callback.assert_called_once_with(1)
+
+	def test_stop(self):
+		examinee = QueueWorker(1)
+		event = threading.Event()
+		stopped = threading.Event()
+		received = []
+
+		def stop(message):
+			event.wait()
+			examinee.stop()
+			stopped.set()
+
+		#### Test step: Stop from a callback on the worker with a full queue does not block
+		examinee.submit(stop, None)
+		examinee.submit(received.append, 1)
+		event.set()
+		self.assertTrue(stopped.wait(1.0))
+
+		#### Test step: The queued calls are executed before the worker stops
+		examinee._thread.join(1.0)
+		self.assertFalse(examinee._thread.is_alive())
+		self.assertEqual(received, [1])
+
+
+class WorkerPoolTestCase(unittest.TestCase):
+	def test_init(self):
+		with self.assertRaises(ValueError):
+			WorkerPool(0, 10)
+		with self.assertRaises(ValueError):
+			WorkerPool(1, 0)
+
+	def test_worker(self):
+		examinee = WorkerPool(3, 10)
+
+		self.assertIs(examinee.worker(0x181), examinee.worker(0x181))
+		self.assertTrue(examinee.worker(0x181) in examinee)
+		self.assertFalse(QueueWorker(1) in examinee)
+
+		examinee.acquire()
+		examinee.acquire()
+		self.assertFalse(examinee.release())
+		self.assertTrue(examinee.release())
+
+		examinee.stop()
+
+
+class QueuedCallbackTestCase(unittest.TestCase):
+	def test_call(self):
+		worker = QueueWorker(1)
+		event = threading.Event()
+		started = threading.Event()
+
+		def blocker(message):
+			started.set()
+			event.wait()
+
+		callback = mock.Mock()
+		examinee = QueuedCallback(callback, worker, False)
+		self.assertIs(examinee.callback, callback)
+		self.assertIs(examinee.worker, worker)
+
+		worker.submit(blocker, None)
+		started.wait()
+		examinee(1)
+		examinee(2)
+		self.assertEqual(examinee.dropped, 1)
+		event.set()
+		worker.stop()
+
+		callback.assert_called_once_with(1)
@@ -0,0 +1,53 @@
+import unittest
+
+from canopenx.network.filters import compute_filters, range_masks
+
+
+class FiltersTestCase(unittest.TestCase):
+	def test_compute_filters(self):
+		with self.subTest("Invalid budget"):
+			with self.assertRaises(ValueError):
+				compute_filters([0x100], 0)
+
+		with self.subTest("No cob ids"):
+			self.assertEqual(compute_filters([]), [{"can_id": 0x00000000, "can_mask": 0x1FFFFFFF, "extended": True}])
+			self.assertEqual(compute_filters([], 1, []), [{"can_id": 0x00000000, "can_mask": 0x1FFFFFFF, "extended": True}])
+
+		with self.subTest("Single identifiers"):
+			self.assertEqual(compute_filters([0x100, 0x102]), [{"can_id": 0x100, "can_mask": 0x7FF, "extended": False}, {"can_id": 0x102, "can_mask": 0x7FF, "extended": False}])
+			self.assertEqual(compute_filters([(1 << 29) | 0x100]), [{"can_id": 0x100, "can_mask": 0x1FFFFFFF, "extended": True}])
+
+		with self.subTest("Completely subscribed blocks are combined"):
+			self.assertEqual(compute_filters(range(0x700, 0x780)), [{"can_id": 0x700, "can_mask": 0x780, "extended": False}])
+			self.assertEqual(len(compute_filters(range(0x701, 0x780))), 7)
+
+		with self.subTest("Budget"):
+			test_data = [[0x701, 0x702, 0x703, 0x70A], [0x081 + i for i in range(127)] + [0x701 + i for i in range(127)], [0x100, (1 << 29) | 0x100]]
+			for cob_ids in test_data:
+				for budget in range(1, 4):
+					with self.subTest("cob_ids=" + str(cob_ids) + ",budget=" + str(budget)):
+						filters = compute_filters(cob_ids, budget)
+						self.assertLessEqual(len(filters), budget)
+						# All subscribed identifiers must be accepted by at least one filter
+						for cob_id in cob_ids:
+							extended = bool(cob_id & (1 << 29))
+							can_id = cob_id & 0x1FFFFFFF
+							self.assertTrue(any(can_id & f["can_mask"] == f["can_id"] & f["can_mask"] and f.get("extended", extended) == extended for f in filters))
+
+		with self.subTest("Both frame types with a budget of one filter"):
+			self.assertEqual(compute_filters([0x100, (1 << 29) | 0x100], 1), [{"can_id": 0, "can_mask": 0}])
+
+		with self.subTest("Masks"):
+			self.assertEqual(compute_filters([0x705, 0x100], masks = [(0x700, 0x780)]), [{"can_id": 0x100, "can_mask": 0x7FF, "extended": False}, {"can_id": 0x700, "can_mask": 0x780, "extended": False}])
+			self.assertEqual(compute_filters([], masks = [((1 << 29) | 0x18FF1234, 0x1FFF0000)]), [{"can_id": 0x18FF0000, "can_mask": 0x1FFF0000, "extended": True}])
+
+	def test_range_masks(self):
+		with self.assertRaises(ValueError):
+			range_masks(0x101, 0x100)
+		with self.assertRaises(ValueError):
+			range_masks(0x100, (1 << 29) | 0x100)
+
+		self.assertEqual(range_masks(0x000, 0x7FF), [(0x000, 0x000)])
+		self.assertEqual(range_masks(0x100, 0x100), [(0x100, 0x7FF)])
+		self.assertEqual(range_masks(0x701, 0x77F), [(0x701, 0x7FF), (0x702, 0x7FE), (0x704, 0x7FC), (0x708, 0x7F8), (0x710, 0x7F0), (0x720, 0x7E0), (0x740, 0x7C0)])
+		self.assertEqual(range_masks((1 << 29) | 0x10000, (1 << 29) | 0x1FFFF), [((1 << 29) | 0x10000, 0x1FFF0000)])
@@ -0,0 +1,45 @@
+import can
+import time
+import unittest
+
+from canopenx.network.instrumentation import Instrumentation
+
+
+class InstrumentationTestCase(unittest.TestCase):
+	def test_count(self):
+		examinee = Instrumentation()
+
+		examinee.count(can.Message(arbitration_id = 0x100, is_extended_id = False, data = b"\x01\x02"))
+		examinee.count(can.Message(arbitration_id = 0x100, is_extended_id = False, data = b"\x01"))
+		examinee.count(can.Message(arbitration_id = 0x100, is_extended_id = True, data = b""))
+
+		self.assertEqual(examinee.snapshot()["frames"], {0x100: {"count": 2, "bytes": 3}, (1 << 29) | 0x100: {"count": 1, "bytes": 0}})
+
+	def test_wrap(self):
+		examinee = Instrumentation()
+
+		def callback(message):
+			if message.data == b"\x00":
+				raise ValueError()
+
+		wrapped = examinee.wrap(0x100, 0x7FF, callback)
+		self.assertIs(wrapped.callback, callback)
+		self.assertIs(examinee.wrap(0x100, 0x7FF, callback), wrapped)
+		self.assertIsNot(examinee.wrap(0x101, 0x7FF, callback), wrapped)
+
+		wrapped(can.Message(arbitration_id = 0x100, timestamp = time.time() - 0.0015, data = b"\x01"))
+		with self.assertRaises(ValueError):
+			wrapped(can.Message(arbitration_id = 0x100, timestamp = time.time(), data = b"\x00"))
+
+		snapshot = examinee.snapshot()
+		record = snapshot["callbacks"][0]
+		self.assertEqual(record["cob_id"], 0x100)
+		self.assertEqual(record["mask"], 0x7FF)
+		self.assertTrue(record["callback"].endswith("callback"))
+		self.assertEqual(record["calls"], 2)
+		self.assertEqual(record["exceptions"], 1)
+		self.assertGreaterEqual(record["total_time"], record["max_time"])
+		self.assertEqual(snapshot["callbacks"][1]["calls"], 0)
+
+		self.assertEqual(sum(snapshot["latency"].values()), 2)
+		self.assertTrue(any(bound > 0.0015 and bound <= 0.004 for bound in snapshot["latency"]))
@@ -0,0 +1,155 @@
+import can
+import canopenx
+import time
+import unittest
+
+from canopenx.network import MultiNetwork
+from canopenx.node import Node
+
+
+class MultiNetworkTestCase(unittest.TestCase):
+	def test_init(self):
+		with self.assertRaises(ValueError):
+			MultiNetwork(workers = 0)
+		with self.assertRaises(ValueError):
+			MultiNetwork(queue_size = 0)
+
+	def test_channels(self):
+		examinee = MultiNetwork()
+		self.assertEqual(len(examinee), 0)
+
+		network1 = examinee.add_channel("can0")
+		network2 = canopenx.Network()
+		self.assertIs(examinee.add_channel("can1", network2), network2)
+		self.assertIsInstance(network1, canopenx.Network)
+
+		with self.assertRaises(ValueError):
+			examinee.add_channel("can0")
+
+		self.assertEqual(len(examinee), 2)
+		self.assertEqual(list(examinee), ["can0", "can1"])
+		self.assertTrue("can0" in examinee)
+		self.assertFalse("can2" in examinee)
+		self.assertIs(examinee["can0"], network1)
+		self.assertIs(examinee["can1"], network2)
+
+		with self.assertRaises(KeyError):
+			examinee["can2"]
+
+		del examinee["can1"]
+		self.assertEqual(list(examinee), ["can0"])
+
+		with self.assertRaises(KeyError):
+			del examinee["can1"]
+
+	def test_nodes(self):
+		examinee = MultiNetwork()
+		examinee.add_channel("can0")
+		examinee.add_channel("can1")
+		dictionary = canopenx.ObjectDictionary()
+		node1 = Node(1, dictionary, "a")
+		node2 = Node(1, dictionary, "b")
+
+		examinee.add(node1, "can0")
+		examinee.add(node2, "can1")
+		self.assertIs(node1.network, examinee["can0"])
+		self.assertIs(node2.network, examinee["can1"])
+
+		with self.assertRaises(KeyError):
+			examinee.add(Node(2, dictionary), "can2")
+		with self.assertRaises(ValueError):
+			examinee.add(Node(1, dictionary), "can0")
+
+		self.assertEqual(examinee.find(1), ("can0", node1))
+		self.assertEqual(examinee.find("b"), ("can1", node2))
+		with self.assertRaises(KeyError):
+			examinee.find(3)
+
+		self.assertEqual(list(examinee.nodes()), [("can0", node1), ("can1", node2)])
+
+	def test_connect(self):
+		examinee = MultiNetwork()
+		examinee.add_channel("can0")
+		examinee.add_channel("can1")
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 1)
+
+		examinee.connect("can0", bus1)
+		examinee.connect("can1", bus2, transmit_queue_size = 16)
+		self.assertIs(examinee["can0"].bus, bus1)
+		self.assertIsNotNone(examinee["can1"].transmit_queue)
+
+		with self.assertRaises(KeyError):
+			examinee.connect("can2", bus1)
+
+		examinee.disconnect()
+		self.assertFalse(examinee["can0"].is_connected())
+		self.assertFalse(examinee["can1"].is_connected())
+
+		bus1.shutdown()
+		bus2.shutdown()
+
+	def test_routes(self):
+		examinee = MultiNetwork()
+		examinee.add_channel("can0")
+		examinee.add_channel("can1")
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 1)
+		peer1 = can.Bus(interface = "virtual", channel = 0)
+		peer2 = can.Bus(interface = "virtual", channel = 1)
+		examinee.connect("can0", bus1)
+		examinee.connect("can1", bus2)
+
+		with self.assertRaises(KeyError):
+			examinee.add_route("can0", "can2", 0x100)
+		with self.assertRaises(ValueError):
+			examinee.add_route("can0", "can0", 0x100)
+
+		route = examinee.add_route("can0", "can1", 0x100, 0x780)
+		self.assertIs(route.destination, examinee["can1"])
+		self.assertEqual(examinee.routes, {("can0", "can1", 0x100, 0x780): route})
+
+		with self.assertRaises(ValueError):
+			examinee.add_route("can0", "can1", 0x100, 0x780)
+
+		#### Test step: Matching message is forwarded
+		peer1.send(can.Message(arbitration_id = 0x123, is_extended_id = False, data = [1, 2, 3]))
+		message = peer2.recv(1.0)
+		self.assertIsNotNone(message)
+		self.assertEqual(message.arbitration_id, 0x123)
+		self.assertEqual(message.data, bytearray([1, 2, 3]))
+
+		#### Test step: Other messages are not forwarded
+		peer1.send(can.Message(arbitration_id = 0x200, is_extended_id = False))
+		peer1.send(can.Message(arbitration_id = 0x100, is_extended_id = True))
+		self.assertIsNone(peer2.recv(0.2))
+
+		#### Test step: No route in the opposite direction
+		peer2.send(can.Message(arbitration_id = 0x123, is_extended_id = False))
+		self.assertIsNone(peer1.recv(0.2))
+
+		self.assertEqual(route.forwarded, 1)
+		self.assertEqual(route.errors, 0)
+
+		#### Test step: Destination disconnected
+		examinee["can1"].disconnect()
+		peer1.send(can.Message(arbitration_id = 0x123, is_extended_id = False))
+		time.sleep(0.2)
+		self.assertEqual(route.errors, 1)
+
+		examinee.remove_route("can0", "can1", 0x100, 0x780)
+		self.assertEqual(examinee.routes, {})
+		self.assertFalse(examinee["can0"].subscribed(0x100, route))
+		with self.assertRaises(ValueError):
+			examinee.remove_route("can0", "can1", 0x100, 0x780)
+
+		#### Test step: Removing a channel removes its routes
+		examinee.add_route("can1", "can0", 0x100)
+		del examinee["can0"]
+		self.assertEqual(examinee.routes, {})
+
+		examinee.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+		peer1.shutdown()
+		peer2.shutdown()
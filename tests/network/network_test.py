@@ -1,10 +1,14 @@
 import can
 import canopenx
 import mock
+import threading
 import time
 import unittest
 
 from canopenx.node import Node
+from canopenx.objectdictionary import Variable
+from canopenx.objectdictionary.datatypes import UNSIGNED8, UNSIGNED16, UNSIGNED32
+from canopenx.sdo.abortcodes import SDO_PROTOCOL_TIMED_OUT, WRITE_OF_READ_ONLY_OBJECT
 
 
 class NetworkTestCase(unittest.TestCase):
@@ -260,3 +264,523 @@ class NetworkTestCase(unittest.TestCase):
 		self.assertFalse(network.subscribed(0x100, callback1))
 		self.assertFalse(network.subscribed(0x100, callback2))
 		self.assertFalse(network.subscribed(0x200, callback1))
+
+	def test_dispatch(self):
+		network = canopenx.Network()
+		cb1 = mock.Mock()
+		cb2 = mock.Mock()
+
+		network.subscribe(0x100, cb1)
+		network.subscribe((1 << 29) | 0x100, cb2)
+
+		#### Test step: Base frame is only dispatched to the base frame subscribers
+		message = can.Message(arbitration_id = 0x100, is_extended_id = False, data = b"\x01")
+		network.on_message_received(message)
+		cb1.assert_called_once_with(message)
+		cb2.assert_not_called()
+
+		#### Test step: Extended frame is only dispatched to the extended frame subscribers
+		cb1.reset_mock()
+		message = can.Message(arbitration_id = 0x100, is_extended_id = True, data = b"\x02")
+		network.on_message_received(message)
+		cb1.assert_not_called()
+		cb2.assert_called_once_with(message)
+
+		#### Test step: Frames without subscribers and invalid base frame identifiers are dropped
+		cb2.reset_mock()
+		network.on_message_received(can.Message(arbitration_id = 0x200, is_extended_id = False))
+		network.on_message_received(can.Message(arbitration_id = 0x200, is_extended_id = True))
+		network.on_message_received(can.Message(arbitration_id = 0x900, is_extended_id = False, check = False))
+		cb1.assert_not_called()
+		cb2.assert_not_called()
+
+		#### Test step: Exceptions in callbacks do not stop the dispatching
+		cb1.side_effect = Exception()
+		network.subscribe(0x100, cb2)
+		message = can.Message(arbitration_id = 0x100, is_extended_id = False, data = b"\x03")
+		network.on_message_received(message)
+		cb1.assert_called_once_with(message)
+		cb2.assert_called_once_with(message)
+
+		#### Test step: Unsubscribed callbacks are not called anymore
+		cb1.reset_mock()
+		cb2.reset_mock()
+		network.unsubscribe(0x100, cb1)
+		network.unsubscribe((1 << 29) | 0x100, cb2)
+		network.on_message_received(message)
+		network.on_message_received(can.Message(arbitration_id = 0x100, is_extended_id = True))
+		cb1.assert_not_called()
+		cb2.assert_called_once_with(message)
+
+	def test_filters(self):
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 0)
+		cb1 = mock.Mock()
+		cb2 = mock.Mock()
+
+		network = canopenx.Network()
+		network.subscribe(0x100, cb1)
+
+		#### Test step: Invalid budget
+		with self.assertRaises(ValueError):
+			network.connect(bus1, filters = True, filter_budget = 0)
+
+		#### Test step: Without filters enabled, the bus is not filtered
+		network.connect(bus1)
+		self.assertIsNone(bus1.filters)
+
+		#### Test step: Filters are applied on connect and updated on subscribe and unsubscribe
+		network.connect(bus1, filters = True)
+		self.assertEqual(bus1.filters, [{"can_id": 0x100, "can_mask": 0x7FF, "extended": False}])
+
+		network.subscribe(0x101, cb2)
+		self.assertEqual(bus1.filters, [{"can_id": 0x100, "can_mask": 0x7FE, "extended": False}])
+
+		network.subscribe((1 << 29) | 0x100, cb2)
+		self.assertEqual(bus1.filters, [{"can_id": 0x100, "can_mask": 0x7FE, "extended": False}, {"can_id": 0x100, "can_mask": 0x1FFFFFFF, "extended": True}])
+
+		network.unsubscribe(0x101, cb2)
+		network.unsubscribe((1 << 29) | 0x100, cb2)
+		self.assertEqual(bus1.filters, [{"can_id": 0x100, "can_mask": 0x7FF, "extended": False}])
+
+		#### Test step: Filtered frames are not passed to the network
+		network.subscribe(0x200, cb2)
+		bus2.send(can.Message(arbitration_id = 0x300, is_extended_id = False))
+		bus2.send(can.Message(arbitration_id = 0x200, is_extended_id = False))
+		time.sleep(0.1)
+		cb1.assert_not_called()
+		cb2.assert_called_once()
+
+		#### Test step: Budget exceeded, the filters get merged
+		network.connect(bus1, filters = True, filter_budget = 1)
+		self.assertEqual(bus1.filters, [{"can_id": 0x000, "can_mask": 0x4FF, "extended": False}])
+
+		#### Test step: Without subscriptions, the filters reject all frames but the extended frame with identifier 0
+		network.unsubscribe(0x100, cb1)
+		network.unsubscribe(0x200, cb2)
+		self.assertEqual(bus1.filters, [{"can_id": 0x00000000, "can_mask": 0x1FFFFFFF, "extended": True}])
+
+		network.connect(bus1, filters = True)
+		self.assertEqual(bus1.filters, [{"can_id": 0x00000000, "can_mask": 0x1FFFFFFF, "extended": True}])
+
+		#### Test step: Disconnect removes the filters
+		network.disconnect()
+		self.assertIsNone(bus1.filters)
+
+		bus1.shutdown()
+		bus2.shutdown()
+
+	def test_execution(self):
+		with self.assertRaises(ValueError):
+			canopenx.Network(workers = 0)
+		with self.assertRaises(ValueError):
+			canopenx.Network(queue_size = 0)
+
+		network = canopenx.Network(workers = 2, queue_size = 100)
+		cb1 = mock.Mock()
+		cb2 = mock.Mock()
+
+		#### Test step: Invalid parameters
+		with self.assertRaises(ValueError):
+			network.subscribe(0x100, cb1, execution = "x")
+		with self.assertRaises(ValueError):
+			network.subscribe(0x100, cb1, overflow = "x")
+		with self.assertRaises(ValueError):
+			network.subscribe(0x100, cb1, execution = "queue", queue_size = 0)
+		with self.assertRaises(ValueError):
+			network.subscribe(0x100, cb1, execution = "pool", queue_size = 10)
+		with self.assertRaises(ValueError):
+			network.subscribe_range(0x100, 0x101, cb1, execution = "pool", queue_size = 10)
+		self.assertFalse(network.subscribed(0x100, cb1))
+
+		#### Test step: Pool and dedicated queue keep the order of the messages
+		received1 = []
+		received2 = []
+		threads = set()
+
+		def callback1(message):
+			received1.append(message.data[0])
+			threads.add(threading.current_thread())
+
+		def callback2(message):
+			received2.append(message.data[0])
+			threads.add(threading.current_thread())
+
+		network.subscribe(0x100, callback1, execution = "pool")
+		network.subscribe(0x100, callback2, execution = "queue", overflow = "block", queue_size = 10)
+		network.subscribe(0x100, cb1)
+		self.assertTrue(network.subscribed(0x100, callback1))
+		self.assertTrue(network.subscribed(0x100, callback2))
+
+		for i in range(50):
+			network.on_message_received(can.Message(arbitration_id = 0x100, is_extended_id = False, data = [i]))
+		self.assertEqual(cb1.call_count, 50)
+
+		network.unsubscribe(0x100, callback1)
+		network.unsubscribe(0x100, callback2)
+		self.assertEqual(received1, list(range(50)))
+		self.assertEqual(received2, list(range(50)))
+		self.assertFalse(threading.current_thread() in threads)
+		self.assertEqual(len(threads), 2)
+
+		#### Test step: A range subscription has one worker for all blocks, the messages keep their order
+		received3 = []
+		threads3 = set()
+
+		def callback3(message):
+			received3.append(message.arbitration_id)
+			threads3.add(threading.current_thread())
+
+		network.subscribe_range(0x701, 0x77F, callback3, execution = "queue")
+		arbitration_ids = [0x701, 0x77F, 0x704, 0x740, 0x702, 0x710]
+		for arbitration_id in arbitration_ids:
+			network.on_message_received(can.Message(arbitration_id = arbitration_id, is_extended_id = False))
+
+		#### Test step: The worker is kept, until the last block is unsubscribed
+		network.unsubscribe_range(0x701, 0x70F, callback3)
+		network.on_message_received(can.Message(arbitration_id = 0x720, is_extended_id = False))
+		network.unsubscribe_range(0x710, 0x77F, callback3)
+		self.assertEqual(received3, arbitration_ids + [0x720])
+		self.assertEqual(len(threads3), 1)
+
+		#### Test step: Dropping messages while the queue is full
+		event = threading.Event()
+		started = threading.Event()
+
+		def blocker(message):
+			started.set()
+			event.wait()
+
+		network.subscribe(0x200, blocker, execution = "queue", overflow = "drop", queue_size = 1)
+		network.on_message_received(can.Message(arbitration_id = 0x200, is_extended_id = False))
+		started.wait()
+		network.on_message_received(can.Message(arbitration_id = 0x200, is_extended_id = False))
+		network.on_message_received(can.Message(arbitration_id = 0x200, is_extended_id = False))
+		event.set()
+		network.unsubscribe(0x200, blocker)
+
+	def test_transmit_queue(self):
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 0)
+
+		network = canopenx.Network()
+
+		with self.assertRaises(ValueError):
+			network.connect(bus1, transmit_queue_size = 0)
+
+		network.connect(bus1)
+		self.assertIsNone(network.transmit_queue)
+
+		network.connect(bus1, transmit_queue_size = 10)
+		self.assertIsNotNone(network.transmit_queue)
+
+		network.send(can.Message(arbitration_id = 0x100, is_extended_id = False, data = b"\x01"))
+		network.send(can.Message(arbitration_id = 0x100, is_extended_id = False, data = b"\x02"), timeout = 1.0)
+
+		message_recv = bus2.recv(1.0)
+		self.assertEqual(message_recv.data, b"\x01")
+		message_recv = bus2.recv(1.0)
+		self.assertEqual(message_recv.data, b"\x02")
+
+		network.disconnect()
+		self.assertIsNone(network.transmit_queue)
+
+		bus1.shutdown()
+		bus2.shutdown()
+
+	def test_send_many(self):
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 0)
+
+		network = canopenx.Network()
+		messages = [can.Message(arbitration_id = 0x100, is_extended_id = False, data = [i]) for i in range(10)]
+
+		#### Test step: Send on detached bus
+		with self.assertRaises(RuntimeError):
+			network.send_many(messages)
+
+		#### Test step: Send directly on the bus
+		network.connect(bus1)
+		self.assertEqual(network.send_many(iter(messages)), 10)
+		for i in range(10):
+			self.assertEqual(bus2.recv(1.0).data, bytes([i]))
+
+		#### Test step: Partial send, if the bus reports an error
+		bus = mock.Mock()
+		bus.send.side_effect = [None, None, can.CanError()]
+		network._bus = bus
+		self.assertEqual(network.send_many(messages), 2)
+		network._bus = bus1
+
+		#### Test step: Send with the transmit queue
+		network.connect(bus1, transmit_queue_size = 20)
+		self.assertEqual(network.send_many(messages), 10)
+		for i in range(10):
+			self.assertEqual(bus2.recv(1.0).data, bytes([i]))
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	def test_subscribe_range(self):
+		network = canopenx.Network()
+		cb1 = mock.Mock()
+		cb2 = mock.Mock()
+
+		#### Test step: Invalid ranges
+		with self.assertRaises(ValueError):
+			network.subscribe_range(0x77F, 0x701, cb1)
+		with self.assertRaises(ValueError):
+			network.subscribe_range(0x701, (1 << 29) | 0x77F, cb1)
+
+		#### Test step: All heartbeats
+		network.subscribe_range(0x701, 0x77F, cb1)
+		network.subscribe(0x705, cb2)
+		with self.assertRaises(ValueError):
+			network.subscribe_range(0x701, 0x77F, cb1)
+
+		for arbitration_id in [0x700, 0x701, 0x705, 0x77F, 0x780]:
+			network.on_message_received(can.Message(arbitration_id = arbitration_id, is_extended_id = False))
+		self.assertEqual([c.args[0].arbitration_id for c in cb1.call_args_list], [0x701, 0x705, 0x77F])
+		cb2.assert_called_once()
+
+		#### Test step: Extended frames do not match a base frame range
+		cb1.reset_mock()
+		network.on_message_received(can.Message(arbitration_id = 0x705, is_extended_id = True))
+		cb1.assert_not_called()
+
+		#### Test step: Unsubscribe
+		with self.assertRaises(ValueError):
+			network.unsubscribe_range(0x701, 0x77E, cb1)
+		network.unsubscribe_range(0x701, 0x77F, cb1)
+		with self.assertRaises(ValueError):
+			network.unsubscribe_range(0x701, 0x77F, cb1)
+
+		cb2.reset_mock()
+		network.on_message_received(can.Message(arbitration_id = 0x705, is_extended_id = False))
+		cb1.assert_not_called()
+		cb2.assert_called_once()
+
+		#### Test step: Extended frame range
+		network.subscribe_range((1 << 29) | 0x10000, (1 << 29) | 0x1FFFF, cb1)
+		network.subscribe((1 << 29) | 0x10005, cb2)
+		cb2.reset_mock()
+		for arbitration_id in [0x0FFFF, 0x10000, 0x10005, 0x1FFFF, 0x20000, 0x10000]:
+			network.on_message_received(can.Message(arbitration_id = arbitration_id, is_extended_id = True))
+		self.assertEqual([c.args[0].arbitration_id for c in cb1.call_args_list], [0x10000, 0x10005, 0x1FFFF, 0x10000])
+		cb2.assert_called_once()
+
+		cb1.reset_mock()
+		network.unsubscribe_range((1 << 29) | 0x10000, (1 << 29) | 0x1FFFF, cb1)
+		network.on_message_received(can.Message(arbitration_id = 0x10000, is_extended_id = True))
+		network.on_message_received(can.Message(arbitration_id = 0x10005, is_extended_id = True))
+		cb1.assert_not_called()
+		self.assertEqual(cb2.call_count, 2)
+
+	def test_subscribe_mask(self):
+		bus = can.Bus(interface = "virtual", channel = 0)
+		network = canopenx.Network()
+		cb1 = mock.Mock()
+		cb2 = mock.Mock()
+
+		network.connect(bus, filters = True)
+
+		#### Test step: All EMCY and heartbeats of node 5
+		network.subscribe_mask(0x005, 0x07F, cb1)
+		with self.assertRaises(ValueError):
+			network.subscribe_mask(0x085, 0x07F, cb1)
+		self.assertEqual(bus.filters, [{"can_id": 0x005, "can_mask": 0x07F, "extended": False}])
+
+		for arbitration_id in [0x085, 0x086, 0x705, 0x706]:
+			network.on_message_received(can.Message(arbitration_id = arbitration_id, is_extended_id = False))
+		self.assertEqual([c.args[0].arbitration_id for c in cb1.call_args_list], [0x085, 0x705])
+
+		#### Test step: Extended frames with pool execution
+		network.subscribe_mask((1 << 29) | 0x18FF0000, 0x1FFF0000, cb2, execution = "pool")
+		self.assertEqual(bus.filters, [{"can_id": 0x005, "can_mask": 0x07F, "extended": False}, {"can_id": 0x18FF0000, "can_mask": 0x1FFF0000, "extended": True}])
+		for arbitration_id in [0x18FF0001, 0x18FE0001, 0x18FF1234]:
+			network.on_message_received(can.Message(arbitration_id = arbitration_id, is_extended_id = True))
+
+		#### Test step: Unsubscribe
+		with self.assertRaises(ValueError):
+			network.unsubscribe_mask(0x006, 0x07F, cb1)
+		network.unsubscribe_mask(0x085, 0x07F, cb1)
+		network.unsubscribe_mask((1 << 29) | 0x18FF0000, 0x1FFF0000, cb2)
+		self.assertEqual([c.args[0].arbitration_id for c in cb2.call_args_list], [0x18FF0001, 0x18FF1234])
+
+		cb1.reset_mock()
+		network.on_message_received(can.Message(arbitration_id = 0x085, is_extended_id = False))
+		cb1.assert_not_called()
+
+		network.disconnect()
+		bus.shutdown()
+
+	def test_subscribe_mask_concurrent(self):
+		network = canopenx.Network()
+		cb1 = mock.Mock()
+		stop = threading.Event()
+
+		def change_subscriptions():
+			while not stop.is_set():
+				for i in range(16):
+					network.subscribe_mask((1 << 29) | (i << 8), 0x1FFFFF00, cb1)
+				for i in range(16):
+					network.unsubscribe_mask((1 << 29) | (i << 8), 0x1FFFFF00, cb1)
+
+		thread = threading.Thread(target = change_subscriptions)
+		thread.start()
+
+		#### Test step: Subscriptions change while extended frames are resolved in the receive thread
+		try:
+			for i in range(20000):
+				network.on_message_received(can.Message(arbitration_id = i & 0xFFFF, is_extended_id = True))
+		finally:
+			stop.set()
+			thread.join()
+
+		#### Test step: No stale entries are left after the subscriptions changed
+		cb1.reset_mock()
+		for i in range(0x1000):
+			network.on_message_received(can.Message(arbitration_id = i, is_extended_id = True))
+		cb1.assert_not_called()
+
+	def test_instrumentation(self):
+		network = canopenx.Network()
+		cb1 = mock.Mock()
+		cb2 = mock.Mock(side_effect = Exception())
+
+		network.subscribe(0x100, cb1)
+		network.subscribe_range(0x701, 0x77F, cb2, execution = "queue")
+
+		self.assertIsNone(network.instrumentation)
+		network.disable_instrumentation()
+
+		#### Test step: Enable the instrumentation for existing and new subscriptions
+		network.enable_instrumentation()
+		instrumentation = network.instrumentation
+		network.enable_instrumentation()
+		self.assertIs(network.instrumentation, instrumentation)
+		network.subscribe(0x200, cb1, execution = "pool")
+
+		network.on_message_received(can.Message(arbitration_id = 0x100, is_extended_id = False, data = b"\x01\x02"))
+		network.on_message_received(can.Message(arbitration_id = 0x200, is_extended_id = False, data = b"\x01"))
+		network.on_message_received(can.Message(arbitration_id = 0x705, is_extended_id = False, data = b"\x05"))
+		network.on_message_received(can.Message(arbitration_id = 0x300, is_extended_id = False))
+
+		network.unsubscribe(0x200, cb1)
+		network.unsubscribe_range(0x701, 0x77F, cb2)
+		self.assertEqual(cb1.call_count, 2)
+		cb2.assert_called_once()
+
+		snapshot = network.instrumentation.snapshot()
+		self.assertEqual(snapshot["frames"], {0x100: {"count": 1, "bytes": 2}, 0x200: {"count": 1, "bytes": 1}, 0x705: {"count": 1, "bytes": 1}, 0x300: {"count": 1, "bytes": 0}})
+		records = {(record["cob_id"], record["mask"]): record for record in snapshot["callbacks"]}
+		self.assertEqual(records[(0x100, 0x7FF)]["calls"], 1)
+		self.assertEqual(records[(0x200, 0x7FF)]["calls"], 1)
+		# The blocks of a range subscription share the counters, which are keyed by the first block
+		self.assertEqual(len(records), 3)
+		self.assertEqual(records[(0x701, 0x7FF)]["calls"], 1)
+		self.assertEqual(records[(0x701, 0x7FF)]["exceptions"], 1)
+		self.assertEqual(sum(snapshot["latency"].values()), 3)
+
+		#### Test step: Disable the instrumentation
+		network.disable_instrumentation()
+		self.assertIsNone(network.instrumentation)
+		network.on_message_received(can.Message(arbitration_id = 0x100, is_extended_id = False))
+		self.assertEqual(cb1.call_count, 3)
+		self.assertEqual(instrumentation.snapshot()["frames"][0x100]["count"], 1)
+
+	def test_poll(self):
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 0)
+		cb1 = mock.Mock()
+
+		network = canopenx.Network()
+		network.subscribe(0x100, cb1)
+
+		#### Test step: Poll on detached bus
+		with self.assertRaises(RuntimeError):
+			network.poll()
+
+		#### Test step: Poll with notifier
+		network.connect(bus1)
+		with self.assertRaises(RuntimeError):
+			network.poll()
+
+		#### Test step: Poll without notifier
+		network.connect(bus1, notifier = False)
+		self.assertEqual(network.poll(), 0)
+		self.assertEqual(network.poll(0.01), 0)
+
+		for i in range(5):
+			bus2.send(can.Message(arbitration_id = 0x100, is_extended_id = False, data = [i]))
+		bus2.send(can.Message(arbitration_id = 0x200, is_extended_id = False))
+		time.sleep(0.1)
+		cb1.assert_not_called()
+
+		self.assertEqual(network.poll(0.1, max_frames = 2), 2)
+		self.assertEqual(cb1.call_count, 2)
+		self.assertEqual(network.poll(0.1), 4)
+		self.assertEqual([c.args[0].data[0] for c in cb1.call_args_list], list(range(5)))
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	def test_read_write_many(self):
+		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		network1 = canopenx.Network()
+		network1.connect(bus1)
+		network2 = canopenx.Network()
+		network2.connect(bus2)
+
+		def make_dictionary(device_type):
+			dictionary = canopenx.ObjectDictionary()
+			dictionary.add(Variable("device type", 0x1000, 0x00, UNSIGNED32, "ro", device_type))
+			dictionary.add(Variable("heartbeat time", 0x1017, 0x00, UNSIGNED16, "rw"))
+			return dictionary
+
+		for node_id in range(1, 6):
+			network2.add(canopenx.LocalNode(node_id, make_dictionary(0x20000 + node_id)))
+			network1.add(canopenx.RemoteNode(node_id, make_dictionary(0)))
+		network1.add(canopenx.RemoteNode(6, make_dictionary(0)))
+		network1.add(Node(7, make_dictionary(0)))
+
+		#### Test step: Read from all nodes with a SDO client, the missing node has aborted results
+		results = network1.read_many([(0x1000, 0x00), (0x1017, 0x00)]).result(5)
+		self.assertEqual(sorted(results), [1, 2, 3, 4, 5, 6])
+		for node_id in range(1, 6):
+			self.assertEqual([result.value for result in results[node_id]], [0x20000 + node_id, 0])
+		self.assertEqual([result.code for result in results[6]], [SDO_PROTOCOL_TIMED_OUT, SDO_PROTOCOL_TIMED_OUT])
+
+		#### Test step: Write to selected nodes
+		results = network1.write_many({(0x1017, 0x00): 100, (0x1000, 0x00): 0}, [1, 2]).result(5)
+		self.assertEqual(sorted(results), [1, 2])
+		for node_id in [1, 2]:
+			self.assertEqual([result.code for result in results[node_id]], [None, WRITE_OF_READ_ONLY_OBJECT])
+			self.assertEqual(network2[node_id].values.get(0x1017, 0x00), 100)
+		self.assertEqual(network2[3].values.get(0x1017, 0x00), 0)
+
+		#### Test step: An entry, which is invalid for one node, starts no transfer to any node
+		network1[1].dictionary.add(Variable("value", 0x2000, 0x00, UNSIGNED32, "rw"))
+		network1[3].dictionary.add(Variable("value", 0x2000, 0x00, UNSIGNED8, "rw"))
+		with self.assertRaises(ValueError):
+			network1.write_many({(0x1017, 0x00): 200, (0x2000, 0x00): 300}, [1, 3])
+		with self.assertRaises(KeyError):
+			network1.write_many({(0x1017, 0x00): 200, (0x2000, 0x00): 1}, [1, 2])
+		with self.assertRaises(KeyError):
+			network1.read_many([(0x1017, 0x00), (0x2000, 0x00)], [1, 2])
+		time.sleep(0.1)
+		self.assertEqual(network2[1].values.get(0x1017, 0x00), 100)
+		self.assertEqual(network2[3].values.get(0x1017, 0x00), 0)
+
+		with self.assertRaises(KeyError):
+			network1.read_many([(0x1000, 0x00)], [8])
+		with self.assertRaises(ValueError):
+			network1.read_many([(0x1000, 0x00)], [7])
+
+		network1.disconnect()
+		network2.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
@@ -0,0 +1,69 @@
+import can
+import mock
+import os
+import tempfile
+import time
+import unittest
+
+from canopenx import Network
+from canopenx.network import Replay
+
+
+class ReplayTestCase(unittest.TestCase):
+	def test_init(self):
+		network = Network()
+		examinee = Replay(network)
+
+		self.assertIs(examinee.network, network)
+		self.assertEqual(examinee.frames, 0)
+		self.assertEqual(examinee.duration, 0.0)
+		self.assertEqual(examinee.frames_per_second, 0.0)
+
+		with self.assertRaises(ValueError):
+			examinee.run([], speed = 0)
+
+	def test_iterable(self):
+		network = Network()
+		cb1 = mock.Mock()
+		network.subscribe(0x100, cb1)
+		examinee = Replay(network)
+
+		messages = [can.Message(timestamp = i, arbitration_id = 0x100, is_extended_id = False, data = [i]) for i in range(10)]
+		messages.insert(5, can.Message(timestamp = 5, is_error_frame = True))
+
+		self.assertEqual(examinee.run(iter(messages)), 10)
+		self.assertEqual(examinee.frames, 10)
+		self.assertGreater(examinee.frames_per_second, 0.0)
+		self.assertEqual([c.args[0].data[0] for c in cb1.call_args_list], list(range(10)))
+
+	def test_realtime(self):
+		network = Network()
+		cb1 = mock.Mock()
+		network.subscribe(0x100, cb1)
+		examinee = Replay(network)
+
+		messages = [can.Message(timestamp = 100.0 + i * 0.1, arbitration_id = 0x100, is_extended_id = False) for i in range(3)]
+
+		examinee.run(messages, realtime = True)
+		self.assertGreaterEqual(examinee.duration, 0.2)
+
+		examinee.run(messages, realtime = True, speed = 4.0)
+		self.assertGreaterEqual(examinee.duration, 0.05)
+		self.assertLess(examinee.duration, 0.2)
+		self.assertEqual(cb1.call_count, 6)
+
+	def test_log_file(self):
+		network = Network()
+		cb1 = mock.Mock()
+		network.subscribe(0x100, cb1)
+		examinee = Replay(network)
+
+		with tempfile.TemporaryDirectory() as directory:
+			filename = os.path.join(directory, "trace.asc")
+			with can.Logger(filename) as logger:
+				for i in range(10):
+					logger.on_message_received(can.Message(timestamp = time.time(), arbitration_id = 0x100 + i % 2, is_extended_id = False, data = [i]))
+
+			self.assertEqual(examinee.run(filename), 10)
+
+		self.assertEqual([c.args[0].data[0] for c in cb1.call_args_list], [0, 2, 4, 6, 8])
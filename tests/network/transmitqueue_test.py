@@ -0,0 +1,132 @@
+import can
+import mock
+import threading
+import unittest
+
+from canopenx.network.transmitqueue import priority, TransmitQueue
+
+
+class TransmitQueueTestCase(unittest.TestCase):
+	def test_priority(self):
+		nmt = can.Message(arbitration_id = 0x000, is_extended_id = False)
+		sync = can.Message(arbitration_id = 0x080, is_extended_id = False)
+		sdo = can.Message(arbitration_id = 0x601, is_extended_id = False)
+		extended_low = can.Message(arbitration_id = 0x00000001, is_extended_id = True)
+		extended_sdo = can.Message(arbitration_id = 0x601 << 18, is_extended_id = True)
+
+		self.assertLess(priority(nmt), priority(sync))
+		self.assertLess(priority(sync), priority(sdo))
+		self.assertLess(priority(nmt), priority(extended_low))
+		self.assertLess(priority(extended_low), priority(sync))
+		self.assertLess(priority(sdo), priority(extended_sdo))
+
+	def test_init(self):
+		bus = mock.Mock()
+		with self.assertRaises(ValueError):
+			TransmitQueue(bus, queue_size = 0)
+		with self.assertRaises(ValueError):
+			TransmitQueue(bus, retries = -1)
+
+	def test_order(self):
+		bus = mock.Mock()
+		event = threading.Event()
+		started = threading.Event()
+
+		def send(message):
+			if message.arbitration_id == 0x7FF:
+				started.set()
+				event.wait()
+
+		bus.send.side_effect = send
+		examinee = TransmitQueue(bus, queue_size = 10)
+
+		#### Test step: Block the writer, queue messages and check the order of the sent messages
+		examinee.put(can.Message(arbitration_id = 0x7FF, is_extended_id = False))
+		started.wait()
+		for arbitration_id in [0x601, 0x602, 0x080, 0x000]:
+			examinee.put(can.Message(arbitration_id = arbitration_id, is_extended_id = False))
+		event.set()
+		examinee.stop()
+
+		sent = [c.args[0].arbitration_id for c in bus.send.call_args_list]
+		self.assertEqual(sent, [0x7FF, 0x000, 0x080, 0x601, 0x602])
+
+	def test_full(self):
+		bus = mock.Mock()
+		event = threading.Event()
+		started = threading.Event()
+
+		def send(message):
+			started.set()
+			event.wait()
+
+		bus.send.side_effect = send
+		examinee = TransmitQueue(bus, queue_size = 1)
+
+		examinee.put(can.Message(arbitration_id = 0x100, is_extended_id = False))
+		started.wait()
+		examinee.put(can.Message(arbitration_id = 0x100, is_extended_id = False), 0)
+		with self.assertRaises(RuntimeError):
+			examinee.put(can.Message(arbitration_id = 0x100, is_extended_id = False), 0)
+		with self.assertRaises(RuntimeError):
+			examinee.put(can.Message(arbitration_id = 0x100, is_extended_id = False), 0.01)
+		event.set()
+		examinee.stop()
+
+		self.assertEqual(examinee.statistics(), {0x100: {"queued": 2, "sent": 2, "retries": 0, "errors": 0}})
+
+	def test_put_many(self):
+		bus = mock.Mock()
+		event = threading.Event()
+		started = threading.Event()
+
+		def send(message):
+			if message.arbitration_id == 0x7FF:
+				started.set()
+				event.wait()
+
+		bus.send.side_effect = send
+		examinee = TransmitQueue(bus, queue_size = 3)
+
+		#### Test step: Block the writer, the batch is queued until the queue is full
+		examinee.put(can.Message(arbitration_id = 0x7FF, is_extended_id = False))
+		started.wait()
+		messages = [can.Message(arbitration_id = arbitration_id, is_extended_id = False) for arbitration_id in [0x602, 0x601, 0x080, 0x000]]
+		self.assertEqual(examinee.put_many(messages, 0), 3)
+		self.assertEqual(examinee.put_many(messages[3:], 0.01), 0)
+
+		#### Test step: Waiting for space, the writer is woken up for the queued messages
+		event.set()
+		self.assertEqual(examinee.put_many(messages[3:] * 5), 5)
+
+		#### Test step: The iterable is consumed before the queue is locked, so it may use the queue itself
+		def generate():
+			examinee.put(can.Message(arbitration_id = 0x100, is_extended_id = False))
+			yield can.Message(arbitration_id = 0x000, is_extended_id = False)
+
+		self.assertEqual(examinee.put_many(generate()), 1)
+		examinee.stop()
+
+		sent = [c.args[0].arbitration_id for c in bus.send.call_args_list]
+		self.assertEqual(sent[:4], [0x7FF, 0x080, 0x601, 0x602])
+		self.assertEqual(len(sent), 11)
+		self.assertEqual(examinee.statistics()[0x000], {"queued": 6, "sent": 6, "retries": 0, "errors": 0})
+
+	def test_retry(self):
+		bus = mock.Mock()
+		# Base frames succeed on the third attempt, extended frames fail always
+		attempts = []
+
+		def send(message):
+			attempts.append(message)
+			if message.is_extended_id or len([m for m in attempts if not m.is_extended_id]) < 3:
+				raise can.CanError()
+
+		bus.send.side_effect = send
+		examinee = TransmitQueue(bus, retries = 2, retry_delay = 0)
+
+		examinee.put(can.Message(arbitration_id = 0x100, is_extended_id = False))
+		examinee.put(can.Message(arbitration_id = 0x100, is_extended_id = True))
+		examinee.stop()
+
+		self.assertEqual(examinee.statistics(), {0x100: {"queued": 1, "sent": 1, "retries": 2, "errors": 0}, (1 << 29) | 0x100: {"queued": 1, "sent": 0, "retries": 2, "errors": 1}})
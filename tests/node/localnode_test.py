@@ -2,7 +2,7 @@ import unittest
 
 from canopenx import ObjectDictionary
 from canopenx.nmt.states import INITIALIZING, OPERATIONAL
-from canopenx.node import LocalNode
+from canopenx.node import LocalNode, ValueStore
 
 
 class LocalNodeTestCase(unittest.TestCase):
@@ -12,6 +12,8 @@ class LocalNodeTestCase(unittest.TestCase):
 		node = LocalNode(node_id, dictionary)
 		self.assertEqual(node.id, node_id)
 		self.assertEqual(node.dictionary, dictionary)
+		self.assertIsInstance(node.values, ValueStore)
+		self.assertEqual(len(node.values), 0)
 
 	def test_nmt(self):
 		dictionary = ObjectDictionary()
@@ -107,3 +107,48 @@ class NodeTestCase(unittest.TestCase):
 		dictionary.add(Variable("variable", 0x6000, 0x00, UNSIGNED32))
 
 		var = examinee["variable"]
+
+	def test_getitem(self):
+		dictionary = canopenx.ObjectDictionary()
+		record = Record("record", 0x1018)
+		record.add(Variable("count", 0x1018, 0x00, UNSIGNED8))
+		record.add(Variable("vendor", 0x1018, 0x01, UNSIGNED32))
+		dictionary.add(record)
+		dictionary.add(Variable("variable", 0x1000, 0x00, UNSIGNED32))
+		node = Node(1, dictionary)
+
+		#### Test step: The proxies are cached and shared by all keys of an item
+		proxy = node["record"]
+		self.assertIs(node["record"], proxy)
+		self.assertIs(node[0x1018], proxy)
+		self.assertIs(proxy["vendor"], proxy[0x01])
+		self.assertIs(node[(0x1018, 0x01)], proxy["vendor"])
+		self.assertIs(node["record.vendor"], proxy["vendor"])
+		self.assertIs(node[0x1000], node["variable"])
+		self.assertIs(node[(0x1000, 0x00)], node["variable"])
+		self.assertEqual(node[(0x1018, 0x01)].name, "vendor")
+
+		with self.assertRaises(KeyError):
+			node[0x2000]
+		with self.assertRaises(KeyError):
+			node[(0x1018, 0x02)]
+		with self.assertRaises(KeyError):
+			node[(0x1000, 0x01)]
+		with self.assertRaises(KeyError):
+			node[(0x1018,)]
+		with self.assertRaises(KeyError):
+			node["record.x"]
+		with self.assertRaises(KeyError):
+			node["variable.x"]
+
+		#### Test step: The proxies are renewed, if the object dictionary changes
+		del record["vendor"]
+		with self.assertRaises(KeyError):
+			node[(0x1018, 0x01)]
+		record.add(Variable("vendor", 0x1018, 0x01, UNSIGNED32, "ro"))
+		self.assertEqual(node[(0x1018, 0x01)].access_type, "ro")
+		self.assertIsNot(node["record"], proxy)
+
+		del dictionary["variable"]
+		with self.assertRaises(KeyError):
+			node["variable"]
@@ -1,6 +1,8 @@
 import unittest
 
 from canopenx import ObjectDictionary
+from canopenx.objectdictionary import Variable
+from canopenx.objectdictionary.datatypes import UNSIGNED16
 from canopenx.nmt.states import INITIALIZING
 from canopenx.node import RemoteNode
 
@@ -19,3 +21,14 @@ class RemoteNodeTestCase(unittest.TestCase):
 		node = RemoteNode(100, dictionary)
 
 		self.assertEqual(node.nmt.state, INITIALIZING)
+
+	def test_sdo_cache(self):
+		dictionary = ObjectDictionary()
+		dictionary.add(Variable("constant", 0x1000, 0x00, UNSIGNED16, "const"))
+		node = RemoteNode(100, dictionary)
+
+		#### Test step: A reset of the node clears the cache
+		node.sdo.cache.put(dictionary[0x1000], b"\x01\x02", node.sdo.cache.generation)
+		self.assertEqual(len(node.sdo.cache), 1)
+		node.nmt.notify("reset")
+		self.assertEqual(len(node.sdo.cache), 0)
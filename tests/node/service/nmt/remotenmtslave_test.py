@@ -150,3 +150,45 @@ class RemoteNMTSlaveTestCase(unittest.TestCase):
 		network.disconnect()
 		bus1.shutdown()
 		bus2.shutdown()
+
+	def test_reset(self):
+		bus1 = can.Bus(interface = "virtual", channel = 0)
+		bus2 = can.Bus(interface = "virtual", channel = 0)
+		network = Network()
+		dictionary = ObjectDictionary()
+		node = Node(10, dictionary)
+		examinee = RemoteNMTSlave()
+		resets = []
+
+		network.connect(bus1)
+		network.add(node)
+		examinee.attach(node)
+		examinee.add_callback("reset", lambda: resets.append(True))
+
+		#### Test step: Commands without reset
+		examinee.state = OPERATIONAL
+		examinee.state = PRE_OPERATIONAL
+		self.assertEqual(len(resets), 0)
+
+		#### Test step: Reset node and reset communication
+		examinee.state = INITIALIZING
+		examinee.reset_communication()
+		self.assertEqual(len(resets), 2)
+
+		#### Test step: Boot-up message
+		message = can.Message(arbitration_id = 0x70A, is_extended_id = False, data = b"\x00")
+		bus2.send(message)
+		time.sleep(0.01)
+
+		self.assertEqual(len(resets), 3)
+
+		#### Test step: Heartbeat message
+		message = can.Message(arbitration_id = 0x70A, is_extended_id = False, data = b"\x05")
+		bus2.send(message)
+		time.sleep(0.01)
+
+		self.assertEqual(len(resets), 3)
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
@@ -0,0 +1,37 @@
+import mock
+import threading
+import unittest
+
+from canopenx.node.service.sdo.scheduler import Scheduler
+
+
+class SchedulerTestCase(unittest.TestCase):
+	def test_call_later(self):
+		examinee = Scheduler()
+		calls = []
+		threads = set()
+		done = threading.Event()
+
+		def call(name):
+			calls.append(name)
+			threads.add(threading.current_thread())
+
+		#### Test step: The calls are executed in the order of their deadlines, errors of the callbacks are ignored
+		examinee.call_later(0.1, call, "c")
+		examinee.call_later(0.05, mock.Mock(side_effect = Exception()))
+		examinee.call_later(0.0, call, "a")
+		examinee.call_later(0.05, call, "b")
+		examinee.call_later(0.15, done.set)
+		self.assertTrue(done.wait(1.0))
+		self.assertEqual(calls, ["a", "b", "c"])
+
+		#### Test step: All calls share one thread
+		count = threading.active_count()
+		done.clear()
+		for i in range(100):
+			examinee.call_later(0.01, call, i)
+		examinee.call_later(0.05, done.set)
+		self.assertEqual(threading.active_count(), count)
+		self.assertTrue(done.wait(1.0))
+		self.assertEqual(calls[3:], list(range(100)))
+		self.assertEqual(len(threads), 1)
@@ -0,0 +1,80 @@
+import time
+import unittest
+
+from canopenx.objectdictionary import Variable
+from canopenx.objectdictionary.datatypes import UNSIGNED16
+from canopenx.node.service.sdo import SDOCache
+
+
+class SDOCacheTestCase(unittest.TestCase):
+	def test_generation(self):
+		examinee = SDOCache()
+		variable = Variable("constant", 0x1000, 0x00, UNSIGNED16, "const")
+
+		#### Test step: Data of an upload, which was started before the cache was cleared, is not stored
+		generation = examinee.generation
+		examinee.clear()
+		self.assertEqual(examinee.generation, generation + 1)
+		examinee.put(variable, b"\x01\x02", generation)
+		self.assertNotIn((0x1000, 0x00), examinee)
+
+		examinee.put(variable, b"\x01\x02", examinee.generation)
+		self.assertIn((0x1000, 0x00), examinee)
+
+	def test_init(self):
+		examinee = SDOCache()
+		self.assertEqual(examinee.ttl, 0.0)
+		self.assertEqual(len(examinee), 0)
+		self.assertEqual(examinee.hits, 0)
+		self.assertEqual(examinee.misses, 0)
+		examinee = SDOCache(1)
+		self.assertEqual(examinee.ttl, 1.0)
+		examinee.ttl = 2
+		self.assertEqual(examinee.ttl, 2.0)
+		with self.assertRaises(ValueError):
+			SDOCache(-1)
+		with self.assertRaises(ValueError):
+			examinee.ttl = -1
+
+	def test_policy(self):
+		examinee = SDOCache(0.05)
+		constant = Variable("constant", 0x1000, 0x00, UNSIGNED16, "const")
+		read_only = Variable("read only", 0x1001, 0x00, UNSIGNED16, "ro")
+
+		for access_type in ["rw", "wo"]:
+			#### Test step: rw and wo entries are never cached
+			with self.subTest("Not cacheable", access_type = access_type):
+				variable = Variable("variable", 0x2000, 0x00, UNSIGNED16, access_type)
+				self.assertFalse(examinee.cacheable(variable))
+				examinee.put(variable, b"\x01\x02", examinee.generation)
+				self.assertIsNone(examinee.get(variable))
+				self.assertEqual((examinee.hits, examinee.misses), (0, 0))
+
+		#### Test step: ro entries are not cached without a time to live
+		self.assertFalse(SDOCache().cacheable(read_only))
+
+		#### Test step: Miss and hit
+		self.assertIsNone(examinee.get(constant))
+		examinee.put(constant, b"\x01\x02", examinee.generation)
+		examinee.put(read_only, b"\x03\x04", examinee.generation)
+		self.assertEqual(examinee.get(constant), b"\x01\x02")
+		self.assertEqual(examinee.get(read_only), b"\x03\x04")
+		self.assertEqual((examinee.hits, examinee.misses), (2, 1))
+
+		#### Test step: ro entries expire, const entries do not
+		time.sleep(0.1)
+		self.assertIsNone(examinee.get(read_only))
+		self.assertEqual(examinee.get(constant), b"\x01\x02")
+		self.assertEqual((examinee.hits, examinee.misses), (3, 2))
+
+		#### Test step: Discard and clear
+		examinee.put(read_only, b"\x03\x04", examinee.generation)
+		examinee.discard(0x1000, 0x00)
+		examinee.discard(0x3000, 0x00)
+		self.assertNotIn((0x1000, 0x00), examinee)
+		self.assertIn((0x1001, 0x00), examinee)
+		examinee.clear()
+		self.assertEqual(len(examinee), 0)
+
+		examinee.reset_statistics()
+		self.assertEqual((examinee.hits, examinee.misses), (0, 0))
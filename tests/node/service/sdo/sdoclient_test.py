@@ -1,13 +1,313 @@
+import asyncio
 import can
+import struct
+import time
 import unittest
 
-from canopenx import Network, Node
-from canopenx.objectdictionary import ObjectDictionary, Variable
+from canopenx import LocalNode, Network, Node
+from canopenx.objectdictionary import Domain, ObjectDictionary, Variable
 from canopenx.objectdictionary.datatypes import UNSIGNED16, UNSIGNED64
-from canopenx.node.service.sdo import SDOClient
+from canopenx.node.service.sdo import SDOAbortedError, SDOClient, SDOFuture
+from canopenx.sdo.abortcodes import *
 
 
 class SDOClientTestCase(unittest.TestCase):
+	def __receive(self, bus, node_id = 10):
+		message = bus.recv(1)
+		self.assertIsNotNone(message)
+		self.assertEqual(message.arbitration_id, 0x600 + node_id)
+		self.assertEqual(message.dlc, 8)
+		return bytes(message.data)
+
+	def __respond(self, bus, data, node_id = 10):
+		bus.send(can.Message(arbitration_id = 0x580 + node_id, is_extended_id = False, data = data))
+
+	def test_abort(self):
+		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		network = Network()
+		network.connect(bus1)
+
+		node = ServiceTestNode(timeout = 0.1)
+		network.add(node)
+
+		#### Test step: Abort by the server
+		future = node.sdo.upload(0x1000, 0x00)
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHB4x", 0x40, 0x1000, 0x00))
+		self.__respond(bus2, struct.pack("<BHBL", 0x80, 0x1000, 0x00, OBJECT_DOES_NOT_EXIST))
+		with self.assertRaises(SDOAbortedError) as context:
+			future.result(1)
+		self.assertEqual(context.exception.code, OBJECT_DOES_NOT_EXIST)
+		self.assertEqual(context.exception.index, 0x1000)
+		self.assertEqual(context.exception.subindex, 0x00)
+
+		#### Test step: Timeout, the client sends an abort
+		future = node.sdo.upload(0x1000, 0x00)
+		self.__receive(bus2)
+		with self.assertRaises(SDOAbortedError) as context:
+			future.result(1)
+		self.assertEqual(context.exception.code, SDO_PROTOCOL_TIMED_OUT)
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x1000, 0x00, SDO_PROTOCOL_TIMED_OUT))
+
+		#### Test step: Wrong server command specifier
+		future = node.sdo.download(0x1000, 0x00, b"\x01\x02")
+		self.__receive(bus2)
+		self.__respond(bus2, struct.pack("<BHB4x", 0x40, 0x1000, 0x00))
+		with self.assertRaises(SDOAbortedError) as context:
+			future.result(1)
+		self.assertEqual(context.exception.code, COMMAND_SPECIFIER_NOT_VALID)
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x1000, 0x00, COMMAND_SPECIFIER_NOT_VALID))
+
+		#### Test step: Toggle bit not alternated
+		future = node.sdo.upload(0x2000, 0x00)
+		self.__receive(bus2)
+		self.__respond(bus2, struct.pack("<BHBL", 0x41, 0x2000, 0x00, 14))
+		self.assertEqual(self.__receive(bus2), b"\x60" + bytes(7))
+		self.__respond(bus2, b"\x00" + bytes(7))
+		self.assertEqual(self.__receive(bus2), b"\x70" + bytes(7))
+		self.__respond(bus2, b"\x00" + bytes(7))
+		with self.assertRaises(SDOAbortedError) as context:
+			future.result(1)
+		self.assertEqual(context.exception.code, TOGGLE_BIT_NOT_ALTERNATED)
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	def test_asyncio(self):
+		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus3 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		network1 = Network()
+		network1.connect(bus1)
+		network2 = Network()
+		network2.connect(bus2)
+
+		nodes = []
+		for node_id in range(1, 6):
+			dictionary = ObjectDictionary()
+			dictionary.add(Variable("short", 0x1000, 0x00, UNSIGNED16, "rw", node_id))
+			dictionary.add(Domain("program", 0x1F50))
+			network2.add(LocalNode(node_id, dictionary))
+			node = ServiceTestNode(node_id)
+			network1.add(node)
+			nodes.append(node)
+		node = ServiceTestNode(20)
+		network1.add(node)
+
+		#### Test step: Concurrent transfers to several nodes from one event loop
+		async def read_all():
+			return await asyncio.gather(*[node.sdo.upload(0x1000, 0x00) for node in nodes])
+
+		self.assertEqual(asyncio.run(read_all()), [struct.pack("<H", node.id) for node in nodes])
+
+		async def write_read(node):
+			await node.sdo.download(0x1F50, 0x00, bytes(100), block = True)
+			return await node.sdo.upload(0x1F50, 0x00)
+
+		async def write_read_all():
+			return await asyncio.gather(*[write_read(node) for node in nodes])
+
+		self.assertEqual(asyncio.run(write_read_all()), [bytes(100)] * len(nodes))
+
+		#### Test step: Abort by the server
+		async def read_unknown():
+			await nodes[0].sdo.upload(0x3000, 0x00)
+
+		with self.assertRaises(SDOAbortedError) as context:
+			asyncio.run(read_unknown())
+		self.assertEqual(context.exception.code, OBJECT_DOES_NOT_EXIST)
+
+		#### Test step: The timeout of the task cancels the transfer and sends an abort
+		async def read_timeout():
+			await asyncio.wait_for(node.sdo.upload(0x1000, 0x00), 0.05)
+
+		while bus3.recv(0) is not None:
+			pass
+		with self.assertRaises(asyncio.TimeoutError):
+			asyncio.run(read_timeout())
+		self.assertEqual(bytes(bus3.recv(1).data), struct.pack("<BHB4x", 0x40, 0x1000, 0x00))
+		self.assertEqual(bytes(bus3.recv(1).data), struct.pack("<BHBL", 0x80, 0x1000, 0x00, GENERAL_ERROR))
+
+		network1.disconnect()
+		network2.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+		bus3.shutdown()
+
+	def test_block_transfer(self):
+		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		network1 = Network()
+		network1.connect(bus1)
+		network2 = Network()
+		network2.connect(bus2)
+
+		dictionary = ObjectDictionary()
+		dictionary.add(Variable("short", 0x1000, 0x00, UNSIGNED16))
+		dictionary.add(Domain("program", 0x1F50))
+		server = LocalNode(10, dictionary)
+		network2.add(server)
+
+		node = ServiceTestNode(block_size = 4, threshold = 8)
+		network1.add(node)
+
+		for size in [0, 1, 7, 8, 9, 27, 28, 29, 1000]:
+			data = bytes(i & 0xFF for i in range(size))
+			#### Test step: Block download and upload, data up to the threshold uses the expedited or segmented transfer
+			with self.subTest("Block transfer", size = size):
+				self.assertIsNone(node.sdo.download(0x1F50, 0x00, data, block = True).result(1))
+				self.assertEqual(bytes(server.values.read(0x1F50, 0x00)), data)
+				self.assertEqual(node.sdo.upload(0x1F50, 0x00, block = True).result(1), data)
+
+		#### Test step: Block download to a variable with wrong length
+		with self.assertRaises(SDOAbortedError) as context:
+			node.sdo.download(0x1000, 0x00, bytes(10), block = True).result(1)
+		self.assertEqual(context.exception.code, DATA_TYPE_LENGTH_MISMATCH)
+
+		#### Test step: Block upload of an unknown entry
+		with self.assertRaises(SDOAbortedError) as context:
+			node.sdo.upload(0x2000, 0x00, block = True).result(1)
+		self.assertEqual(context.exception.code, OBJECT_DOES_NOT_EXIST)
+
+		network1.disconnect()
+		network2.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	def test_cache(self):
+		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		network1 = Network()
+		network1.connect(bus1)
+		network2 = Network()
+		network2.connect(bus2)
+
+		dictionary = ObjectDictionary()
+		dictionary.add(Variable("constant", 0x1008, 0x00, UNSIGNED16, "const", 0x1234))
+		dictionary.add(Variable("read only", 0x1009, 0x00, UNSIGNED16, "ro", 0x4321))
+		dictionary.add(Variable("short", 0x1000, 0x00, UNSIGNED16, "rw", 0x5678))
+		server = LocalNode(10, dictionary)
+		network2.add(server)
+
+		node = ServiceTestNode(ttl = 0.1)
+		node.dictionary.add(Variable("constant", 0x1008, 0x00, UNSIGNED16, "const"))
+		node.dictionary.add(Variable("read only", 0x1009, 0x00, UNSIGNED16, "ro"))
+		network1.add(node)
+
+		#### Test step: The first upload of a const entry is a miss, the following uploads are hits
+		self.assertEqual(node.sdo.upload(0x1008, 0x00).result(1), b"\x34\x12")
+		server.values.write(0x1008, 0x00, b"\x00\x00")
+		self.assertEqual(node.sdo.upload(0x1008, 0x00).result(1), b"\x34\x12")
+		self.assertEqual((node.sdo.cache.hits, node.sdo.cache.misses), (1, 1))
+		self.assertIn((0x1008, 0x00), node.sdo.cache)
+
+		#### Test step: A ro entry is cached for the time to live
+		self.assertEqual(node.sdo.upload(0x1009, 0x00).result(1), b"\x21\x43")
+		server.values.write(0x1009, 0x00, b"\x00\x00")
+		self.assertEqual(node.sdo.upload(0x1009, 0x00).result(1), b"\x21\x43")
+		time.sleep(0.15)
+		self.assertEqual(node.sdo.upload(0x1009, 0x00).result(1), b"\x00\x00")
+		self.assertEqual((node.sdo.cache.hits, node.sdo.cache.misses), (2, 3))
+
+		#### Test step: A rw entry is never cached and not counted
+		self.assertEqual(node.sdo.upload(0x1000, 0x00).result(1), b"\x78\x56")
+		server.values.write(0x1000, 0x00, b"\x00\x00")
+		self.assertEqual(node.sdo.upload(0x1000, 0x00).result(1), b"\x00\x00")
+		self.assertNotIn((0x1000, 0x00), node.sdo.cache)
+		self.assertEqual((node.sdo.cache.hits, node.sdo.cache.misses), (2, 3))
+
+		#### Test step: Bulk reads use the cache
+		results = node.sdo.read_many([(0x1008, 0x00), (0x1000, 0x00)]).result(1)
+		self.assertEqual([result.value for result in results], [0x1234, 0x0000])
+		self.assertEqual((node.sdo.cache.hits, node.sdo.cache.misses), (3, 3))
+
+		#### Test step: A download removes the entry from the cache
+		with self.assertRaises(SDOAbortedError):
+			node.sdo.download(0x1008, 0x00, b"\x00\x00").result(1)
+		self.assertNotIn((0x1008, 0x00), node.sdo.cache)
+
+		#### Test step: Clearing the cache
+		node.sdo.upload(0x1008, 0x00).result(1)
+		node.sdo.cache.clear()
+		self.assertEqual(len(node.sdo.cache), 0)
+		node.sdo.cache.reset_statistics()
+		self.assertEqual((node.sdo.cache.hits, node.sdo.cache.misses), (0, 0))
+
+		network1.disconnect()
+		network2.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	def test_concurrent(self):
+		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		network = Network()
+		network.connect(bus1)
+
+		nodes = [ServiceTestNode(node_id) for node_id in range(1, 4)]
+		for node in nodes:
+			network.add(node)
+
+		#### Test step: The transfers to different nodes are started without waiting for a response
+		futures = [node.sdo.upload(0x1000, 0x00) for node in nodes]
+		requests = {}
+		for node in nodes:
+			message = bus2.recv(1)
+			requests[message.arbitration_id - 0x600] = bytes(message.data)
+		self.assertEqual(sorted(requests), [1, 2, 3])
+
+		for node in reversed(nodes):
+			self.__respond(bus2, struct.pack("<BHBH2x", 0x4B, 0x1000, 0x00, node.id), node.id)
+		for node, future in zip(nodes, futures):
+			self.assertEqual(future.result(1), struct.pack("<H", node.id))
+
+		#### Test step: The transfers of one node are queued
+		node = nodes[0]
+		future1 = node.sdo.upload(0x1000, 0x00)
+		future2 = node.sdo.upload(0x2000, 0x00)
+		future3 = node.sdo.upload(0x2000, 0x00)
+		future3.cancel()
+		self.assertEqual(self.__receive(bus2, node.id), struct.pack("<BHB4x", 0x40, 0x1000, 0x00))
+		self.assertIsNone(bus2.recv(0.05))
+		self.__respond(bus2, struct.pack("<BHBH2x", 0x4B, 0x1000, 0x00, 0x1234), node.id)
+		self.assertEqual(future1.result(1), b"\x34\x12")
+		self.assertEqual(self.__receive(bus2, node.id), struct.pack("<BHB4x", 0x40, 0x2000, 0x00))
+		self.__respond(bus2, struct.pack("<BHBL", 0x43, 0x2000, 0x00, 0x12345678), node.id)
+		self.assertEqual(future2.result(1), b"\x78\x56\x34\x12")
+		self.assertTrue(future3.cancelled())
+		self.assertIsNone(bus2.recv(0.05))
+
+		#### Test step: Cancelling the active transfer sends an abort and starts the next transfer
+		future1 = node.sdo.upload(0x1000, 0x00)
+		future2 = node.sdo.upload(0x2000, 0x00)
+		self.assertIsInstance(future1, SDOFuture)
+		self.assertEqual(self.__receive(bus2, node.id), struct.pack("<BHB4x", 0x40, 0x1000, 0x00))
+		self.assertTrue(future1.cancel())
+		self.assertTrue(future1.cancelled())
+		self.assertEqual(self.__receive(bus2, node.id), struct.pack("<BHBL", 0x80, 0x1000, 0x00, GENERAL_ERROR))
+		self.assertEqual(self.__receive(bus2, node.id), struct.pack("<BHB4x", 0x40, 0x2000, 0x00))
+		self.__respond(bus2, struct.pack("<BHBL", 0x43, 0x2000, 0x00, 0x12345678), node.id)
+		self.assertEqual(future2.result(1), b"\x78\x56\x34\x12")
+		self.assertFalse(future2.cancel())
+
+		#### Test step: Detach aborts the active transfer and fails the pending transfers
+		future1 = node.sdo.upload(0x1000, 0x00)
+		future2 = node.sdo.upload(0x2000, 0x00)
+		self.__receive(bus2, node.id)
+		del network[node.id]
+		self.assertEqual(self.__receive(bus2, node.id), struct.pack("<BHBL", 0x80, 0x1000, 0x00, GENERAL_ERROR))
+		for future in [future1, future2]:
+			self.assertIsInstance(future.exception(1), RuntimeError)
+			self.assertEqual(str(future.exception(1)), "The SDO client was detached.")
+		self.assertIsNone(bus2.recv(0.05))
+		with self.assertRaises(RuntimeError):
+			node.sdo.upload(0x1000, 0x00)
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
 	def test_expedited_download(self):
 		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
 		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
@@ -17,6 +317,22 @@ class SDOClientTestCase(unittest.TestCase):
 		node = ServiceTestNode()
 		network.add(node)
 
+		for data in [b"\x01", b"\x01\x02", b"\x01\x02\x03", b"\x01\x02\x03\x04"]:
+			#### Test step: Download with data size indicated
+			with self.subTest("Download", data = data):
+				future = node.sdo.download(0x1000, 0x00, data)
+				n = 4 - len(data)
+				self.assertEqual(self.__receive(bus2), struct.pack("<BHB", 0x23 | (n << 2), 0x1000, 0x00) + data + bytes(n))
+				self.assertFalse(future.done())
+				self.__respond(bus2, struct.pack("<BHB4x", 0x60, 0x1000, 0x00))
+				self.assertIsNone(future.result(1))
+
+		#### Test step: Index and subindex out of range
+		with self.assertRaises(ValueError):
+			node.sdo.download(0x10000, 0x00, b"\x00")
+		with self.assertRaises(ValueError):
+			node.sdo.download(0x1000, 0x100, b"\x00")
+
 		network.disconnect()
 		bus1.shutdown()
 		bus2.shutdown()
@@ -30,10 +346,106 @@ class SDOClientTestCase(unittest.TestCase):
 		node = ServiceTestNode()
 		network.add(node)
 
+		#### Test step: Upload with data size indicated
+		future = node.sdo.upload(0x1000, 0x00)
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHB4x", 0x40, 0x1000, 0x00))
+		self.__respond(bus2, struct.pack("<BHB4s", 0x4B, 0x1000, 0x00, b"\x01\x02\xFF\xFF"))
+		self.assertEqual(future.result(1), b"\x01\x02")
+
+		#### Test step: Upload without data size indicated
+		future = node.sdo.upload(0x1000, 0x00)
+		self.__receive(bus2)
+		self.__respond(bus2, struct.pack("<BHB4s", 0x42, 0x1000, 0x00, b"\x01\x02\x03\x04"))
+		self.assertEqual(future.result(1), b"\x01\x02\x03\x04")
+
+		#### Test step: Response for another entry
+		future = node.sdo.upload(0x1000, 0x00)
+		self.__receive(bus2)
+		self.__respond(bus2, struct.pack("<BHB4s", 0x42, 0x1000, 0x01, b"\x01\x02\x03\x04"))
+		with self.assertRaises(SDOAbortedError) as context:
+			future.result(1)
+		self.assertEqual(context.exception.code, GENERAL_ERROR)
+
 		network.disconnect()
 		bus1.shutdown()
 		bus2.shutdown()
 
+	def test_init(self):
+		examinee = SDOClient()
+		self.assertEqual(examinee.timeout, 1.0)
+		self.assertEqual(examinee.block_size, 127)
+		self.assertEqual(examinee.threshold, 32)
+		self.assertEqual(examinee.cache.ttl, 0.0)
+		examinee = SDOClient(0.5, 16, 0, 2.0)
+		self.assertEqual(examinee.timeout, 0.5)
+		self.assertEqual(examinee.block_size, 16)
+		self.assertEqual(examinee.threshold, 0)
+		self.assertEqual(examinee.cache.ttl, 2.0)
+		with self.assertRaises(ValueError):
+			SDOClient(0)
+		with self.assertRaises(ValueError):
+			SDOClient(1.0, 0)
+		with self.assertRaises(ValueError):
+			SDOClient(1.0, 128)
+		with self.assertRaises(ValueError):
+			SDOClient(1.0, 127, 256)
+		with self.assertRaises(ValueError):
+			SDOClient(1.0, 127, 32, -1)
+		with self.assertRaises(RuntimeError):
+			examinee.upload(0x1000, 0x00)
+
+	def test_read_write_many(self):
+		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		network1 = Network()
+		network1.connect(bus1)
+		network2 = Network()
+		network2.connect(bus2)
+
+		dictionary = ObjectDictionary()
+		dictionary.add(Variable("short", 0x1000, 0x00, UNSIGNED16, "rw", 0x1234))
+		dictionary.add(Variable("read only", 0x1001, 0x00, UNSIGNED16, "ro", 0x4321))
+		dictionary.add(Variable("long", 0x2000, 0x00, UNSIGNED64, "rw", 0x0102030405060708))
+		server = LocalNode(10, dictionary)
+		network2.add(server)
+
+		node = ServiceTestNode()
+		network1.add(node)
+		node.dictionary.add(Variable("read only", 0x1001, 0x00, UNSIGNED16, "ro"))
+		node.dictionary.add(Variable("unknown", 0x3000, 0x00, UNSIGNED16))
+
+		#### Test step: Read with decoding, a failed transfer does not stop the others
+		results = node.sdo.read_many([(0x1000, 0x00), (0x3000, 0x00), (0x2000, 0x00)]).result(1)
+		self.assertEqual([result.index for result in results], [0x1000, 0x3000, 0x2000])
+		self.assertEqual([result.ok for result in results], [True, False, True])
+		self.assertEqual([result.value for result in results], [0x1234, None, 0x0102030405060708])
+		self.assertEqual([result.code for result in results], [None, OBJECT_DOES_NOT_EXIST, None])
+		self.assertIsInstance(results[1].error, SDOAbortedError)
+
+		#### Test step: Write with encoding
+		results = node.sdo.write_many({(0x1000, 0x00): 0x5678, (0x1001, 0x00): 0x0001, (0x2000, 0x00): 0x1122334455667788}).result(1)
+		self.assertEqual([result.ok for result in results], [True, False, True])
+		self.assertEqual([result.value for result in results], [0x5678, None, 0x1122334455667788])
+		self.assertEqual(results[1].code, WRITE_OF_READ_ONLY_OBJECT)
+		self.assertFalse(results[1].ok)
+		self.assertEqual(server.values.get(0x1000, 0x00), 0x5678)
+		self.assertEqual(server.values.get(0x1001, 0x00), 0x4321)
+		self.assertEqual(server.values.get(0x2000, 0x00), 0x1122334455667788)
+
+		#### Test step: Entries, which are not in the object dictionary, and values, which cannot be encoded
+		with self.assertRaises(KeyError):
+			node.sdo.read_many([(0x1000, 0x00), (0x4000, 0x00)])
+		with self.assertRaises(KeyError):
+			node.sdo.read_many([(0x1000, 0x01)])
+		with self.assertRaises(ValueError):
+			node.sdo.write_many({(0x1000, 0x00): 0x10000})
+		self.assertEqual(node.sdo.read_many([]).result(1), [])
+
+		network1.disconnect()
+		network2.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
 	def test_segmented_download(self):
 		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
 		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
@@ -43,6 +455,27 @@ class SDOClientTestCase(unittest.TestCase):
 		node = ServiceTestNode()
 		network.add(node)
 
+		for data in [b"", bytes(range(5)), bytes(range(7)), bytes(range(14)), bytes(range(20))]:
+			#### Test step: Download with size indicated
+			with self.subTest("Download", size = len(data)):
+				future = node.sdo.download(0x2000, 0x00, data)
+				self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x21, 0x2000, 0x00, len(data)))
+				self.__respond(bus2, struct.pack("<BHB4x", 0x60, 0x2000, 0x00))
+				received = b""
+				toggle = 0x00
+				while True:
+					request = self.__receive(bus2)
+					self.assertEqual(request[0] & 0xF0, toggle)
+					n = (request[0] >> 1) & 0x07
+					received += request[1:8 - n]
+					self.assertFalse(future.done())
+					self.__respond(bus2, bytes([0x20 | toggle]) + bytes(7))
+					toggle ^= 0x10
+					if request[0] & 0x01:
+						break
+				self.assertIsNone(future.result(1))
+				self.assertEqual(received, data)
+
 		network.disconnect()
 		bus1.shutdown()
 		bus2.shutdown()
@@ -56,18 +489,47 @@ class SDOClientTestCase(unittest.TestCase):
 		node = ServiceTestNode()
 		network.add(node)
 
+		for data, indicated in [(bytes(range(5)), True), (bytes(range(7)), True), (bytes(range(20)), True), (bytes(range(20)), False)]:
+			#### Test step: Upload with and without size indicated
+			with self.subTest("Upload", size = len(data), indicated = indicated):
+				future = node.sdo.upload(0x2000, 0x00)
+				self.assertEqual(self.__receive(bus2), struct.pack("<BHB4x", 0x40, 0x2000, 0x00))
+				if indicated:
+					self.__respond(bus2, struct.pack("<BHBL", 0x41, 0x2000, 0x00, len(data)))
+				else:
+					self.__respond(bus2, struct.pack("<BHB4x", 0x40, 0x2000, 0x00))
+				toggle = 0x00
+				for offset in range(0, len(data), 7):
+					self.assertEqual(self.__receive(bus2), bytes([0x60 | toggle]) + bytes(7))
+					segment = data[offset:offset + 7]
+					n = 7 - len(segment)
+					c = 0x01 if offset + 7 >= len(data) else 0x00
+					self.__respond(bus2, bytes([toggle | (n << 1) | c]) + segment + bytes(n))
+					toggle ^= 0x10
+				self.assertEqual(future.result(1), data)
+
+		#### Test step: Size indicated does not match
+		future = node.sdo.upload(0x2000, 0x00)
+		self.__receive(bus2)
+		self.__respond(bus2, struct.pack("<BHBL", 0x41, 0x2000, 0x00, 8))
+		self.__receive(bus2)
+		self.__respond(bus2, b"\x05\x01\x02\x03\x04\x05\x00\x00")
+		with self.assertRaises(SDOAbortedError) as context:
+			future.result(1)
+		self.assertEqual(context.exception.code, DATA_TYPE_LENGTH_MISMATCH)
+
 		network.disconnect()
 		bus1.shutdown()
 		bus2.shutdown()
 
 
 class ServiceTestNode(Node):
-	def __init__(self):
+	def __init__(self, node_id = 10, timeout = 1.0, block_size = 127, threshold = 32, ttl = 0.0):
 		dictionary = ObjectDictionary()
 		dictionary.add(Variable("short", 0x1000, 0x00, UNSIGNED16))
 		dictionary.add(Variable("long", 0x2000, 0x00, UNSIGNED64))
-		Node.__init__(self, 10, dictionary)
-		self.sdo = SDOClient()
+		Node.__init__(self, node_id, dictionary)
+		self.sdo = SDOClient(timeout, block_size, threshold, ttl)
 
 	def attach(self, network):
 		Node.attach(self, network)
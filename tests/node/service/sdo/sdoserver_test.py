@@ -1,13 +1,161 @@
+import binascii
 import can
+import struct
 import unittest
 
 from canopenx import Network, Node
-from canopenx.objectdictionary import ObjectDictionary, Variable
-from canopenx.objectdictionary.datatypes import UNSIGNED16, UNSIGNED64
+from canopenx.node import ValueStore
+from canopenx.objectdictionary import Domain, ObjectDictionary, Variable
+from canopenx.objectdictionary.datatypes import BOOLEAN, UNSIGNED16, UNSIGNED64
 from canopenx.node.service.sdo import SDOServer
+from canopenx.sdo.abortcodes import *
 
 
 class SDOServerTestCase(unittest.TestCase):
+	def __request(self, bus, data):
+		bus.send(can.Message(arbitration_id = 0x600 + 10, is_extended_id = False, data = data))
+
+	def __receive(self, bus):
+		message = bus.recv(1)
+		self.assertIsNotNone(message)
+		self.assertEqual(message.arbitration_id, 0x580 + 10)
+		self.assertEqual(message.dlc, 8)
+		return bytes(message.data)
+
+	def test_abort(self):
+		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		network = Network()
+		network.connect(bus1)
+
+		node = ServiceTestNode()
+		network.add(node)
+
+		#### Test step: Unknown object and subindex
+		self.__request(bus2, struct.pack("<BHB4x", 0x40, 0x3000, 0x00))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x3000, 0x00, OBJECT_DOES_NOT_EXIST))
+		self.__request(bus2, struct.pack("<BHB4x", 0x40, 0x1000, 0x01))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x1000, 0x01, SUBINDEX_DOES_NOT_EXIST))
+
+		#### Test step: Access types
+		self.__request(bus2, struct.pack("<BHBH2x", 0x2B, 0x1001, 0x00, 0x1234))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x1001, 0x00, WRITE_OF_READ_ONLY_OBJECT))
+		self.__request(bus2, struct.pack("<BHB4x", 0x40, 0x1002, 0x00))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x1002, 0x00, READ_OF_WRITE_ONLY_OBJECT))
+
+		#### Test step: Length of the data does not match
+		self.__request(bus2, struct.pack("<BHBB3x", 0x2F, 0x1000, 0x00, 0x12))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x1000, 0x00, DATA_TYPE_LENGTH_MISMATCH))
+		self.assertEqual(node.values.get(0x1000, 0x00), 0)
+
+		#### Test step: Segment without transfer and unknown command specifier
+		self.__request(bus2, b"\x60" + bytes(7))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x0000, 0x00, COMMAND_SPECIFIER_NOT_VALID))
+		self.__request(bus2, struct.pack("<BHB4x", 0xE0, 0x1000, 0x00))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x0000, 0x00, COMMAND_SPECIFIER_NOT_VALID))
+
+		#### Test step: Abort by the client ends the transfer
+		self.__request(bus2, struct.pack("<BHBL", 0x21, 0x2000, 0x00, 8))
+		self.__receive(bus2)
+		self.__request(bus2, struct.pack("<BHBL", 0x80, 0x2000, 0x00, GENERAL_ERROR))
+		self.__request(bus2, b"\x00" + bytes(7))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x0000, 0x00, COMMAND_SPECIFIER_NOT_VALID))
+
+		#### Test step: Toggle bit not alternated
+		self.__request(bus2, struct.pack("<BHBL", 0x21, 0x2000, 0x00, 8))
+		self.__receive(bus2)
+		self.__request(bus2, b"\x10" + bytes(7))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x2000, 0x00, TOGGLE_BIT_NOT_ALTERNATED))
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	def test_block_download(self):
+		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		network = Network()
+		network.connect(bus1)
+
+		node = ServiceTestNode(block_size = 4)
+		network.add(node)
+		data = bytes(range(40))
+
+		#### Test step: Initiate
+		self.__request(bus2, struct.pack("<BHBL", 0xC6, 0x1F50, 0x00, len(data)))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBB3x", 0xA4, 0x1F50, 0x00, 4))
+
+		#### Test step: Sub-block with a lost segment, the segments after the acknowledged sequence number are repeated
+		for sequence in [1, 2, 4]:
+			self.__request(bus2, bytes([sequence]) + data[(sequence - 1) * 7:sequence * 7])
+		self.assertEqual(self.__receive(bus2), struct.pack("<BBB5x", 0xA2, 2, 4))
+		for sequence in [1, 2, 3, 4]:
+			position = sequence + 1
+			segment = data[position * 7:position * 7 + 7]
+			c = 0x80 if sequence == 4 else 0x00
+			self.__request(bus2, bytes([c | sequence]) + segment + bytes(7 - len(segment)))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BBB5x", 0xA2, 4, 4))
+
+		#### Test step: End with CRC
+		self.__request(bus2, struct.pack("<BH5x", 0xC1 | (2 << 2), binascii.crc_hqx(data, 0)))
+		self.assertEqual(self.__receive(bus2), b"\xA1" + bytes(7))
+		self.assertEqual(bytes(node.values.read(0x1F50, 0x00)), data)
+
+		#### Test step: CRC error
+		self.__request(bus2, struct.pack("<BHBL", 0xC6, 0x1F50, 0x00, 3))
+		self.__receive(bus2)
+		self.__request(bus2, b"\x81\x01\x02\x03" + bytes(4))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BBB5x", 0xA2, 1, 4))
+		self.__request(bus2, struct.pack("<BH5x", 0xC1 | (4 << 2), 0x0000))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x1F50, 0x00, CRC_ERROR))
+		self.assertEqual(bytes(node.values.read(0x1F50, 0x00)), data)
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
+	def test_block_upload(self):
+		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
+		network = Network()
+		network.connect(bus1)
+
+		node = ServiceTestNode()
+		network.add(node)
+		data = bytes(range(40))
+		node.values.write(0x1F50, 0x00, data)
+
+		#### Test step: Initiate and start
+		self.__request(bus2, struct.pack("<BHBBB2x", 0xA4, 0x1F50, 0x00, 4, 0))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0xC6, 0x1F50, 0x00, len(data)))
+		self.__request(bus2, b"\xA3" + bytes(7))
+
+		#### Test step: Sub-blocks, the segments after the acknowledged sequence number are repeated
+		position = 0
+		for acknowledged in [2, 4]:
+			for sequence in range(1, 5):
+				segment = self.__receive(bus2)
+				self.assertEqual(segment[0] & 0x7F, sequence)
+				self.assertEqual(segment[1:], (data[(position + sequence - 1) * 7:(position + sequence) * 7] + bytes(7))[:7])
+			position += acknowledged
+			self.__request(bus2, struct.pack("<BBB5x", 0xA2, acknowledged, 4))
+
+		#### Test step: End with CRC
+		self.assertEqual(self.__receive(bus2), struct.pack("<BH5x", 0xC1 | (2 << 2), binascii.crc_hqx(data, 0)))
+		self.__request(bus2, b"\xA1" + bytes(7))
+
+		#### Test step: Protocol switch for small data
+		self.__request(bus2, struct.pack("<BHBBB2x", 0xA4, 0x1000, 0x00, 4, 8))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBH2x", 0x4B, 0x1000, 0x00, 0x0000))
+
+		#### Test step: Invalid block size
+		self.__request(bus2, struct.pack("<BHBBB2x", 0xA4, 0x1F50, 0x00, 0, 0))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x80, 0x1F50, 0x00, INVALID_BLOCK_SIZE))
+
+		network.disconnect()
+		bus1.shutdown()
+		bus2.shutdown()
+
 	def test_expedited_download(self):
 		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
 		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
@@ -17,6 +165,21 @@ class SDOServerTestCase(unittest.TestCase):
 		node = ServiceTestNode()
 		network.add(node)
 
+		#### Test step: Download with size indicated
+		self.__request(bus2, struct.pack("<BHBH2x", 0x2B, 0x1000, 0x00, 0x1234))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHB4x", 0x60, 0x1000, 0x00))
+		self.assertEqual(node.values.get(0x1000, 0x00), 0x1234)
+
+		#### Test step: Download without size indicated
+		self.__request(bus2, struct.pack("<BHBH2x", 0x22, 0x1000, 0x00, 0x4321))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHB4x", 0x60, 0x1000, 0x00))
+		self.assertEqual(node.values.get(0x1000, 0x00), 0x4321)
+
+		#### Test step: Download of a BOOLEAN without size indicated
+		self.__request(bus2, struct.pack("<BHBB3x", 0x22, 0x1003, 0x00, 0x01))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHB4x", 0x60, 0x1003, 0x00))
+		self.assertIs(node.values.get(0x1003, 0x00), True)
+
 		network.disconnect()
 		bus1.shutdown()
 		bus2.shutdown()
@@ -29,11 +192,26 @@ class SDOServerTestCase(unittest.TestCase):
 
 		node = ServiceTestNode()
 		network.add(node)
+		node.values.set(0x1000, 0x00, 0x1234)
+
+		#### Test step: Upload
+		self.__request(bus2, struct.pack("<BHB4x", 0x40, 0x1000, 0x00))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBH2x", 0x4B, 0x1000, 0x00, 0x1234))
 
 		network.disconnect()
 		bus1.shutdown()
 		bus2.shutdown()
 
+	def test_init(self):
+		examinee = SDOServer()
+		self.assertEqual(examinee.block_size, 127)
+		examinee = SDOServer(16)
+		self.assertEqual(examinee.block_size, 16)
+		with self.assertRaises(ValueError):
+			SDOServer(0)
+		with self.assertRaises(ValueError):
+			SDOServer(128)
+
 	def test_segmented_download(self):
 		bus1 = can.ThreadSafeBus(interface = "virtual", channel = 0)
 		bus2 = can.ThreadSafeBus(interface = "virtual", channel = 0)
@@ -43,6 +221,15 @@ class SDOServerTestCase(unittest.TestCase):
 		node = ServiceTestNode()
 		network.add(node)
 
+		#### Test step: Download with size indicated
+		self.__request(bus2, struct.pack("<BHBL", 0x21, 0x2000, 0x00, 8))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHB4x", 0x60, 0x2000, 0x00))
+		self.__request(bus2, b"\x00\x01\x02\x03\x04\x05\x06\x07")
+		self.assertEqual(self.__receive(bus2), b"\x20" + bytes(7))
+		self.__request(bus2, b"\x1D\x08" + bytes(6))
+		self.assertEqual(self.__receive(bus2), b"\x30" + bytes(7))
+		self.assertEqual(node.values.get(0x2000, 0x00), 0x0807060504030201)
+
 		network.disconnect()
 		bus1.shutdown()
 		bus2.shutdown()
@@ -55,6 +242,15 @@ class SDOServerTestCase(unittest.TestCase):
 
 		node = ServiceTestNode()
 		network.add(node)
+		node.values.set(0x2000, 0x00, 0x0807060504030201)
+
+		#### Test step: Upload with size indicated
+		self.__request(bus2, struct.pack("<BHB4x", 0x40, 0x2000, 0x00))
+		self.assertEqual(self.__receive(bus2), struct.pack("<BHBL", 0x41, 0x2000, 0x00, 8))
+		self.__request(bus2, b"\x60" + bytes(7))
+		self.assertEqual(self.__receive(bus2), b"\x00\x01\x02\x03\x04\x05\x06\x07")
+		self.__request(bus2, b"\x70" + bytes(7))
+		self.assertEqual(self.__receive(bus2), b"\x1D\x08" + bytes(6))
 
 		network.disconnect()
 		bus1.shutdown()
@@ -62,12 +258,17 @@ class SDOServerTestCase(unittest.TestCase):
 
 
 class ServiceTestNode(Node):
-	def __init__(self):
+	def __init__(self, block_size = 127):
 		dictionary = ObjectDictionary()
 		dictionary.add(Variable("short", 0x1000, 0x00, UNSIGNED16))
+		dictionary.add(Variable("read only", 0x1001, 0x00, UNSIGNED16, "ro"))
+		dictionary.add(Variable("write only", 0x1002, 0x00, UNSIGNED16, "wo"))
+		dictionary.add(Variable("flag", 0x1003, 0x00, BOOLEAN))
+		dictionary.add(Domain("program", 0x1F50))
 		dictionary.add(Variable("long", 0x2000, 0x00, UNSIGNED64))
 		Node.__init__(self, 10, dictionary)
-		self.sdo = SDOServer()
+		self.values = ValueStore(dictionary, 10)
+		self.sdo = SDOServer(block_size)
 
 	def attach(self, network):
 		Node.attach(self, network)
@@ -0,0 +1,86 @@
+import struct
+import unittest
+
+from canopenx import ObjectDictionary
+from canopenx.node import ValueStore
+from canopenx.objectdictionary import Array, Domain, NodeIdValue, Record, Variable
+from canopenx.objectdictionary.datatypes import *
+
+
+def make_dictionary():
+	dictionary = ObjectDictionary()
+	dictionary.add(Variable("device type", 0x1000, 0x00, UNSIGNED32, "ro", 0x20192))
+	dictionary.add(Variable("name", 0x1008, 0x00, VISIBLE_STRING, "const", "Device"))
+	record = Record("tpdo", 0x1800)
+	record.add(Variable("count", 0x1800, 0x00, UNSIGNED8, "ro", 2))
+	record.add(Variable("cob_id", 0x1800, 0x01, UNSIGNED32, "rw", NodeIdValue(0x180)))
+	record.add(Variable("type", 0x1800, 0x02, UNSIGNED8, "rw", 0xFF))
+	dictionary.add(record)
+	dictionary.add(Domain("program", 0x1F50))
+	array = Array("values", 0x2000, INTEGER24)
+	array.add(Variable("count", 0x2000, 0x00, UNSIGNED8, "ro", 1))
+	array.add(Variable("value", 0x2000, 0x01, INTEGER24, "rw", -2))
+	dictionary.add(array)
+	return dictionary
+
+
+class ValueStoreTestCase(unittest.TestCase):
+	def test_init(self):
+		examinee = ValueStore(make_dictionary(), 5)
+
+		self.assertEqual(len(examinee), 8)
+		self.assertEqual(list(examinee), [(0x1000, 0x00), (0x1008, 0x00), (0x1800, 0x00), (0x1800, 0x01), (0x1800, 0x02), (0x1F50, 0x00), (0x2000, 0x00), (0x2000, 0x01)])
+		self.assertTrue((0x1800, 0x01) in examinee)
+		self.assertFalse((0x1800, 0x03) in examinee)
+
+		# The entries with fixed size are placed in index order without gaps
+		self.assertEqual(examinee.buffer, struct.pack("<LBLB", 0x20192, 2, 0x185, 0xFF) + b"\x01\xFE\xFF\xFF")
+		self.assertEqual(examinee.location(0x1800, 0x01), (5, 4))
+		with self.assertRaises(ValueError):
+			examinee.location(0x1008, 0x00)
+		self.assertEqual(examinee.variable(0x1800, 0x01).name, "cob_id")
+		with self.assertRaises(KeyError):
+			examinee.variable(0x1800, 0x03)
+
+		with self.assertRaises(ValueError):
+			ValueStore(make_dictionary())
+
+	def test_read_write(self):
+		examinee = ValueStore(make_dictionary(), 5)
+
+		#### Test step: Raw access
+		view = examinee.read(0x1800, 0x01)
+		self.assertIsInstance(view, memoryview)
+		self.assertEqual(bytes(view), b"\x85\x01\x00\x00")
+		examinee.write(0x1800, 0x01, b"\x85\x01\x00\x80")
+		self.assertEqual(bytes(view), b"\x85\x01\x00\x80")
+		self.assertEqual(bytes(examinee.read(0x1008, 0x00)), b"Device")
+		examinee.write(0x1F50, 0x00, bytearray(b"\x01\x02\x03"))
+		self.assertEqual(bytes(examinee.read(0x1F50, 0x00)), b"\x01\x02\x03")
+
+		with self.assertRaises(ValueError):
+			examinee.write(0x1800, 0x01, b"\x00")
+		with self.assertRaises(KeyError):
+			examinee.read(0x1800, 0x03)
+		with self.assertRaises(KeyError):
+			examinee.write(0x1800, 0x03, b"\x00")
+
+		#### Test step: Typed access
+		self.assertEqual(examinee.get(0x1800, 0x01), 0x80000185)
+		self.assertEqual(examinee.get(0x2000, 0x01), -2)
+		self.assertEqual(examinee.get(0x1008, 0x00), "Device")
+		examinee.set(0x2000, 0x01, -0x123456)
+		self.assertEqual(examinee.get(0x2000, 0x01), -0x123456)
+		examinee.set(0x1008, 0x00, "Other")
+		self.assertEqual(examinee.get(0x1008, 0x00), "Other")
+
+		with self.assertRaises(ValueError):
+			examinee.set(0x1800, 0x02, 0x100)
+		with self.assertRaises(KeyError):
+			examinee.get(0x3000, 0x00)
+
+		#### Test step: Reset
+		examinee.reset()
+		self.assertEqual(examinee.get(0x1800, 0x01), 0x185)
+		self.assertEqual(examinee.get(0x1008, 0x00), "Device")
+		self.assertEqual(bytes(examinee.read(0x1F50, 0x00)), b"")
@@ -0,0 +1,51 @@
+import struct
+import unittest
+
+from canopenx.objectdictionary import codecs
+from canopenx.objectdictionary.datatypes import *
+
+
+class CodecsTestCase(unittest.TestCase):
+	def test_codec(self):
+		with self.assertRaises(ValueError):
+			codecs.codec(0x00)
+		with self.assertRaises(ValueError):
+			codecs.codec(None)
+
+		self.assertIs(codecs.codec(INTEGER16), codecs.codec(INTEGER16))
+		self.assertIsInstance(codecs.codec(INTEGER16), codecs.StructCodec)
+		self.assertIsInstance(codecs.codec(INTEGER24), codecs.IntegerCodec)
+		self.assertIsInstance(codecs.codec(VISIBLE_STRING), codecs.StringCodec)
+		self.assertIsInstance(codecs.codec(DOMAIN), codecs.DomainCodec)
+		self.assertIsInstance(codecs.codec(TIME_OF_DAY), codecs.TimeCodec)
+
+	def test_length(self):
+		test_data = [(BOOLEAN, 1), (INTEGER8, 1), (UNSIGNED16, 2), (REAL32, 4), (VISIBLE_STRING, 0), (DOMAIN, 0), (TIME_OF_DAY, 6), (TIME_DIFFERENCE, 6), (INTEGER24, 3), (REAL64, 8), (UNSIGNED40, 5), (INTEGER48, 6), (UNSIGNED56, 7), (INTEGER64, 8)]
+		for data_type, length in test_data:
+			with self.subTest("data_type=" + str(data_type)):
+				self.assertEqual(codecs.codec(data_type).length, length)
+
+	def test_roundtrip(self):
+		test_data = [(BOOLEAN, True), (INTEGER8, -128), (INTEGER16, -2), (INTEGER32, 0x12345678), (UNSIGNED8, 255), (UNSIGNED16, 0xFFFF), (UNSIGNED32, 0xFFFFFFFF), (REAL32, 1.5), (VISIBLE_STRING, "TEXT"), (OCTET_STRING, "ä"), (UNICODE_STRING, "€"), (TIME_OF_DAY, codecs.CANOPEN_EPOCH + 86400 + 1.5), (TIME_DIFFERENCE, 2.5), (DOMAIN, b"\x01\x02"), (INTEGER24, -0x800000), (REAL64, -1.25), (INTEGER40, -1), (INTEGER48, 0x7FFFFFFFFFFF), (INTEGER56, -3), (INTEGER64, -0x8000000000000000), (UNSIGNED24, 0xFFFFFF), (UNSIGNED40, 0x123456789A), (UNSIGNED48, 1), (UNSIGNED56, 0xFFFFFFFFFFFFFF), (UNSIGNED64, 0xFFFFFFFFFFFFFFFF)]
+		for data_type, value in test_data:
+			with self.subTest("data_type=" + str(data_type)):
+				codec = codecs.codec(data_type)
+				data = codec.encode(value)
+				if codec.length != 0:
+					self.assertEqual(len(data), codec.length)
+				self.assertEqual(codec.decode(data), value)
+				self.assertEqual(codec.decode(memoryview(data)), value)
+
+	def test_errors(self):
+		with self.assertRaises(struct.error):
+			codecs.codec(INTEGER8).encode(128)
+		with self.assertRaises(OverflowError):
+			codecs.codec(UNSIGNED24).encode(-1)
+		with self.assertRaises(TypeError):
+			codecs.codec(INTEGER40).encode(1.0)
+		with self.assertRaises(ValueError):
+			codecs.codec(INTEGER56).decode(b"\x00" * 6)
+		with self.assertRaises(ValueError):
+			codecs.codec(TIME_OF_DAY).encode(0)
+		with self.assertRaises(struct.error):
+			codecs.codec(TIME_DIFFERENCE).decode(b"\x00")
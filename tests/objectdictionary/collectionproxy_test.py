@@ -68,3 +68,21 @@ class CollectionProxyTestCase(unittest.TestCase):
 		self.assertEqual(dictionary["record"].data_type, node["record"].data_type)
 		self.assertEqual(dictionary["record"].index, node["record"].index)
 		self.assertEqual(dictionary["record"].name, node["record"].name)
+
+	def test_cache(self):
+		dictionary = canopenx.ObjectDictionary()
+		record = Record("record", 0x1000)
+		record.add(Variable("variable", 0x1000, 0x01, UNSIGNED8))
+		dictionary.add(record)
+		proxy = record.proxy(Node(1, dictionary))
+
+		self.assertIs(proxy["variable"], proxy["variable"])
+		self.assertIs(proxy["variable"], proxy[0x01])
+
+		variable = proxy["variable"]
+		del record["variable"]
+		with self.assertRaises(KeyError):
+			proxy["variable"]
+		record.add(Variable("variable", 0x1000, 0x01, UNSIGNED32))
+		self.assertIsNot(proxy["variable"], variable)
+		self.assertEqual(proxy["variable"].data_type, UNSIGNED32)
@@ -0,0 +1,247 @@
+import json
+import os
+import tempfile
+import unittest
+
+from canopenx.objectdictionary import eds
+from canopenx.objectdictionary import Array, DefStruct, DefType, Domain, NodeIdValue, Record, Variable
+from canopenx.objectdictionary.datatypes import *
+
+
+EDS = """
+[FileInfo]
+FileName=test.eds
+; A comment
+
+[DeviceInfo]
+VendorName=Test
+
+[MandatoryObjects]
+SupportedObjects=2
+1=0x1000
+2=0x1018
+
+[0007]
+ParameterName=UNSIGNED32
+ObjectType=0x5
+DefaultValue=32
+
+[0040]
+ParameterName=PDO_COMM_PAR
+ObjectType=0x6
+SubNumber=1
+
+[0040sub0]
+ParameterName=Number of entries
+ObjectType=0x7
+DataType=0x0005
+AccessType=ro
+DefaultValue=1
+
+[1000]
+ParameterName=Device type
+ObjectType=0x7
+DataType=0x0007
+AccessType=ro
+DefaultValue=0x00020192
+
+[1008]
+ParameterName=Manufacturer device name
+ObjectType=0x7
+DataType=0x0009
+AccessType=const
+DefaultValue=Test device
+
+[1018]
+ParameterName=Identity object
+ObjectType=0x9
+SubNumber=2
+
+[1018sub0]
+ParameterName=Highest sub-index supported
+ObjectType=0x7
+DataType=0x0005
+AccessType=ro
+DefaultValue=1
+
+[1018sub1]
+ParameterName=Vendor-ID
+ObjectType=0x7
+DataType=0x0007
+AccessType=ro
+DefaultValue=0x1234
+
+[1800]
+ParameterName=TPDO communication parameter
+ObjectType=0x9
+SubNumber=2
+
+[1800sub0]
+ParameterName=Highest sub-index supported
+ObjectType=0x7
+DataType=0x0005
+AccessType=ro
+DefaultValue=1
+
+[1800SUB1]
+ParameterName=COB-ID
+ObjectType=0x7
+DataType=0x0007
+AccessType=rww
+DefaultValue=$NODEID+0x180
+
+[1f50]
+ParameterName=Program
+ObjectType=0x7
+DataType=0x000F
+AccessType=wo
+
+[2000]
+ParameterName=Values
+ObjectType=0x8
+DataType=0x0003
+AccessType=rw
+DefaultValue=-2
+CompactSubObj=3
+
+[2001]
+ParameterName=Flags
+ObjectType=0x8
+SubNumber=2
+
+[2001sub0]
+ParameterName=Number of entries
+ObjectType=0x7
+DataType=0x0005
+AccessType=ro
+DefaultValue=1
+
+[2001sub1]
+ParameterName=Flag
+ObjectType=0x7
+DataType=0x0001
+AccessType=rw
+DefaultValue=1
+
+[2002]
+ParameterName=Gain
+ObjectType=0x7
+DataType=0x0008
+AccessType=rw
+DefaultValue=1.5
+
+[2003]
+ParameterName=Octal
+ObjectType=0x7
+DataType=0x0006
+DefaultValue=010
+"""
+
+
+class EDSTestCase(unittest.TestCase):
+	def test_loads(self):
+		examinee = eds.loads(EDS)
+
+		self.assertEqual(len(examinee), 11)
+		self.assertIsInstance(examinee[0x0007], DefType)
+		self.assertEqual(examinee[0x0007].default_value, 32)
+		self.assertIsInstance(examinee[0x0040], DefStruct)
+		self.assertEqual(examinee[0x1000], Variable("Device type", 0x1000, 0x00, UNSIGNED32, "ro", 0x00020192))
+		self.assertEqual(examinee[0x1000].default_value, 0x00020192)
+		self.assertEqual(examinee["Manufacturer device name"].default_value, "Test device")
+		self.assertEqual(examinee["Manufacturer device name"].access_type, "const")
+
+		record = examinee[0x1018]
+		self.assertIsInstance(record, Record)
+		self.assertEqual(len(record), 2)
+		self.assertEqual(record["Vendor-ID"].default_value, 0x1234)
+
+		self.assertEqual(examinee[0x1800][1].default_value, NodeIdValue(0x180))
+		self.assertEqual(examinee[0x1800][1].access_type, "rw")
+
+		self.assertIsInstance(examinee[0x1F50], Domain)
+		self.assertEqual(examinee[0x1F50].access_type, "wo")
+
+		array = examinee[0x2000]
+		self.assertIsInstance(array, Array)
+		self.assertEqual(array.data_type, INTEGER16)
+		self.assertEqual(len(array), 4)
+		self.assertEqual(array[0].default_value, 3)
+		self.assertEqual(array["Values3"].default_value, -2)
+
+		self.assertEqual(examinee[0x2001].data_type, BOOLEAN)
+		self.assertIs(examinee[0x2001][1].default_value, True)
+		self.assertEqual(examinee[0x2002].default_value, 1.5)
+		self.assertEqual(examinee[0x2003].default_value, 8)
+
+	def test_node_id(self):
+		self.assertEqual(eds.loads(EDS, 5)[0x1800][1].default_value, 0x185)
+
+		dcf = EDS.replace("[DeviceInfo]", "[DeviceComissioning]\nNodeID=0x10\n\n[DeviceInfo]")
+		dcf = dcf.replace("DefaultValue=0x1234", "DefaultValue=0x1234\nParameterValue=0x4321")
+		examinee = eds.loads(dcf)
+		self.assertEqual(examinee[0x1800][1].default_value, 0x190)
+		self.assertEqual(examinee[0x1018][1].default_value, 0x4321)
+
+	def test_domain(self):
+		text = "[1F50]\nParameterName=Program Data\nObjectType=0x8\nSubNumber=2\n\n"
+		text += "[1F50sub0]\nParameterName=Number of entries\nObjectType=0x7\nDataType=0x0005\nAccessType=ro\nDefaultValue=1\n\n"
+		text += "[1F50sub1]\nParameterName=Program number 1\nObjectType=0x7\nDataType=0x000F\nAccessType=rw\n"
+		examinee = eds.loads(text)
+
+		#### Test step: DOMAIN sub-entries are Variables with their subindex
+		array = examinee[0x1F50]
+		self.assertIsInstance(array, Array)
+		self.assertEqual(len(array), 2)
+		self.assertEqual(array[1], Variable("Program number 1", 0x1F50, 0x01, DOMAIN, "rw"))
+		self.assertEqual(array[1].default_value, b"")
+
+	def test_errors(self):
+		with self.assertRaises(ValueError):
+			eds.loads("[1000\nParameterName=x")
+		with self.assertRaises(ValueError):
+			eds.loads("[1000]\nParameterName=x\nObjectType=0x7\nDataType=0x0005\nDefaultValue=256\n")
+		with self.assertRaises(ValueError):
+			eds.loads("[1000]\nParameterName=x\nObjectType=0x3\n")
+
+	def test_load(self):
+		with tempfile.TemporaryDirectory() as directory:
+			filename = os.path.join(directory, "test.eds")
+			with open(filename, "w") as f:
+				f.write(EDS)
+
+			#### Test step: Parse and write the cache
+			examinee = eds.load(filename)
+			self.assertEqual(examinee, eds.loads(EDS))
+			self.assertTrue(os.path.exists(filename + eds.CACHE_SUFFIX))
+
+			#### Test step: Load from the cache
+			cached = eds.load(filename)
+			self.assertEqual(cached, examinee)
+			self.assertEqual(cached[0x1018][1].encode(1), b"\x01\x00\x00\x00")
+			self.assertEqual(cached[0x1018].compile_layout().names, ("Highest sub-index supported", "Vendor-ID"))
+
+			#### Test step: The cache is keyed by the content
+			with open(filename, "w") as f:
+				f.write(EDS.replace("DefaultValue=0x1234", "DefaultValue=0x5678"))
+			self.assertEqual(eds.load(filename)[0x1018][1].default_value, 0x5678)
+			self.assertEqual(eds.load(filename, 3)[0x1800][1].default_value, 0x183)
+			self.assertEqual(eds.load(filename)[0x1800][1].default_value, NodeIdValue(0x180))
+
+			#### Test step: A manipulated cache with unknown items is not used
+			with open(filename + eds.CACHE_SUFFIX, "r") as f:
+				data = json.load(f)
+			data["items"][0] = ["os.system", "echo"]
+			with open(filename + eds.CACHE_SUFFIX, "w") as f:
+				json.dump(data, f)
+			self.assertEqual(eds.load(filename)[0x0007].default_value, 32)
+
+			#### Test step: Corrupted cache
+			with open(filename + eds.CACHE_SUFFIX, "wb") as f:
+				f.write(b"garbage")
+			self.assertEqual(eds.load(filename)[0x1018][1].default_value, 0x5678)
+
+			#### Test step: Without cache
+			os.remove(filename + eds.CACHE_SUFFIX)
+			eds.load(filename, cache = False)
+			self.assertFalse(os.path.exists(filename + eds.CACHE_SUFFIX))
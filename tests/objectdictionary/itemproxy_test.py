@@ -5,6 +5,7 @@ from canopenx.node import Node
 from canopenx.objectdictionary.datatypes import UNSIGNED32
 from canopenx.objectdictionary.deftype import DefType
 from canopenx.objectdictionary.domain import Domain
+from canopenx.objectdictionary.nodeidvalue import NodeIdValue
 from canopenx.objectdictionary.variable import Variable
 
 
@@ -43,3 +44,15 @@ class ItemProxyTestCase(unittest.TestCase):
 		self.assertEqual(dictionary["variable"].index, node["variable"].index)
 		self.assertEqual(dictionary["variable"].name, node["variable"].name)
 		self.assertEqual(dictionary["variable"].subindex, node["variable"].subindex)
+
+	def test_node_id_value(self):
+		dictionary = canopenx.ObjectDictionary()
+		dictionary.add(Variable("cob_id", 0x1800, 0x00, UNSIGNED32, "rw", NodeIdValue(0x180)))
+
+		# The dictionary is shared by the nodes, the default value is resolved for each node
+		node1 = Node(1, dictionary)
+		node2 = Node(0x10, dictionary)
+
+		self.assertEqual(dictionary["cob_id"].default_value, NodeIdValue(0x180))
+		self.assertEqual(node1["cob_id"].default_value, 0x181)
+		self.assertEqual(node2["cob_id"].default_value, 0x190)
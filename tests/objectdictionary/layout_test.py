@@ -0,0 +1,70 @@
+import calendar
+import struct
+import unittest
+
+from canopenx.objectdictionary import Layout, Record, Variable
+from canopenx.objectdictionary.datatypes import *
+
+
+class LayoutTestCase(unittest.TestCase):
+	def test_init(self):
+		items = [Variable("c", 0x100, 3, UNSIGNED32), Variable("a", 0x100, 1, UNSIGNED8), Variable("s", 0x100, 2, VISIBLE_STRING), Variable("b", 0x100, 2 + 0x10, INTEGER24)]
+		examinee = Layout(items)
+
+		self.assertEqual(len(examinee), 3)
+		self.assertEqual(examinee.names, ("a", "c", "b"))
+		self.assertEqual(examinee.subindices, (1, 3, 0x12))
+		self.assertEqual(examinee.format, "<BL3s")
+		self.assertEqual(examinee.size, 8)
+
+		self.assertEqual(len(Layout([])), 0)
+		self.assertEqual(Layout([]).pack({}), b"")
+
+	def test_pack(self):
+		items = [Variable("u8", 0x100, 1, UNSIGNED8), Variable("i16", 0x100, 2, INTEGER16), Variable("i24", 0x100, 3, INTEGER24), Variable("r32", 0x100, 4, REAL32), Variable("tod", 0x100, 5, TIME_OF_DAY), Variable("u56", 0x100, 6, UNSIGNED56), Variable("bool", 0x100, 7, BOOLEAN)]
+		examinee = Layout(items)
+		values = {"u8": 0xAB, "i16": -2, "i24": -3, "r32": 1.5, "tod": calendar.timegm((1984, 1, 2, 0, 0, 1)), "u56": 0x01020304050607, "bool": True}
+
+		data = examinee.pack(values)
+		self.assertEqual(data, b"".join(item.encode(values[item.name]) for item in items))
+		self.assertEqual(len(data), examinee.size)
+
+		#### Test step: Values by subindex
+		self.assertEqual(examinee.pack({item.subindex: values[item.name] for item in items}), data)
+
+		#### Test step: Unpack
+		self.assertEqual(examinee.unpack_from(data), values)
+		self.assertEqual(examinee.unpack_from(b"\x00" + data, 1), values)
+		self.assertEqual(examinee.unpack_from(memoryview(data)), values)
+
+		target = {"other": 1}
+		self.assertIs(examinee.unpack_into(data, target), target)
+		self.assertEqual(target, dict(values, other = 1))
+
+		#### Test step: Errors
+		with self.assertRaises(KeyError):
+			examinee.pack({"u8": 1})
+		with self.assertRaises(ValueError):
+			examinee.pack(dict(values, u8 = 256))
+		with self.assertRaises(ValueError):
+			examinee.pack(dict(values, i24 = 1 << 23))
+		with self.assertRaises(ValueError):
+			examinee.pack(dict(values, i16 = "x"))
+		with self.assertRaises(ValueError):
+			examinee.unpack_from(data[:-1])
+
+	def test_record(self):
+		record = Record("record", 0x100)
+		record.add(Variable("count", 0x100, 0, UNSIGNED8))
+		record.add(Variable("cob_id", 0x100, 1, UNSIGNED32))
+
+		examinee = record.compile_layout()
+		self.assertIs(record.compile_layout(), examinee)
+		self.assertEqual(examinee.pack({"count": 1, "cob_id": 0x181}), struct.pack("<BL", 1, 0x181))
+
+		record.add(Variable("type", 0x100, 2, UNSIGNED8))
+		examinee = record.compile_layout()
+		self.assertEqual(examinee.names, ("count", "cob_id", "type"))
+
+		del record["cob_id"]
+		self.assertEqual(record.compile_layout().names, ("count", "type"))
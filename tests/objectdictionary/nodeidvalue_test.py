@@ -0,0 +1,25 @@
+import pickle
+import unittest
+
+from canopenx.objectdictionary import NodeIdValue
+
+
+class NodeIdValueTestCase(unittest.TestCase):
+	def test_init(self):
+		examinee = NodeIdValue(0x180)
+		self.assertEqual(examinee.offset, 0x180)
+		self.assertEqual(NodeIdValue().offset, 0)
+		self.assertEqual(repr(examinee), "$NODEID+0x180")
+		self.assertEqual(repr(NodeIdValue(-1)), "$NODEID-0x1")
+
+	def test_equals(self):
+		self.assertEqual(NodeIdValue(0x180), NodeIdValue(0x180))
+		self.assertNotEqual(NodeIdValue(0x180), NodeIdValue(0x200))
+		self.assertNotEqual(NodeIdValue(0x180), 0x180)
+		self.assertEqual(hash(NodeIdValue(0x180)), hash(NodeIdValue(0x180)))
+		self.assertEqual(pickle.loads(pickle.dumps(NodeIdValue(0x180))), NodeIdValue(0x180))
+
+	def test_resolve(self):
+		examinee = NodeIdValue(0x600)
+		self.assertEqual(examinee.resolve(1), 0x601)
+		self.assertEqual(examinee.resolve(127), 0x67F)
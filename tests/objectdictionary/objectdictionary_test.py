@@ -107,3 +107,127 @@ class ObjectDictionaryTestCase(unittest.TestCase):
 		examinee.add(Record("record", 0x300))
 		self.assertTrue("record" in examinee)
 		self.assertTrue(0x300 in examinee)
+
+	def test_fingerprint(self):
+		def build():
+			dictionary = canopenx.ObjectDictionary()
+			record = Record("record", 0x1800)
+			record.add(Variable("count", 0x1800, 0x00, UNSIGNED8))
+			record.add(Variable("cob_id", 0x1800, 0x01, UNSIGNED32))
+			dictionary.add(record)
+			dictionary.add(Variable("variable", 0x1000, 0x00, UNSIGNED32))
+			return dictionary
+
+		a = build()
+		b = build()
+		self.assertEqual(a.fingerprint, b.fingerprint)
+		self.assertNotEqual(a.fingerprint, canopenx.ObjectDictionary().fingerprint)
+
+		#### Test step: Changes of items are passed to the object dictionary
+		b["record"]["cob_id"].access_type = "ro"
+		self.assertNotEqual(a.fingerprint, b.fingerprint)
+		self.assertFalse(a == b)
+		b["record"]["cob_id"].access_type = "rw"
+		self.assertEqual(a.fingerprint, b.fingerprint)
+		self.assertTrue(a == b)
+
+		#### Test step: Adding and removing items
+		del b["record"]["cob_id"]
+		self.assertFalse(a == b)
+		b["record"].add(Variable("cob_id", 0x1800, 0x01, UNSIGNED32))
+		self.assertTrue(a == b)
+
+		del b["variable"]
+		self.assertNotEqual(a.fingerprint, b.fingerprint)
+		b.add(Variable("variable", 0x1000, 0x00, UNSIGNED32))
+		self.assertEqual(a.fingerprint, b.fingerprint)
+
+		# The fingerprint does not depend on the order of the items
+		c = canopenx.ObjectDictionary()
+		c.add(Variable("variable", 0x1000, 0x00, UNSIGNED32))
+		c.add(build()["record"])
+		self.assertEqual(a.fingerprint, c.fingerprint)
+
+	def test_fingerprint_shared(self):
+		a = canopenx.ObjectDictionary()
+		b = canopenx.ObjectDictionary()
+		variable = Variable("variable", 0x1000, 0x00, UNSIGNED32)
+		a.add(variable)
+		b.add(variable)
+		self.assertTrue(a == b)
+
+		#### Test step: Changes of a shared item are passed to all owners
+		version_a = a._version
+		version_b = b._version
+		variable.access_type = "ro"
+		self.assertTrue(a == b)
+		self.assertGreater(a._version, version_a)
+		self.assertGreater(b._version, version_b)
+		self.assertEqual(a.fingerprint, b.fingerprint)
+
+		#### Test step: Removing a shared item from one owner keeps it tied to the others
+		del a["variable"]
+		self.assertEqual(a.fingerprint, canopenx.ObjectDictionary().fingerprint)
+		version_a = a._version
+		version_b = b._version
+		fingerprint = a.fingerprint
+		variable.access_type = "rw"
+		self.assertEqual(a._version, version_a)
+		self.assertEqual(a.fingerprint, fingerprint)
+		self.assertGreater(b._version, version_b)
+
+		#### Test step: Shared items in records
+		c = Record("record", 0x1800)
+		d = Record("record", 0x1800)
+		count = Variable("count", 0x1800, 0x00, UNSIGNED8)
+		c.add(count)
+		d.add(count)
+		count.access_type = "ro"
+		self.assertTrue(c == d)
+		del c["count"]
+		count.access_type = "rw"
+		self.assertFalse(c == d)
+		self.assertEqual(c.fingerprint, Record("record", 0x1800).fingerprint)
+
+	def test_freeze(self):
+		examinee = canopenx.ObjectDictionary()
+		record = Record("record", 0x1800)
+		record.add(Variable("count", 0x1800, 0x00, UNSIGNED8))
+		examinee.add(record)
+
+		with self.assertRaises(TypeError):
+			hash(examinee)
+
+		examinee.freeze()
+		self.assertTrue(examinee.frozen)
+		self.assertTrue(record.frozen)
+		self.assertTrue(record["count"].frozen)
+		self.assertEqual({examinee: 1}[examinee], 1)
+
+		with self.assertRaises(RuntimeError):
+			examinee.add(Variable("variable", 0x1000, 0x00, UNSIGNED32))
+		with self.assertRaises(RuntimeError):
+			del examinee["record"]
+		with self.assertRaises(RuntimeError):
+			record.add(Variable("cob_id", 0x1800, 0x01, UNSIGNED32))
+		with self.assertRaises(RuntimeError):
+			del record["count"]
+		with self.assertRaises(RuntimeError):
+			record["count"].access_type = "ro"
+
+	def test_sorted(self):
+		examinee = canopenx.ObjectDictionary()
+		for index in [0x1A00, 0x1400, 0x1600, 0x1401, 0x1000, 0x2000, 0x15FF]:
+			examinee.add(Variable("v" + hex(index), index, 0x00, UNSIGNED32))
+
+		self.assertEqual([item.index for item in examinee.iter_sorted()], [0x1000, 0x1400, 0x1401, 0x15FF, 0x1600, 0x1A00, 0x2000])
+		self.assertEqual([item.index for item in examinee.items_in_range(0x1400, 0x15FF)], [0x1400, 0x1401, 0x15FF])
+		self.assertEqual([item.index for item in examinee.items_in_range(0x1601, 0x19FF)], [])
+		self.assertEqual([item.index for item in examinee.items_in_range(0x0000, 0xFFFF)], [0x1000, 0x1400, 0x1401, 0x15FF, 0x1600, 0x1A00, 0x2000])
+		self.assertEqual(examinee.items_in_range(0x2000, 0x1000), [])
+
+		del examinee[0x1401]
+		del examinee["v0x2000"]
+		examinee.add(Variable("v0x1500", 0x1500, 0x00, UNSIGNED32))
+		self.assertEqual([item.index for item in examinee.items_in_range(0x1400, 0x15FF)], [0x1400, 0x1500, 0x15FF])
+		self.assertEqual([item.index for item in examinee.iter_sorted()], [0x1000, 0x1400, 0x1500, 0x15FF, 0x1600, 0x1A00])
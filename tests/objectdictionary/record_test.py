@@ -95,3 +95,49 @@ class RecordTestCase(unittest.TestCase):
 		self.assertTrue(0x01 in examinee)
 
 		self.assertEqual(len(examinee), 2)
+
+	def test_compile_layout(self):
+		examinee = Record("record", 0x100)
+
+		layout = examinee.compile_layout()
+		self.assertEqual(len(layout), 0)
+		self.assertIs(examinee.compile_layout(), layout)
+
+		examinee.add(Variable("a", 0x100, 0x01, UNSIGNED32))
+		examinee.add(Variable("b", 0x100, 0x02, UNSIGNED32))
+		layout = examinee.compile_layout()
+		self.assertEqual(layout.names, ("a", "b"))
+		self.assertIs(examinee.compile_layout(), layout)
+		self.assertEqual(layout.unpack_from(layout.pack({"a": 1, "b": 2})), {"a": 1, "b": 2})
+
+		del examinee["a"]
+		self.assertEqual(examinee.compile_layout().names, ("b",))
+
+	def test_fingerprint(self):
+		a = Record("record", 0x100)
+		b = Record("record", 0x100)
+		self.assertEqual(a.fingerprint, b.fingerprint)
+		self.assertNotEqual(a.fingerprint, Record("other", 0x100).fingerprint)
+
+		a.add(Variable("a", 0x100, 0x01, UNSIGNED32))
+		self.assertNotEqual(a.fingerprint, b.fingerprint)
+		b.add(Variable("a", 0x100, 0x01, UNSIGNED32))
+		self.assertEqual(a.fingerprint, b.fingerprint)
+
+		a["a"].access_type = "ro"
+		self.assertNotEqual(a.fingerprint, b.fingerprint)
+		self.assertFalse(a == b)
+
+		del a["a"]
+		del b["a"]
+		self.assertEqual(a.fingerprint, Record("record", 0x100).fingerprint)
+
+		a.freeze()
+		b.freeze()
+		self.assertEqual(hash(a), hash(b))
+		self.assertEqual({a: 1}[b], 1)
+		c = Record("record", 0x100)
+		with self.assertRaises(TypeError):
+			hash(c)
+		with self.assertRaises(RuntimeError):
+			a.add(Variable("a", 0x100, 0x01, UNSIGNED32))
@@ -4,7 +4,12 @@ import struct
 
 from hypothesis import given, example, strategies as st
 
-from canopenx.objectdictionary import Variable
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+from canopenx.objectdictionary import NodeIdValue, Variable
 from canopenx.objectdictionary.datatypes import *
 
 
@@ -423,7 +428,7 @@ class VariableTestCase(unittest.TestCase):
 					self.assertEqual(variable.encode(x), y)
 
 		with self.subTest("decode"):
-			test_data = [(b"\x00\x00\x00\x00\x00\x00\x00\x00", 0.0)]
+			test_data = [(b"\x00\x00\x00\x00\x00\x00\x00\x00", 0.0), (struct.pack("<d", -1.25), -1.25)]
 			for x, y in test_data:
 				with self.subTest("x=" + str(x) + ",y=" + str(y)):
 					self.assertEqual(variable.decode(x), y)
@@ -833,3 +838,105 @@ class VariableTestCase(unittest.TestCase):
 
 		with self.assertRaises(ValueError):
 			examinee.access_type = "xx"
+
+	@unittest.skipIf(numpy is None, "requires numpy")
+	def test_decode_many(self):
+		test_data = [(INTEGER8, [-128, 0, 127]), (UNSIGNED16, [0, 1, 0xFFFF]), (INTEGER32, [-5, 0x12345678]), (REAL32, [1.5, -0.25]), (REAL64, [1.5, -0.25]), (UNSIGNED64, [0, 0xFFFFFFFFFFFFFFFF]), (INTEGER24, [-0x800000, -1, 0x7FFFFF]), (UNSIGNED24, [0, 0xFFFFFF]), (INTEGER40, [-1, 1 << 38]), (UNSIGNED48, [0xFFFFFFFFFFFF]), (INTEGER56, [-(1 << 55), (1 << 55) - 1]), (UNSIGNED56, [(1 << 56) - 1])]
+		for data_type, values in test_data:
+			with self.subTest("data_type=" + str(data_type)):
+				variable = Variable("VAR", 100, 0, data_type)
+				length = variable.size // 8
+
+				# Interleaved with one byte of padding before and after each element
+				data = b"".join(b"\xAA" + variable.encode(value) + b"\x55" for value in values)
+				self.assertEqual(list(variable.decode_many(data, stride = length + 2, offset = 1)), values)
+				self.assertEqual(list(variable.decode_many(data, 1, length + 2, 1)), values[:1])
+
+				buffer = variable.encode_many(values, stride = length + 2, offset = 1)
+				self.assertEqual(len(buffer), len(data) - 1)
+				for i, value in enumerate(values):
+					self.assertEqual(variable.decode(buffer[1 + i * (length + 2):]), value)
+
+				buffer = bytearray(data)
+				self.assertIs(variable.encode_many(variable.decode_many(data, stride = length + 2, offset = 1)[::-1], buffer, length + 2, 1), buffer)
+				self.assertEqual(list(variable.decode_many(buffer, stride = length + 2, offset = 1)), values[::-1])
+
+		variable = Variable("BOOLEAN", 100, 0, BOOLEAN)
+		self.assertEqual(list(variable.decode_many(variable.encode_many([True, False]))), [True, False])
+
+		variable = Variable("TIME_OF_DAY", 100, 0, TIME_OF_DAY)
+		values = numpy.array(["1984-01-01", "2020-01-02T03:04:05.678"], dtype = "datetime64[ms]")
+		data = variable.encode_many(values)
+		self.assertTrue((variable.decode_many(data) == values).all())
+		self.assertEqual(variable.decode(data[6:]), calendar.timegm((2020, 1, 2, 3, 4, 5)) + 0.678)
+		with self.assertRaises(ValueError):
+			variable.encode_many(numpy.array(["1983-12-31"], dtype = "datetime64[ms]"))
+
+		variable = Variable("TIME_DIFFERENCE", 100, 0, TIME_DIFFERENCE)
+		values = numpy.array([1500, -90000000], dtype = "timedelta64[ms]")
+		data = variable.encode_many(values)
+		self.assertEqual(list(variable.decode_many(data)), list(abs(values)))
+		self.assertEqual(variable.decode(data[6:]), 90000.0)
+
+		#### Test step: Errors
+		variable = Variable("UNSIGNED24", 100, 0, UNSIGNED24)
+		with self.assertRaises(ValueError):
+			variable.encode_many([0x1000000])
+		with self.assertRaises(ValueError):
+			variable.encode_many([-1])
+		with self.assertRaises(ValueError):
+			variable.encode_many([1.5])
+		with self.assertRaises(ValueError):
+			variable.decode_many(b"\x00" * 5, 2)
+		with self.assertRaises(ValueError):
+			variable.decode_many(b"\x00" * 6, stride = 2)
+		with self.assertRaises(ValueError):
+			variable.encode_many([1], b"\x00" * 3)
+
+		variable = Variable("INTEGER8", 100, 0, INTEGER8)
+		with self.assertRaises(ValueError):
+			variable.encode_many([128])
+		self.assertEqual(len(variable.decode_many(b"")), 0)
+
+		variable = Variable("VISIBLE_STRING", 100, 0, VISIBLE_STRING)
+		with self.assertRaises(ValueError):
+			variable.decode_many(b"TEXT")
+		with self.assertRaises(ValueError):
+			variable.encode_many(["TEXT"])
+
+	def test_node_id_value(self):
+		variable = Variable("cob_id", 100, 0, UNSIGNED16, "rw", NodeIdValue(0x180))
+		self.assertEqual(variable.default_value, NodeIdValue(0x180))
+
+		variable.default_value = NodeIdValue(0x200)
+		self.assertEqual(variable.default_value, NodeIdValue(0x200))
+
+		# The value must be encodable for all node ids
+		with self.assertRaises(ValueError):
+			Variable("x", 100, 0, UNSIGNED8, "rw", NodeIdValue(0x81))
+		with self.assertRaises(ValueError):
+			variable.default_value = NodeIdValue(-2)
+		with self.assertRaises(ValueError):
+			Variable("x", 100, 0, VISIBLE_STRING, "rw", NodeIdValue(0))
+
+	def test_fingerprint(self):
+		a = Variable("a", 100, 0, UNSIGNED32)
+		b = Variable("a", 100, 0, UNSIGNED32, "rw", 5)
+		self.assertEqual(a.fingerprint, b.fingerprint)
+		self.assertNotEqual(a.fingerprint, Variable("b", 100, 0, UNSIGNED32).fingerprint)
+		self.assertNotEqual(a.fingerprint, Variable("a", 100, 0, INTEGER32).fingerprint)
+
+		b.access_type = "ro"
+		self.assertNotEqual(a.fingerprint, b.fingerprint)
+		self.assertFalse(a == b)
+
+		with self.assertRaises(TypeError):
+			hash(a)
+		self.assertFalse(a.frozen)
+		a.freeze()
+		self.assertTrue(a.frozen)
+		c = Variable("a", 100, 0, UNSIGNED32)
+		c.freeze()
+		self.assertEqual(hash(a), hash(c))
+		with self.assertRaises(RuntimeError):
+			a.access_type = "ro"